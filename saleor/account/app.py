@@ -1,5 +1,52 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete
+
+
+def _get_permissions_through_models():
+    from .models import Group, User
+
+    return [
+        User.groups.through,
+        User.user_permissions.through,
+        Group.permissions.through,
+    ]
+
+
+def connect_permissions_cache_receivers():
+    """Invalidate the permissions of cached access tokens on permission changes.
+
+    The receivers are connected only when the access token cache is enabled, as a
+    connected `m2m_changed` receiver makes Django select the existing rows before
+    adding new ones.
+    """
+    from .models import Group
+    from .signals import invalidate_permissions_cache
+
+    for through_model in _get_permissions_through_models():
+        m2m_changed.connect(
+            invalidate_permissions_cache,
+            sender=through_model,
+            dispatch_uid=f"invalidate_permissions_cache_{through_model.__name__}",
+        )
+    post_delete.connect(
+        invalidate_permissions_cache,
+        sender=Group,
+        dispatch_uid="invalidate_permissions_cache_group",
+    )
+
+
+def disconnect_permissions_cache_receivers():
+    from .models import Group
+
+    for through_model in _get_permissions_through_models():
+        m2m_changed.disconnect(
+            sender=through_model,
+            dispatch_uid=f"invalidate_permissions_cache_{through_model.__name__}",
+        )
+    post_delete.disconnect(
+        sender=Group, dispatch_uid="invalidate_permissions_cache_group"
+    )
 
 
 class AccountAppConfig(AppConfig):
@@ -14,3 +61,5 @@ class AccountAppConfig(AppConfig):
             sender=User,
             dispatch_uid="delete_user_avatar",
         )
+        if settings.JWT_CACHE_SIZE > 0:
+            connect_permissions_cache_receivers()
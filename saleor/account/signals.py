@@ -1,6 +1,13 @@
+from ..core.jwt_cache import invalidate_cached_permissions
 from ..core.tasks import delete_from_storage_task
 
 
 def delete_avatar(sender, instance, **kwargs):
     if avatar := instance.avatar:
         delete_from_storage_task.delay(avatar.name)
+
+
+def invalidate_permissions_cache(sender, **kwargs):
+    action = kwargs.get("action")
+    if action is None or action.startswith("post_"):
+        invalidate_cached_permissions()
@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+
+from ..models import AppToken
+from ..token_cache import VerifiedAppTokenCache, get_verified_token_key
+
+
+@pytest.fixture
+def app_token_with_raw_token(app):
+    return AppToken.objects.create_with_token(app=app)
+
+
+def test_get_verified_token_key_depends_on_stored_token(app_token_with_raw_token):
+    # given
+    app_token, raw_token = app_token_with_raw_token
+
+    # when
+    key = get_verified_token_key(raw_token, app_token.pk, app_token.auth_token)
+
+    # then
+    assert raw_token not in key
+    assert key != get_verified_token_key(raw_token, app_token.pk, "other-hash")
+    assert key != get_verified_token_key(
+        raw_token, app_token.pk + 1, app_token.auth_token
+    )
+
+
+def test_verified_app_token_cache(app_token_with_raw_token):
+    # given
+    app_token, raw_token = app_token_with_raw_token
+    token_cache = VerifiedAppTokenCache(max_size=10, timeout=60, use_shared_cache=False)
+    token_data = (raw_token, app_token.pk, app_token.auth_token)
+
+    # when
+    verified_before = token_cache.is_verified(*token_data)
+    token_cache.set_verified(*token_data)
+    verified_after = token_cache.is_verified(*token_data)
+
+    # then
+    assert verified_before is False
+    assert verified_after is True
+    stats = token_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_verified_app_token_cache_entry_expired(app_token_with_raw_token):
+    # given
+    app_token, raw_token = app_token_with_raw_token
+    token_cache = VerifiedAppTokenCache(max_size=10, timeout=60, use_shared_cache=False)
+    token_data = (raw_token, app_token.pk, app_token.auth_token)
+    token_cache.set_verified(*token_data)
+
+    # when
+    with mock.patch("saleor.app.token_cache.time.monotonic", return_value=10**10):
+        verified = token_cache.is_verified(*token_data)
+
+    # then
+    assert verified is False
+
+
+def test_verified_app_token_cache_shared_cache(app_token_with_raw_token):
+    # given
+    app_token, raw_token = app_token_with_raw_token
+    token_data = (raw_token, app_token.pk, app_token.auth_token)
+    VerifiedAppTokenCache(max_size=10, timeout=60, use_shared_cache=True).set_verified(
+        *token_data
+    )
+    token_cache = VerifiedAppTokenCache(max_size=10, timeout=60, use_shared_cache=True)
+
+    # when
+    verified = token_cache.is_verified(*token_data)
+
+    # then
+    assert verified is True
+    assert token_cache.get_stats()["shared_hits"] == 1
+
+
+def test_verified_app_token_cache_disabled(app_token_with_raw_token):
+    # given
+    app_token, raw_token = app_token_with_raw_token
+    token_cache = VerifiedAppTokenCache(max_size=0, timeout=60, use_shared_cache=False)
+    token_data = (raw_token, app_token.pk, app_token.auth_token)
+
+    # when
+    token_cache.set_verified(*token_data)
+
+    # then
+    assert token_cache.is_verified(*token_data) is False
@@ -0,0 +1,95 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..core.utils.lru_cache import LRUCache
+
+SHARED_CACHE_KEY_PREFIX = "app_token_verified:"
+
+
+def get_verified_token_key(raw_token: str, token_id: int, auth_token: str) -> str:
+    """Return a digest of the raw token checked against the stored token hash.
+
+    The digest is keyed with the secret key, so it can't be computed without it.
+    It includes the token id and its hash, so a deleted or regenerated token never
+    matches a previously verified entry.
+    """
+    message = f"{token_id}:{auth_token}:{raw_token}"
+    return hmac.new(
+        settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+class VerifiedAppTokenCache:
+    """Cache of app tokens already checked against the slow password hash.
+
+    Entries are kept in the process memory and, when enabled, in the shared cache,
+    for `timeout` seconds.
+    """
+
+    def __init__(self, max_size: int, timeout: float, use_shared_cache: bool):
+        self.timeout = timeout
+        self.use_shared_cache = use_shared_cache
+        self._local_cache: LRUCache[float] = LRUCache(max_size)
+        self.shared_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._local_cache.max_size > 0 or self.use_shared_cache
+
+    def is_verified(self, raw_token: str, token_id: int, auth_token: str) -> bool:
+        if not self.enabled:
+            return False
+        key = get_verified_token_key(raw_token, token_id, auth_token)
+        expires_at = self._local_cache.get(key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                return True
+            self._local_cache.delete(key)
+        if self.use_shared_cache and cache.get(SHARED_CACHE_KEY_PREFIX + key):
+            self.shared_hits += 1
+            self._local_cache.set(key, time.monotonic() + self.timeout)
+            return True
+        return False
+
+    def set_verified(self, raw_token: str, token_id: int, auth_token: str):
+        if not self.enabled:
+            return
+        key = get_verified_token_key(raw_token, token_id, auth_token)
+        self._local_cache.set(key, time.monotonic() + self.timeout)
+        if self.use_shared_cache:
+            cache.set(SHARED_CACHE_KEY_PREFIX + key, True, timeout=self.timeout)
+
+    def clear(self):
+        self._local_cache.clear()
+        self._local_cache.reset_stats()
+        self.shared_hits = 0
+
+    def get_stats(self) -> dict[str, float]:
+        stats: dict[str, float] = {
+            **self._local_cache.get_stats(),
+            "shared_hits": self.shared_hits,
+        }
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["hits"] + self.shared_hits) / lookups if lookups else 0
+        )
+        return stats
+
+
+_verified_app_token_cache: Optional[VerifiedAppTokenCache] = None
+
+
+def get_verified_app_token_cache() -> VerifiedAppTokenCache:
+    global _verified_app_token_cache
+    if _verified_app_token_cache is None:
+        _verified_app_token_cache = VerifiedAppTokenCache(
+            max_size=settings.APP_TOKEN_CACHE_SIZE,
+            timeout=settings.APP_TOKEN_CACHE_TIMEOUT,
+            use_shared_cache=settings.APP_TOKEN_SHARED_CACHE_ENABLED,
+        )
+    return _verified_app_token_cache
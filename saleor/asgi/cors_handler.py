@@ -43,7 +43,7 @@ def cors_handler(application: ASGI3Application) -> ASGI3Application:
                     b"Origin, Content-Type, Accept, Authorization, "
                     b"Authorization-Bearer",
                 ),
-                (b"access-control-allow-methods", b"POST, OPTIONS"),
+                (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
                 (b"access-control-max-age", b"600"),
                 (b"vary", b"Origin"),
             ]
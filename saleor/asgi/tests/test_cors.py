@@ -64,7 +64,7 @@ async def test_access_control_header_preflight(asgi_app: ASGI3Application, setti
                     b"Origin, Content-Type, Accept, Authorization, "
                     b"Authorization-Bearer",
                 ),
-                (b"access-control-allow-methods", b"POST, OPTIONS"),
+                (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
                 (b"access-control-allow-origin", b"http://localhost:3000"),
                 (b"access-control-max-age", b"600"),
                 (b"vary", b"Origin"),
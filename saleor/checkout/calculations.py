@@ -1,20 +1,27 @@
+import hashlib
+import json
 from collections.abc import Iterable
 from decimal import Decimal
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
 from ..checkout import base_calculations
 from ..core.prices import quantize_price
 from ..core.taxes import TaxData, zero_money, zero_taxed_money
+from ..core.utils.country import get_active_country
+from ..discount import DiscountType
 from ..discount.utils import (
     create_or_update_discount_objects_from_promotion_for_checkout,
 )
 from ..payment.models import TransactionItem
+from ..plugins.models import PluginConfiguration
 from ..tax import TaxCalculationStrategy
 from ..tax.calculations.checkout import update_checkout_prices_with_flat_rates
+from ..tax.models import TaxClassCountryRate
 from ..tax.utils import (
     get_charge_taxes_for_checkout,
     get_tax_calculation_strategy_for_checkout,
@@ -27,6 +34,27 @@ if TYPE_CHECKING:
     from ..account.models import Address
     from ..plugins.manager import PluginsManager
     from .fetch import CheckoutInfo, CheckoutLineInfo
+    from .models import CheckoutLine
+
+CHECKOUT_PRICE_FIELDS = [
+    "voucher_code",
+    "total_net_amount",
+    "total_gross_amount",
+    "subtotal_net_amount",
+    "subtotal_gross_amount",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "shipping_tax_rate",
+    "translated_discount_name",
+    "discount_amount",
+    "discount_name",
+    "currency",
+]
+CHECKOUT_LINE_PRICE_FIELDS = [
+    "total_price_net_amount",
+    "total_price_gross_amount",
+    "tax_rate",
+]
 
 
 def checkout_shipping_price(
@@ -232,6 +260,9 @@ def _fetch_checkout_prices_if_expired(
 
     Prices can be updated only if force_update == True, or if time elapsed from the
     last price update is greater than settings.CHECKOUT_PRICES_TTL.
+    With settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED, expired prices are updated only
+    if the data they are calculated from has changed.
+    Only the checkout fields and lines with changed prices are saved.
     """
     checkout = checkout_info.checkout
 
@@ -246,6 +277,32 @@ def _fetch_checkout_prices_if_expired(
     charge_taxes = get_charge_taxes_for_checkout(checkout_info, lines)
     should_charge_tax = charge_taxes and not checkout.tax_exemption
 
+    price_inputs_hash = None
+    if settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED:
+        price_inputs_hash = _get_checkout_price_inputs_hash(
+            checkout_info,
+            lines,
+            address,
+            tax_calculation_strategy=tax_calculation_strategy,
+            prices_entered_with_tax=prices_entered_with_tax,
+            should_charge_tax=should_charge_tax,
+        )
+        if not force_update and price_inputs_hash == checkout.price_inputs_hash:
+            # Nothing the prices depend on has changed, so the stored prices are
+            # still valid and there is no need to call the plugins and tax apps.
+            checkout.price_expiration = timezone.now() + settings.CHECKOUT_PRICES_TTL
+            checkout.save(
+                update_fields=["price_expiration", "last_change"],
+                using=settings.DATABASE_CONNECTION_DEFAULT_NAME,
+            )
+            return checkout_info, lines
+
+    previous_checkout_prices = _get_price_values(checkout, CHECKOUT_PRICE_FIELDS)
+    previous_lines_prices = [
+        _get_price_values(line_info.line, CHECKOUT_LINE_PRICE_FIELDS)
+        for line_info in lines
+    ]
+
     create_or_update_discount_objects_from_promotion_for_checkout(lines)
 
     if prices_entered_with_tax:
@@ -285,34 +342,179 @@ def _fetch_checkout_prices_if_expired(
             _get_checkout_base_prices(checkout, checkout_info, lines)
 
     checkout.price_expiration = timezone.now() + settings.CHECKOUT_PRICES_TTL
+    checkout.price_inputs_hash = price_inputs_hash
+    update_fields = ["price_expiration", "price_inputs_hash", "last_change"]
+    if _get_price_values(checkout, CHECKOUT_PRICE_FIELDS) != previous_checkout_prices:
+        update_fields.extend(CHECKOUT_PRICE_FIELDS)
     checkout.save(
-        update_fields=[
-            "voucher_code",
-            "total_net_amount",
-            "total_gross_amount",
-            "subtotal_net_amount",
-            "subtotal_gross_amount",
-            "shipping_price_net_amount",
-            "shipping_price_gross_amount",
-            "shipping_tax_rate",
-            "price_expiration",
-            "translated_discount_name",
-            "discount_amount",
-            "discount_name",
-            "currency",
-            "last_change",
-        ],
+        update_fields=update_fields,
         using=settings.DATABASE_CONNECTION_DEFAULT_NAME,
     )
-    checkout.lines.bulk_update(
-        [line_info.line for line_info in lines],
-        [
-            "total_price_net_amount",
-            "total_price_gross_amount",
-            "tax_rate",
+    # write only the lines which prices have changed
+    lines_to_update = [
+        line_info.line
+        for line_info, previous_line_prices in zip(lines, previous_lines_prices)
+        if _get_price_values(line_info.line, CHECKOUT_LINE_PRICE_FIELDS)
+        != previous_line_prices
+    ]
+    if lines_to_update:
+        checkout.lines.bulk_update(lines_to_update, CHECKOUT_LINE_PRICE_FIELDS)
+    return checkout_info, lines
+
+
+def _get_price_values(
+    instance: Union["Checkout", "CheckoutLine"], fields: list[str]
+) -> list[Any]:
+    return [getattr(instance, field) for field in fields]
+
+
+def _get_checkout_price_inputs_hash(
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+    *,
+    tax_calculation_strategy: str,
+    prices_entered_with_tax: bool,
+    should_charge_tax: bool,
+) -> str:
+    """Return the hash of the data the checkout prices are calculated from.
+
+    The data covers the checkout lines with their variant prices and promotions, the
+    voucher, delivery method, addresses, the tax configuration with the flat tax rates
+    and the tax app and plugins in use. Responses of tax apps are not included, they
+    are refreshed when the checkout prices are invalidated or any of the listed
+    inputs change.
+    """
+    checkout = checkout_info.checkout
+    delivery_method = checkout_info.delivery_method_info.delivery_method
+    shipping_tax_class = getattr(delivery_method, "tax_class", None)
+    voucher = checkout_info.voucher
+    inputs = {
+        "checkout": [
+            checkout.channel_id,
+            checkout.currency,
+            checkout.country.code,
+            checkout.language_code,
+            checkout.user_id,
+            checkout.email,
+            checkout.voucher_code,
+            checkout.discount_amount,
+            checkout.discount_name,
+            checkout.translated_discount_name,
+            checkout.tax_exemption,
+        ],
+        "delivery_method": [
+            getattr(delivery_method, "id", None),
+            getattr(delivery_method, "price", None),
+            shipping_tax_class.pk if shipping_tax_class else None,
         ],
+        "addresses": [
+            address.as_data() if address else None
+            for address in [
+                address,
+                checkout_info.shipping_address,
+                checkout_info.billing_address,
+            ]
+        ],
+        "taxes": [
+            tax_calculation_strategy,
+            prices_entered_with_tax,
+            should_charge_tax,
+            checkout_info.tax_configuration.display_gross_prices,
+            _get_tax_price_inputs(
+                checkout_info, lines, address, tax_calculation_strategy
+            ),
+        ],
+        "voucher": _get_voucher_price_inputs(voucher, checkout.channel_id)
+        if voucher
+        else None,
+        "lines": [_get_line_price_inputs(line_info) for line_info in lines],
+    }
+    data = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _get_tax_price_inputs(
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+    tax_calculation_strategy: str,
+) -> list[Any]:
+    if tax_calculation_strategy == TaxCalculationStrategy.TAX_APP:
+        from ..webhook.transport.utils import get_current_tax_app
+
+        tax_app = get_current_tax_app()
+        plugin_configurations = (
+            PluginConfiguration.objects.filter(
+                Q(channel_id=checkout_info.channel.pk) | Q(channel__isnull=True)
+            )
+            .order_by("identifier", "channel_id")
+            .values_list("identifier", "channel_id", "active", "configuration")
+        )
+        return [tax_app.pk if tax_app else None, list(plugin_configurations)]
+
+    # Flat rates of the tax classes used by the checkout, with the country default.
+    country_code = get_active_country(checkout_info.channel, address)
+    delivery_method = checkout_info.delivery_method_info.delivery_method
+    tax_class_ids = {
+        line_info.tax_class.pk for line_info in lines if line_info.tax_class
+    }
+    if shipping_tax_class_id := getattr(delivery_method, "tax_class_id", None):
+        tax_class_ids.add(shipping_tax_class_id)
+    return list(
+        TaxClassCountryRate.objects.filter(
+            Q(tax_class_id__in=tax_class_ids) | Q(tax_class__isnull=True),
+            country=country_code,
+        )
+        .order_by("tax_class_id")
+        .values_list("tax_class_id", "rate")
     )
-    return checkout_info, lines
+
+
+def _get_voucher_price_inputs(voucher, channel_id: int) -> list[Any]:
+    discount_values = voucher.channel_listings.filter(channel_id=channel_id).values(
+        "discount_value", "min_spent_amount"
+    )
+    return [
+        voucher.pk,
+        voucher.type,
+        voucher.discount_value_type,
+        voucher.apply_once_per_order,
+        list(discount_values),
+    ]
+
+
+def _get_line_price_inputs(line_info: "CheckoutLineInfo") -> list[Any]:
+    line = line_info.line
+    channel_listing = line_info.channel_listing
+    return [
+        line.pk,
+        line.variant_id,
+        line.quantity,
+        line.price_override,
+        line.metadata,
+        line.private_metadata,
+        channel_listing.price_amount if channel_listing else None,
+        channel_listing.discounted_price_amount if channel_listing else None,
+        line_info.product_type.is_shipping_required,
+        line_info.tax_class.pk if line_info.tax_class else None,
+        line_info.voucher.pk if line_info.voucher else None,
+        [
+            [
+                rule_info.rule.pk,
+                rule_info.rule.reward_value_type,
+                rule_info.rule.reward_value,
+                rule_info.variant_listing_promotion_rule.discount_amount,
+            ]
+            for rule_info in line_info.rules_info
+        ],
+        # Promotion discounts are calculated from the rules above.
+        [
+            [discount.type, discount.value_type, discount.value, discount.amount_value]
+            for discount in line_info.discounts
+            if discount.type != DiscountType.PROMOTION
+        ],
+    ]
 
 
 def _calculate_and_add_tax(
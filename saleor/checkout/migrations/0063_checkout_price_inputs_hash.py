@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "checkout",
+            "0062_update_checkout_last_transaction_modified_at_and_refundable",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="checkout",
+            name="price_inputs_hash",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
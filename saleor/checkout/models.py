@@ -160,6 +160,9 @@ class Checkout(models.Model):
     )
 
     price_expiration = models.DateTimeField(default=timezone.now)
+    # Hash of the inputs of the last prices calculation, used to skip the calculation
+    # when the prices expire but nothing they depend on has changed.
+    price_inputs_hash = models.CharField(max_length=64, blank=True, null=True)
 
     discount_amount = models.DecimalField(
         max_digits=settings.DEFAULT_MAX_DIGITS,
@@ -3,6 +3,8 @@ from typing import Literal, Union
 from unittest.mock import Mock, patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 from prices import Money, TaxedMoney
@@ -10,9 +12,11 @@ from prices import Money, TaxedMoney
 from ...checkout.utils import add_promo_code_to_checkout
 from ...core.prices import quantize_price
 from ...core.taxes import TaxData, TaxLineData, zero_taxed_money
+from ...core.utils.country import get_active_country
 from ...plugins.manager import get_plugins_manager
 from ...tax import TaxCalculationStrategy
 from ...tax.calculations.checkout import update_checkout_prices_with_flat_rates
+from ...tax.models import TaxClassCountryRate
 from ..base_calculations import (
     base_checkout_delivery_price,
     calculate_base_line_total_price,
@@ -23,6 +27,7 @@ from ..calculations import (
     fetch_checkout_data,
 )
 from ..fetch import CheckoutLineInfo, fetch_checkout_info, fetch_checkout_lines
+from ..utils import invalidate_checkout_prices
 
 
 @pytest.fixture
@@ -481,3 +486,154 @@ def test_fetch_checkout_prices_when_tax_exemption_and_not_include_taxes_in_price
 
     assert checkout.total == shipping_price + all_lines_total_price
     assert checkout.subtotal == all_lines_total_price
+
+
+@pytest.fixture
+def checkout_with_flat_rates(checkout_with_items_and_shipping):
+    checkout = checkout_with_items_and_shipping
+    tc = checkout.channel.tax_configuration
+    tc.country_exceptions.all().delete()
+    tc.tax_calculation_strategy = TaxCalculationStrategy.FLAT_RATES
+    tc.save()
+    return checkout
+
+
+def _expire_prices(checkout):
+    checkout.price_expiration = timezone.now()
+    checkout.save(update_fields=["price_expiration"])
+
+
+@patch(
+    "saleor.checkout.calculations.update_checkout_prices_with_flat_rates",
+    wraps=update_checkout_prices_with_flat_rates,
+)
+def test_fetch_checkout_data_unchanged_price_inputs(
+    mocked_update_checkout_prices_with_flat_rates,
+    checkout_with_flat_rates,
+    fetch_kwargs,
+    settings,
+):
+    # given
+    settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED = True
+    checkout = fetch_kwargs["checkout_info"].checkout
+    fetch_checkout_data(**fetch_kwargs)
+    price_inputs_hash = checkout.price_inputs_hash
+    _expire_prices(checkout)
+
+    # when
+    fetch_checkout_data(**fetch_kwargs)
+
+    # then
+    mocked_update_checkout_prices_with_flat_rates.assert_called_once()
+    checkout.refresh_from_db()
+    assert checkout.price_inputs_hash == price_inputs_hash
+    assert checkout.price_expiration > timezone.now()
+
+
+@patch(
+    "saleor.checkout.calculations.update_checkout_prices_with_flat_rates",
+    wraps=update_checkout_prices_with_flat_rates,
+)
+def test_fetch_checkout_data_changed_price_inputs(
+    mocked_update_checkout_prices_with_flat_rates,
+    checkout_with_flat_rates,
+    fetch_kwargs,
+    settings,
+):
+    # given
+    settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED = True
+    checkout = fetch_kwargs["checkout_info"].checkout
+    fetch_checkout_data(**fetch_kwargs)
+    price_inputs_hash = checkout.price_inputs_hash
+    _expire_prices(checkout)
+
+    line = fetch_kwargs["lines"][0].line
+    line.quantity += 1
+    line.save(update_fields=["quantity"])
+
+    # when
+    fetch_checkout_data(**fetch_kwargs)
+
+    # then
+    assert mocked_update_checkout_prices_with_flat_rates.call_count == 2
+    checkout.refresh_from_db()
+    assert checkout.price_inputs_hash != price_inputs_hash
+
+
+@patch(
+    "saleor.checkout.calculations.update_checkout_prices_with_flat_rates",
+    wraps=update_checkout_prices_with_flat_rates,
+)
+def test_fetch_checkout_data_changed_flat_rate(
+    mocked_update_checkout_prices_with_flat_rates,
+    checkout_with_flat_rates,
+    fetch_kwargs,
+    settings,
+):
+    # given
+    settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED = True
+    checkout = fetch_kwargs["checkout_info"].checkout
+    fetch_checkout_data(**fetch_kwargs)
+    price_inputs_hash = checkout.price_inputs_hash
+    _expire_prices(checkout)
+
+    TaxClassCountryRate.objects.update_or_create(
+        country=get_active_country(checkout.channel, fetch_kwargs["address"]),
+        tax_class=None,
+        defaults={"rate": 42},
+    )
+
+    # when
+    fetch_checkout_data(**fetch_kwargs)
+
+    # then
+    assert mocked_update_checkout_prices_with_flat_rates.call_count == 2
+    checkout.refresh_from_db()
+    assert checkout.price_inputs_hash != price_inputs_hash
+
+
+@patch(
+    "saleor.checkout.calculations.update_checkout_prices_with_flat_rates",
+    wraps=update_checkout_prices_with_flat_rates,
+)
+def test_fetch_checkout_data_price_inputs_after_prices_invalidation(
+    mocked_update_checkout_prices_with_flat_rates,
+    checkout_with_flat_rates,
+    fetch_kwargs,
+    settings,
+):
+    # given
+    settings.CHECKOUT_PRICES_INPUTS_HASH_ENABLED = True
+    fetch_checkout_data(**fetch_kwargs)
+    invalidate_checkout_prices(
+        fetch_kwargs["checkout_info"],
+        fetch_kwargs["lines"],
+        fetch_kwargs["manager"],
+        save=True,
+    )
+
+    # when
+    fetch_checkout_data(**fetch_kwargs)
+
+    # then
+    assert mocked_update_checkout_prices_with_flat_rates.call_count == 2
+
+
+def test_fetch_checkout_data_saves_only_changed_lines(
+    checkout_with_flat_rates, fetch_kwargs
+):
+    # given
+    checkout = fetch_kwargs["checkout_info"].checkout
+    fetch_checkout_data(**fetch_kwargs)
+    _expire_prices(checkout)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        fetch_checkout_data(**fetch_kwargs)
+
+    # then
+    assert not [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith('UPDATE "checkout_checkoutline"')
+    ]
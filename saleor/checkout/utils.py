@@ -72,7 +72,9 @@ def invalidate_checkout_prices(
         recalculate_checkout_discount(manager, checkout_info, lines)
 
     checkout.price_expiration = timezone.now()
-    updated_fields = ["price_expiration", "last_change"]
+    # make sure the prices are recalculated even if the price inputs hash matches
+    checkout.price_inputs_hash = None
+    updated_fields = ["price_expiration", "price_inputs_hash", "last_change"]
 
     if save:
         checkout.save(update_fields=updated_fields)
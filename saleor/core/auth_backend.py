@@ -16,6 +16,7 @@ from .jwt import (
     is_saleor_token,
     jwt_decode,
 )
+from .jwt_cache import CachedAccessToken, get_access_token_cache
 
 
 # Moved from `django.contrib.auth.backends.ModelBackend`
@@ -123,7 +124,9 @@ def load_user_from_request(request):
     jwt_token = get_token_from_request(request)
     if not jwt_token or not is_saleor_token(jwt_token):
         return None
-    payload = jwt_decode(jwt_token)
+    access_token_cache = get_access_token_cache()
+    cached_token = access_token_cache.get(jwt_token)
+    payload = dict(cached_token.payload) if cached_token else jwt_decode(jwt_token)
 
     jwt_type = payload.get("type")
     if jwt_type not in [JWT_ACCESS_TYPE, JWT_THIRDPARTY_ACCESS_TYPE]:
@@ -147,12 +150,48 @@ def load_user_from_request(request):
             "Invalid token. Create new one by using tokenCreate mutation."
         )
 
-    if permissions is not None:
-        token_permissions = get_permissions_from_names(permissions)
-        token_codenames = [perm.codename for perm in token_permissions]
-        user.effective_permissions = get_permissions_from_codenames(token_codenames)
-        user.is_staff = True if user.effective_permissions else False
+    permissions_version = access_token_cache.get_permissions_version()
+    if cached_token and cached_token.has_permissions_of(user, permissions_version):
+        _set_cached_permissions(user, cached_token)
+    else:
+        token_codenames = None
+        if permissions is not None:
+            token_permissions = get_permissions_from_names(permissions)
+            token_codenames = [perm.codename for perm in token_permissions]
+            _set_token_permissions(user, token_codenames)
+        if access_token_cache.enabled and "exp" in payload:
+            access_token_cache.set(
+                jwt_token,
+                CachedAccessToken(
+                    payload=payload,
+                    expires_at=payload["exp"],
+                    user_id=user.pk,
+                    jwt_token_key=user.jwt_token_key,
+                    is_superuser=user.is_superuser,
+                    permissions_version=permissions_version,
+                    token_permission_codenames=token_codenames,
+                    permissions=frozenset(_get_user_permissions(user)),
+                ),
+            )
 
     if payload.get("is_staff"):
         user.is_staff = True
     return user
+
+
+def _get_user_permissions(user) -> set[str]:
+    # Resolved the same way as by the authentication backend, which keeps the result
+    # on the user, so it is not fetched again while handling the request.
+    return JSONWebTokenBackend().get_all_permissions(user)
+
+
+def _set_token_permissions(user, token_codenames: list[str]):
+    user.effective_permissions = get_permissions_from_codenames(token_codenames)
+    user.is_staff = True if user.effective_permissions else False
+
+
+def _set_cached_permissions(user, cached_token: CachedAccessToken):
+    if cached_token.token_permission_codenames is not None:
+        _set_token_permissions(user, cached_token.token_permission_codenames)
+    # Set after `effective_permissions`, as its setter drops the backend cache.
+    user._effective_permissions_cache = set(cached_token.permissions)
@@ -0,0 +1,128 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, cast
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .utils.lru_cache import LRUCache
+
+PERMISSIONS_VERSION_CACHE_KEY = "jwt_permissions_version"
+
+
+@dataclass(frozen=True)
+class CachedAccessToken:
+    payload: dict[str, Any]
+    expires_at: float
+    user_id: Optional[int] = None
+    jwt_token_key: Optional[str] = None
+    is_superuser: bool = False
+    permissions_version: int = 0
+    # Codenames of the permissions granted by the token itself.
+    token_permission_codenames: Optional[list[str]] = None
+    # Effective permissions in the `<app_label>.<codename>` format, as returned by
+    # the authentication backend.
+    permissions: frozenset[str] = frozenset()
+
+    def has_permissions_of(self, user, permissions_version: int) -> bool:
+        """Return whether the cached permissions are still valid for the user.
+
+        The permissions are recomputed when the user's `jwt_token_key` rotates, their
+        superuser status changes, or any group or user permission changes.
+        """
+        return (
+            self.user_id == user.pk
+            and self.jwt_token_key == user.jwt_token_key
+            and self.is_superuser == user.is_superuser
+            and self.permissions_version == permissions_version
+        )
+
+
+def get_token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class AccessTokenCache:
+    """Cache of decoded access tokens and the permissions of their users.
+
+    Only tokens with a verified signature are stored, so a cache hit skips the
+    signature verification. Entries are kept in the process memory until the `exp`
+    claim of the token.
+
+    The permissions version is kept in the shared cache (`CACHE_URL`) and bumped
+    whenever group or user permissions change, so all processes drop the stale
+    permissions.
+    """
+
+    def __init__(self, max_size: int):
+        self._local_cache: LRUCache[CachedAccessToken] = LRUCache(max_size)
+
+    @property
+    def enabled(self) -> bool:
+        return self._local_cache.max_size > 0
+
+    def get(self, token: str) -> Optional[CachedAccessToken]:
+        if not self.enabled:
+            return None
+        key = get_token_cache_key(token)
+        cached_token = self._local_cache.get(key)
+        if cached_token is None:
+            return None
+        if cached_token.expires_at <= time.time():
+            self._local_cache.delete(key)
+            return None
+        return cached_token
+
+    def set(self, token: str, cached_token: CachedAccessToken):
+        if not self.enabled or cached_token.expires_at <= time.time():
+            return
+        self._local_cache.set(get_token_cache_key(token), cached_token)
+
+    def get_permissions_version(self) -> int:
+        if not self.enabled:
+            return 0
+        return cast(
+            int,
+            cache.get_or_set(
+                PERMISSIONS_VERSION_CACHE_KEY, _get_initial_permissions_version, None
+            ),
+        )
+
+    def clear(self):
+        self._local_cache.clear()
+        self._local_cache.reset_stats()
+
+    def get_stats(self) -> dict[str, int]:
+        return self._local_cache.get_stats()
+
+
+def _get_initial_permissions_version() -> int:
+    # Start from the current time, so a version evicted from the shared cache is not
+    # reused by the tokens cached before the eviction.
+    return time.time_ns()
+
+
+def invalidate_cached_permissions():
+    """Make all processes recompute the permissions of cached access tokens."""
+    if not get_access_token_cache().enabled:
+        return
+    try:
+        cache.incr(PERMISSIONS_VERSION_CACHE_KEY)
+    except ValueError:
+        # The key doesn't exist yet or was evicted from the cache.
+        cache.set(
+            PERMISSIONS_VERSION_CACHE_KEY,
+            _get_initial_permissions_version(),
+            timeout=None,
+        )
+
+
+_access_token_cache: Optional[AccessTokenCache] = None
+
+
+def get_access_token_cache() -> AccessTokenCache:
+    global _access_token_cache
+    if _access_token_cache is None:
+        _access_token_cache = AccessTokenCache(max_size=settings.JWT_CACHE_SIZE)
+    return _access_token_cache
@@ -1,6 +1,12 @@
 from django.core.management.base import BaseCommand
 
+from ...search_backfill import (
+    BACKFILL_BATCH_SIZE,
+    backfill_search_index,
+    get_backfill_id_range,
+)
 from ...search_tasks import (
+    backfill_search_index_in_parallel_task,
     set_order_search_document_values,
     set_product_search_document_values,
     set_user_search_document_values,
@@ -10,11 +16,42 @@ from ...search_tasks import (
 class Command(BaseCommand):
     help = "Populate search indexes."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sql",
+            action="store_true",
+            help=(
+                "Compute the missing order and user search values in the database "
+                "over ranges of ids. Interrupted backfill resumes from the first "
+                "instance still missing the values."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help=(
+                "With `--sql`, split the ids into the given number of Celery tasks. "
+                "By default, the values are updated in the current process."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help="With `--sql`, the number of ids updated by a single statement.",
+        )
+
     def handle(self, *args, **options):
         # Update products
         self.stdout.write("Updating products")
         set_product_search_document_values.delay()
 
+        if options["sql"]:
+            for index in ["order", "user"]:
+                self.backfill(index, options["workers"], options["batch_size"])
+            return
+
         # Update orders
         self.stdout.write("Updating orders")
         set_order_search_document_values.delay()
@@ -22,3 +59,19 @@ class Command(BaseCommand):
         # Update users
         self.stdout.write("Updating users")
         set_user_search_document_values.delay()
+
+    def backfill(self, index: str, workers: int, batch_size: int):
+        if workers:
+            backfill_search_index_in_parallel_task.delay(index, workers, batch_size)
+            self.stdout.write(f"Scheduled backfilling {index}s in {workers} tasks.")
+            return
+
+        id_range = get_backfill_id_range(index)
+        if id_range is None:
+            self.stdout.write(f"No {index}s to update.")
+            return
+        stats = backfill_search_index(index, *id_range, batch_size=batch_size)
+        self.stdout.write(
+            f"Updated {stats.rows} {index}s in {stats.duration:.2f}s "
+            f"({stats.rows_per_second:.1f} rows/s)."
+        )
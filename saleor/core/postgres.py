@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Sequence
 from typing import Optional, Union
 
 from django.conf import settings
@@ -7,7 +8,7 @@ from django.contrib.postgres.search import (
     SearchVector,
     SearchVectorCombinable,
 )
-from django.db.models import Expression
+from django.db.models import BooleanField, Expression, Func
 
 logger = logging.getLogger(__name__)
 
@@ -139,3 +140,36 @@ class FlatConcat(Expression):
 class FlatConcatSearchVector(FlatConcat):
     max_expression_count = settings.INDEX_MAXIMUM_EXPR_COUNT
     silent_drop_expression = True
+
+
+class RowValueComparison(Func):
+    """Compare rows of values, e.g. `(created_at, id) > (%s, %s)`.
+
+    PostgreSQL can use a multicolumn index to find the rows greater or lower than
+    the given one, unlike for the equivalent
+    `created_at > %s OR (created_at = %s AND id > %s)` condition.
+    The compared values must not be null.
+    """
+
+    conditional = True
+    output_field = BooleanField()
+    operators = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+    def __init__(self, lhs: Sequence, lookup: str, rhs: Sequence):
+        if len(lhs) != len(rhs):
+            raise ValueError("Compared rows must have the same length.")
+        self.operator = self.operators[lookup]
+        super().__init__(*lhs, *rhs)
+
+    def as_sql(self, compiler, connection, **_extra_context):
+        connection.ops.check_expression_support(self)
+        sql_parts: list[str] = []
+        params: list = []
+        for arg in self.source_expressions:
+            arg_sql, arg_params = compiler.compile(arg)
+            sql_parts.append(arg_sql)
+            params.extend(arg_params)
+        size = len(sql_parts) // 2
+        lhs_sql = ", ".join(sql_parts[:size])
+        rhs_sql = ", ".join(sql_parts[size:])
+        return f"(({lhs_sql}) {self.operator} ({rhs_sql}))", params
@@ -0,0 +1,366 @@
+"""Set-based backfill of the search indexes.
+
+The search values are computed by PostgreSQL with `UPDATE ... FROM` over ranges of
+ids, instead of loading the instances and building the values in Python. The
+statements mirror `prepare_order_search_vector_value` and
+`prepare_user_search_document_value`, so the result is the same; only the
+lowercasing of non-ASCII characters in user search documents follows the
+database locale.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max, Min, Q
+from django_countries import countries
+
+from ..account.models import User
+from ..order.models import Order
+
+# Number of ids updated by a single statement.
+BACKFILL_BATCH_SIZE = 10000
+
+COUNTRIES_CTE = """
+    countries(code, name) AS (
+        SELECT * FROM unnest(%(country_codes)s::text[], %(country_names)s::text[])
+    )
+"""
+
+ORDER_ADDRESS_SEARCH_TEXT = """
+    concat_ws(
+        ' ',
+        {address}.first_name,
+        {address}.last_name,
+        {address}.street_address_1,
+        {country}.name,
+        {address}.country,
+        NULLIF({address}.company_name, ''),
+        NULLIF({address}.country_area, ''),
+        NULLIF({address}.city, ''),
+        NULLIF({address}.city_area, ''),
+        NULLIF({address}.street_address_2, ''),
+        NULLIF({address}.postal_code, ''),
+        NULLIF({address}.phone, '')
+    )
+"""
+
+ORDER_SEARCH_VECTOR_SQL = f"""
+WITH {COUNTRIES_CTE}
+UPDATE order_order AS o
+SET search_vector = v.search_vector
+FROM (
+    SELECT
+        oo.id,
+        setweight(
+            to_tsvector(
+                'simple',
+                concat_ws(
+                    ' ',
+                    oo.number,
+                    NULLIF(oo.user_email, ''),
+                    u.email,
+                    NULLIF(u.first_name, ''),
+                    NULLIF(u.last_name, '')
+                )
+            ),
+            'A'
+        )
+        || setweight(
+            to_tsvector(
+                concat_ws(
+                    ' ',
+                    {ORDER_ADDRESS_SEARCH_TEXT.format(address="ba", country="bc")},
+                    {ORDER_ADDRESS_SEARCH_TEXT.format(address="sa", country="sc")}
+                )
+            ),
+            'B'
+        )
+        || setweight(
+            to_tsvector(
+                'simple',
+                coalesce(
+                    (
+                        SELECT string_agg(
+                            concat_ws(
+                                ' ',
+                                encode(convert_to('Payment:' || p.id, 'UTF8'), 'base64'),
+                                NULLIF(p.psp_reference, '')
+                            ),
+                            ' ' ORDER BY p.id
+                        )
+                        FROM (
+                            SELECT id, psp_reference
+                            FROM payment_payment
+                            WHERE order_id = oo.id
+                            ORDER BY id
+                            LIMIT %(max_payments)s
+                        ) AS p
+                    ),
+                    ''
+                )
+            ),
+            'D'
+        )
+        || setweight(
+            to_tsvector(
+                'simple',
+                coalesce(
+                    (
+                        SELECT string_agg(
+                            concat_ws(
+                                ' ', NULLIF(d.name, ''), NULLIF(d.translated_name, '')
+                            ),
+                            ' ' ORDER BY d.created_at, d.id
+                        )
+                        FROM (
+                            SELECT id, created_at, name, translated_name
+                            FROM discount_orderdiscount
+                            WHERE order_id = oo.id
+                            ORDER BY created_at, id
+                            LIMIT %(max_discounts)s
+                        ) AS d
+                    ),
+                    ''
+                )
+            ),
+            'D'
+        )
+        || setweight(
+            to_tsvector(
+                'simple',
+                coalesce(
+                    (
+                        SELECT string_agg(
+                            concat_ws(
+                                ' ',
+                                NULLIF(l.product_sku, ''),
+                                NULLIF(l.product_name, ''),
+                                NULLIF(l.variant_name, ''),
+                                NULLIF(l.translated_product_name, ''),
+                                NULLIF(l.translated_variant_name, '')
+                            ),
+                            ' ' ORDER BY l.created_at, l.id
+                        )
+                        FROM (
+                            SELECT
+                                id,
+                                created_at,
+                                product_sku,
+                                product_name,
+                                variant_name,
+                                translated_product_name,
+                                translated_variant_name
+                            FROM order_orderline
+                            WHERE order_id = oo.id
+                            ORDER BY created_at, id
+                            LIMIT %(max_lines)s
+                        ) AS l
+                    ),
+                    ''
+                )
+            ),
+            'C'
+        )
+        || setweight(
+            to_tsvector(
+                'simple',
+                coalesce(
+                    (
+                        SELECT string_agg(
+                            concat_ws(
+                                ' ',
+                                encode(
+                                    convert_to('TransactionItem:' || t.token, 'UTF8'),
+                                    'base64'
+                                ),
+                                NULLIF(t.psp_reference, ''),
+                                (
+                                    SELECT string_agg(
+                                        NULLIF(e.psp_reference, ''), ' ' ORDER BY e.id
+                                    )
+                                    FROM (
+                                        SELECT id, psp_reference
+                                        FROM payment_transactionevent
+                                        WHERE transaction_id = t.id
+                                        ORDER BY id
+                                        LIMIT %(max_transactions)s
+                                    ) AS e
+                                )
+                            ),
+                            ' ' ORDER BY t.id
+                        )
+                        FROM (
+                            SELECT id, token, psp_reference
+                            FROM payment_transactionitem
+                            WHERE order_id = oo.id
+                            ORDER BY id
+                            LIMIT %(max_transactions)s
+                        ) AS t
+                    ),
+                    ''
+                )
+            ),
+            'D'
+        ) AS search_vector
+    FROM order_order AS oo
+    LEFT JOIN account_user AS u ON u.id = oo.user_id
+    LEFT JOIN account_address AS ba ON ba.id = oo.billing_address_id
+    LEFT JOIN countries AS bc ON bc.code = ba.country
+    LEFT JOIN account_address AS sa ON sa.id = oo.shipping_address_id
+    LEFT JOIN countries AS sc ON sc.code = sa.country
+    WHERE
+        oo.number >= %(start_id)s
+        AND oo.number <= %(end_id)s
+        AND oo.search_vector IS NULL
+) AS v
+WHERE o.id = v.id
+"""
+
+USER_SEARCH_DOCUMENT_SQL = f"""
+WITH {COUNTRIES_CTE}
+UPDATE account_user AS u
+SET search_document = v.search_document
+FROM (
+    SELECT
+        uu.id,
+        lower(
+            concat(
+                NULLIF(uu.email, '') || E'\\n',
+                NULLIF(uu.first_name, '') || E'\\n',
+                NULLIF(uu.last_name, '') || E'\\n',
+                (
+                    SELECT string_agg(
+                        concat_ws(
+                            E'\\n',
+                            a.first_name,
+                            a.last_name,
+                            a.street_address_1,
+                            a.street_address_2,
+                            a.city,
+                            a.postal_code,
+                            coalesce(c.name, ''),
+                            a.country,
+                            a.phone
+                        ) || E'\\n',
+                        '' ORDER BY a.id
+                    )
+                    FROM account_user_addresses AS ua
+                    JOIN account_address AS a ON a.id = ua.address_id
+                    LEFT JOIN countries AS c ON c.code = a.country
+                    WHERE ua.user_id = uu.id
+                )
+            )
+        ) AS search_document
+    FROM account_user AS uu
+    WHERE
+        uu.id >= %(start_id)s
+        AND uu.id <= %(end_id)s
+        AND uu.search_document = ''
+) AS v
+WHERE u.id = v.id
+"""
+
+
+@dataclass(frozen=True)
+class SearchIndexBackfill:
+    sql: str
+    model: type[Union[Order, User]]
+    # Integer field which ranges are updated.
+    id_field: str
+    # Lookup of the instances without the search value.
+    missing_lookup: Q
+
+    def get_params(self) -> dict:
+        country_codes, country_names = zip(*countries)
+        return {
+            "country_codes": list(country_codes),
+            "country_names": [str(name) for name in country_names],
+            "max_payments": settings.SEARCH_ORDERS_MAX_INDEXED_PAYMENTS,
+            "max_discounts": settings.SEARCH_ORDERS_MAX_INDEXED_DISCOUNTS,
+            "max_lines": settings.SEARCH_ORDERS_MAX_INDEXED_LINES,
+            "max_transactions": settings.SEARCH_ORDERS_MAX_INDEXED_TRANSACTIONS,
+        }
+
+
+SEARCH_INDEX_BACKFILLS = {
+    "order": SearchIndexBackfill(
+        sql=ORDER_SEARCH_VECTOR_SQL,
+        model=Order,
+        id_field="number",
+        missing_lookup=Q(search_vector=None),
+    ),
+    "user": SearchIndexBackfill(
+        sql=USER_SEARCH_DOCUMENT_SQL,
+        model=User,
+        id_field="id",
+        missing_lookup=Q(search_document=""),
+    ),
+}
+
+
+@dataclass
+class BackfillStats:
+    rows: int
+    duration: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration else 0.0
+
+
+def get_backfill_id_range(index: str) -> Optional[tuple[int, int]]:
+    """Return the lowest and the highest id of the instances to backfill."""
+    backfill = SEARCH_INDEX_BACKFILLS[index]
+    id_range = backfill.model.objects.filter(backfill.missing_lookup).aggregate(
+        start_id=Min(backfill.id_field), end_id=Max(backfill.id_field)
+    )
+    if id_range["start_id"] is None:
+        return None
+    return id_range["start_id"], id_range["end_id"]
+
+
+def get_backfill_id_ranges(index: str, parts: int) -> list[tuple[int, int]]:
+    """Split the ids of the instances to backfill into ranges of a similar length."""
+    id_range = get_backfill_id_range(index)
+    if id_range is None:
+        return []
+    start_id, end_id = id_range
+    parts = min(parts, end_id - start_id + 1)
+    length = end_id - start_id + 1
+    start_ids = [start_id + length * part // parts for part in range(parts)]
+    end_ids = [next_start_id - 1 for next_start_id in start_ids[1:]] + [end_id]
+    return list(zip(start_ids, end_ids))
+
+
+def backfill_search_index(
+    index: str,
+    start_id: int,
+    end_id: int,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> BackfillStats:
+    """Compute the missing search values of the instances with ids in the range.
+
+    Each batch of `batch_size` ids is updated with a single statement and committed
+    separately. Only the instances with missing values are updated, so an
+    interrupted backfill resumes from the ids it has not reached, as the ranges are
+    computed from the instances still missing the values.
+    """
+    backfill = SEARCH_INDEX_BACKFILLS[index]
+    batch_start_id = start_id
+    params = backfill.get_params()
+
+    rows = 0
+    start = time.monotonic()
+    while batch_start_id <= end_id:
+        batch_end_id = min(batch_start_id + batch_size - 1, end_id)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                backfill.sql,
+                {**params, "start_id": batch_start_id, "end_id": batch_end_id},
+            )
+            rows += cursor.rowcount
+        batch_start_id = batch_end_id + 1
+    return BackfillStats(rows=rows, duration=time.monotonic() - start)
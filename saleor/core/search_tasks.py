@@ -1,3 +1,4 @@
+from celery import group
 from celery.utils.log import get_task_logger
 
 from ..account.models import User
@@ -11,6 +12,11 @@ from ..product.search import (
     prepare_product_search_vector_value,
 )
 from .postgres import FlatConcatSearchVector
+from .search_backfill import (
+    BACKFILL_BATCH_SIZE,
+    backfill_search_index,
+    get_backfill_id_ranges,
+)
 
 task_logger = get_task_logger(__name__)
 
@@ -108,6 +114,38 @@ def set_product_search_document_values(updated_count: int = 0) -> None:
     set_product_search_document_values.delay(updated_count)
 
 
+@app.task
+def backfill_search_index_task(
+    index: str, start_id: int, end_id: int, batch_size: int = BACKFILL_BATCH_SIZE
+) -> None:
+    stats = backfill_search_index(index, start_id, end_id, batch_size)
+    task_logger.info(
+        "Backfilled %s search index of %d rows with ids from %d to %d in %.2fs "
+        "(%.1f rows/s).",
+        index,
+        stats.rows,
+        start_id,
+        end_id,
+        stats.duration,
+        stats.rows_per_second,
+    )
+
+
+@app.task
+def backfill_search_index_in_parallel_task(
+    index: str, workers: int, batch_size: int = BACKFILL_BATCH_SIZE
+) -> None:
+    """Split backfilling the search index into `workers` tasks."""
+    id_ranges = get_backfill_id_ranges(index, workers)
+    if not id_ranges:
+        task_logger.info("No %s search index rows to backfill.", index)
+        return
+    group(
+        backfill_search_index_task.s(index, start_id, end_id, batch_size)
+        for start_id, end_id in id_ranges
+    ).apply_async()
+
+
 def set_search_document_values(instances: list, prepare_search_document_func):
     if not instances:
         return 0
@@ -9,7 +9,7 @@ from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from ..celeryconf import app
-from .models import EventDelivery, EventPayload
+from .models import EventDelivery, EventPayload, PersistedQuery
 
 task_logger: logging.Logger = get_task_logger(__name__)
 
@@ -42,6 +42,19 @@ def delete_event_payloads_task(expiration_date=None):
             task_logger.warning("Task invocation time limit reached, aborting task")
 
 
+@app.task
+def delete_expired_persisted_queries_task():
+    from ..graphql.core.persisted_queries import get_persisted_query_expiration_date
+
+    expired_queries = PersistedQuery.objects.filter(
+        created_at__lte=get_persisted_query_expiration_date()
+    )
+    ids = list(expired_queries.values_list("pk", flat=True)[:BATCH_SIZE])
+    if ids:
+        PersistedQuery.objects.filter(pk__in=ids).delete()
+        delete_expired_persisted_queries_task.delay()
+
+
 @app.task(
     autoretry_for=(ClientError,),
     retry_backoff=10,
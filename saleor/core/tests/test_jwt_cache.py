@@ -0,0 +1,181 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from freezegun import freeze_time
+from jwt import ExpiredSignatureError, InvalidTokenError
+
+from ...account.app import (
+    connect_permissions_cache_receivers,
+    disconnect_permissions_cache_receivers,
+)
+from .. import jwt_cache
+from ..auth_backend import JSONWebTokenBackend
+from ..jwt import create_access_token, create_access_token_for_app, jwt_decode
+from ..jwt_cache import AccessTokenCache
+
+
+@pytest.fixture
+def access_token_cache(monkeypatch):
+    cache = AccessTokenCache(max_size=10)
+    monkeypatch.setattr(jwt_cache, "_access_token_cache", cache)
+    connect_permissions_cache_receivers()
+    yield cache
+    disconnect_permissions_cache_receivers()
+
+
+def _authenticate(rf, token):
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {token}")
+    return JSONWebTokenBackend().authenticate(request)
+
+
+@patch("saleor.core.auth_backend.jwt_decode", wraps=jwt_decode)
+def test_cached_token_is_not_decoded_again(
+    mocked_jwt_decode, rf, staff_user, access_token_cache
+):
+    # given
+    token = create_access_token(staff_user)
+    _authenticate(rf, token)
+
+    # when
+    user = _authenticate(rf, token)
+
+    # then
+    assert user == staff_user
+    mocked_jwt_decode.assert_called_once()
+    assert access_token_cache.get_stats()["hits"] == 1
+
+
+def test_cached_token_permissions_are_reused(
+    rf,
+    staff_user,
+    permission_manage_orders,
+    access_token_cache,
+    django_assert_num_queries,
+):
+    # given
+    staff_user.user_permissions.add(permission_manage_orders)
+    token = create_access_token(staff_user)
+    _authenticate(rf, token)
+
+    # when
+    with django_assert_num_queries(1):
+        user = _authenticate(rf, token)
+        has_perm = user.has_perm("order.manage_orders")
+
+    # then
+    assert has_perm is True
+
+
+def test_cached_token_permissions_of_third_party_token(
+    rf,
+    staff_user,
+    app,
+    permission_manage_orders,
+    permission_manage_products,
+    access_token_cache,
+):
+    # given
+    staff_user.user_permissions.add(
+        permission_manage_orders, permission_manage_products
+    )
+    app.permissions.add(permission_manage_orders)
+    token = create_access_token_for_app(app, staff_user)
+    _authenticate(rf, token)
+
+    # when
+    user = _authenticate(rf, token)
+
+    # then
+    assert user.is_staff is True
+    assert user.has_perm("order.manage_orders")
+    assert not user.has_perm("product.manage_products")
+    assert list(user.effective_permissions) == [permission_manage_orders]
+
+
+def test_cached_token_rejected_after_jwt_token_key_rotation(
+    rf, staff_user, access_token_cache
+):
+    # given
+    token = create_access_token(staff_user)
+    _authenticate(rf, token)
+
+    # when
+    staff_user.jwt_token_key = "new-key"
+    staff_user.save(update_fields=["jwt_token_key"])
+
+    # then
+    with pytest.raises(InvalidTokenError):
+        _authenticate(rf, token)
+
+
+def test_cached_token_permissions_invalidated_by_group_change(
+    rf, staff_user, permission_group_manage_orders, access_token_cache
+):
+    # given
+    permission_group_manage_orders.user_set.add(staff_user)
+    token = create_access_token(staff_user)
+    assert _authenticate(rf, token).has_perm("order.manage_orders")
+
+    # when
+    permission_group_manage_orders.permissions.clear()
+
+    # then
+    assert not _authenticate(rf, token).has_perm("order.manage_orders")
+
+
+def test_cached_token_permissions_invalidated_by_group_membership_change(
+    rf, staff_user, permission_group_manage_orders, access_token_cache
+):
+    # given
+    token = create_access_token(staff_user)
+    assert not _authenticate(rf, token).has_perm("order.manage_orders")
+
+    # when
+    staff_user.groups.add(permission_group_manage_orders)
+
+    # then
+    assert _authenticate(rf, token).has_perm("order.manage_orders")
+
+
+def test_cached_token_expires_with_token(rf, staff_user, settings, access_token_cache):
+    # given
+    token = create_access_token(staff_user)
+    _authenticate(rf, token)
+
+    # when
+    with freeze_time(timezone.now() + settings.JWT_TTL_ACCESS + timedelta(seconds=1)):
+        # then
+        with pytest.raises(ExpiredSignatureError):
+            _authenticate(rf, token)
+    assert access_token_cache.get_stats()["size"] == 0
+
+
+def test_access_token_cache_disabled(rf, staff_user, monkeypatch):
+    # given
+    cache = AccessTokenCache(max_size=0)
+    monkeypatch.setattr(jwt_cache, "_access_token_cache", cache)
+    token = create_access_token(staff_user)
+
+    # when
+    _authenticate(rf, token)
+    user = _authenticate(rf, token)
+
+    # then
+    assert user == staff_user
+    assert cache.get_stats()["size"] == 0
+
+
+@patch("saleor.core.jwt_cache.cache")
+def test_invalidate_cached_permissions_cache_disabled(mocked_cache, monkeypatch):
+    # given
+    cache = AccessTokenCache(max_size=0)
+    monkeypatch.setattr(jwt_cache, "_access_token_cache", cache)
+
+    # when
+    jwt_cache.invalidate_cached_permissions()
+
+    # then
+    mocked_cache.incr.assert_not_called()
+    mocked_cache.set.assert_not_called()
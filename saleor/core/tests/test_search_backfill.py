@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+
+from ...account.search import prepare_user_search_document_value
+from ...order.models import Order
+from ...order.search import prepare_order_search_vector_value
+from ...payment import TransactionEventType
+from ..postgres import FlatConcatSearchVector
+from ..search_backfill import (
+    backfill_search_index,
+    get_backfill_id_range,
+    get_backfill_id_ranges,
+)
+
+
+def _get_python_search_vector(order):
+    Order.objects.filter(pk=order.pk).update(
+        search_vector=FlatConcatSearchVector(*prepare_order_search_vector_value(order))
+    )
+    order.refresh_from_db(fields=["search_vector"])
+    return order.search_vector
+
+
+def test_backfill_order_search_vector(
+    order_with_lines,
+    payment_dummy,
+    transaction_item_generator,
+    transaction_events_generator,
+):
+    # given
+    order = order_with_lines
+    payment_dummy.psp_reference = "PSP-payment"
+    payment_dummy.save(update_fields=["psp_reference"])
+    transaction = transaction_item_generator(order_id=order.pk, psp_reference="PSP-1")
+    transaction_events_generator(
+        psp_references=["PSP-event"],
+        types=[TransactionEventType.CHARGE_SUCCESS],
+        amounts=[Decimal(10)],
+        transaction=transaction,
+    )
+    order.discounts.create(name="Summer sale", translated_name="Letnia wyprzedaz")
+    expected_vector = _get_python_search_vector(order)
+    Order.objects.filter(pk=order.pk).update(search_vector=None)
+
+    # when
+    stats = backfill_search_index("order", order.number, order.number)
+
+    # then
+    order.refresh_from_db(fields=["search_vector"])
+    assert stats.rows == 1
+    assert order.search_vector == expected_vector
+
+
+def test_backfill_order_search_vector_without_user_and_addresses(order):
+    # given
+    order.user = None
+    order.billing_address = None
+    order.shipping_address = None
+    order.save(update_fields=["user", "billing_address", "shipping_address"])
+    expected_vector = _get_python_search_vector(order)
+    Order.objects.filter(pk=order.pk).update(search_vector=None)
+
+    # when
+    backfill_search_index("order", order.number, order.number)
+
+    # then
+    order.refresh_from_db(fields=["search_vector"])
+    assert order.search_vector == expected_vector
+
+
+def test_backfill_user_search_document(customer_user, customer_user2):
+    # given
+    # `lower()` of non-ASCII characters depends on the database locale
+    customer_user.addresses.update(city="WROCLAW")
+    expected_document = prepare_user_search_document_value(customer_user)
+    customer_user2.search_document = "existing_search_document"
+    customer_user2.save(update_fields=["search_document"])
+    start_id, end_id = sorted([customer_user.pk, customer_user2.pk])
+
+    # when
+    stats = backfill_search_index("user", start_id, end_id, batch_size=1)
+
+    # then
+    customer_user.refresh_from_db()
+    customer_user2.refresh_from_db()
+    assert stats.rows == 1
+    assert customer_user.search_document == expected_document
+    assert customer_user2.search_document == "existing_search_document"
+
+
+def test_backfill_resumes_after_interruption(order_generator):
+    # given
+    orders = [order_generator() for _ in range(3)]
+    Order.objects.update(search_vector=None)
+    # the first orders were updated before the backfill was interrupted
+    backfill_search_index("order", orders[0].number, orders[1].number)
+    start_id, end_id = get_backfill_id_range("order")
+
+    # when
+    stats = backfill_search_index("order", start_id, end_id, batch_size=1)
+
+    # then
+    assert (start_id, end_id) == (orders[2].number, orders[2].number)
+    assert stats.rows == 1
+    assert not Order.objects.filter(search_vector__isnull=True).exists()
+
+
+def test_get_backfill_id_ranges(order_generator):
+    # given
+    orders = [order_generator() for _ in range(5)]
+    Order.objects.update(search_vector=None)
+    start_id, end_id = orders[0].number, orders[-1].number
+
+    # when
+    id_ranges = get_backfill_id_ranges("order", 2)
+
+    # then
+    assert id_ranges == [(start_id, start_id + 1), (start_id + 2, end_id)]
+
+
+def test_get_backfill_id_ranges_nothing_to_backfill(order):
+    # given
+    Order.objects.update(search_vector="")
+
+    # when
+    id_ranges = get_backfill_id_ranges("order", 2)
+
+    # then
+    assert id_ranges == []
+
+
+def test_update_search_indexes_command_sql(order, customer_user):
+    # given
+    Order.objects.update(search_vector=None)
+
+    # when
+    call_command("update_search_indexes", "--sql")
+
+    # then
+    order.refresh_from_db()
+    customer_user.refresh_from_db()
+    assert order.user_email in order.search_vector
+    assert customer_user.email in customer_user.search_document
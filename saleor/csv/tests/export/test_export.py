@@ -1,14 +1,14 @@
 import datetime
+import gzip
 import json
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import graphene
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
+from django.test import override_settings
 from freezegun import freeze_time
 
 from ....core import JobStatus
@@ -19,7 +19,6 @@ from ....graphql.product.filters import ProductFilter
 from ....product.models import Product, ProductChannelListing
 from ... import FileTypes
 from ...utils.export import (
-    append_to_file,
     create_file_with_headers,
     export_gift_cards,
     export_gift_cards_in_batches,
@@ -32,6 +31,7 @@ from ...utils.export import (
     parse_input,
     save_csv_file_in_export_file,
 )
+from ...utils.writers import ExportFileWriter
 
 
 @pytest.mark.parametrize(
@@ -63,7 +63,7 @@ def test_export_products(
         "channels": [],
     }
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     product_list[0].variants.update(sku=None)
@@ -84,12 +84,12 @@ def test_export_products(
         export_info,
         {"id", "name", "variants__id", "variants__sku"},
         ["id", "name", "variants__id", "variants__sku"],
-        ",",
         mock_file,
-        file_type,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -112,7 +112,7 @@ def test_export_products_ids(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -131,12 +131,12 @@ def test_export_products_ids(
         export_info,
         {"id"},
         ["id"],
-        ",",
         mock_file,
-        file_type,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -163,7 +163,7 @@ def test_export_products_filter_is_published(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -188,12 +188,12 @@ def test_export_products_filter_is_published(
         export_info,
         {"id"},
         ["id"],
-        ",",
         mock_file,
-        file_type,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -219,7 +219,7 @@ def test_export_products_filter_collections(
     assert user_export_file.status == JobStatus.PENDING
     assert not user_export_file.content_file
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -240,9 +240,11 @@ def test_export_products_filter_collections(
     assert export_products_in_batches_mock.call_count == 1
     batch_args, _ = export_products_in_batches_mock.call_args
     assert set(batch_args[0].values_list("pk", flat=True)) == {product_list[-1].pk}
-    assert batch_args[1:] == (export_info, {"id"}, ["id"], ",", mock_file, file_type)
+    assert batch_args[1:] == (export_info, {"id"}, ["id"], mock_file)
     send_email_mock.assert_called_once_with(user_export_file, "products")
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -266,7 +268,7 @@ def test_export_products_by_app(
     }
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -286,14 +288,14 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "products")
 
-    save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        app_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.plugins.manager.PluginsManager.product_export_completed")
@@ -330,7 +332,7 @@ def test_export_gift_cards(
     # given
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -346,14 +348,14 @@ def test_export_gift_cards(
     )
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
 
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -372,7 +374,7 @@ def test_export_gift_cards_by_app(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     # when
@@ -388,14 +390,14 @@ def test_export_gift_cards_by_app(
     )
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "gift cards")
 
-    save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        app_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -414,7 +416,7 @@ def test_export_gift_cards_ids(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
     pks = [gift_card.pk]
 
@@ -429,14 +431,14 @@ def test_export_gift_cards_ids(
     assert set(args[0].values_list("pk", flat=True)) == set(pks)
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
 
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -456,7 +458,7 @@ def test_export_gift_cards_with_filter(
 ):
     file_type = FileTypes.CSV
 
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
 
     gift_card_expiry_date.product = shippable_gift_card_product
@@ -486,14 +488,14 @@ def test_export_gift_cards_with_filter(
     assert set(args[0].values_list("pk", flat=True)) == {gift_card_expiry_date.pk}
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
 
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.plugins.manager.PluginsManager.gift_card_export_completed")
@@ -531,6 +533,13 @@ def test_get_filename_xlsx():
         assert file_name.endswith(".xlsx")
 
 
+@override_settings(EXPORT_FILES_CSV_GZIP_ENABLED=True)
+def test_get_filename_compressed_csv():
+    file_name = get_filename("test", FileTypes.CSV)
+
+    assert file_name.endswith(".csv.gz")
+
+
 def test_get_product_queryset_all(product_list):
     queryset = get_queryset(Product, ProductFilter, {"all": ""})
 
@@ -566,7 +575,7 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     # then
     assert csv_file
 
-    file_content = csv_file.read().decode().split("\r\n")
+    file_content = csv_file.finish().read().decode().split("\r\n")
 
     assert ",".join(file_headers) in file_content
 
@@ -585,7 +594,7 @@ def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
     # then
     assert xlsx_file
 
-    wb_obj = openpyxl.load_workbook(xlsx_file)
+    wb_obj = openpyxl.load_workbook(xlsx_file.finish())
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
@@ -611,71 +620,75 @@ def test_save_csv_file_in_export_file(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
+def test_file_writer_write_rows_for_csv():
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
         {"id": "345", "name": "test2"},
     ]
     headers = ["id", "name", "collections"]
-    delimiter = ","
+    file_writer = create_file_with_headers(headers, ",", FileTypes.CSV)
 
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing="")
+    # when
+    file_writer.write_rows(export_data, headers)
 
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    # then
+    file_content = file_writer.finish().read().decode().split("\r\n")
+    assert file_content == [
+        ",".join(headers),
+        ",".join(export_data[0].values()),
+        ",".join(export_data[1].values()) + ",",
+        "",
+    ]
+
+    file_writer.close()
+
+
+@override_settings(EXPORT_FILES_CSV_GZIP_ENABLED=True)
+def test_file_writer_write_rows_for_compressed_csv():
+    # given
+    export_data = [{"id": "123", "name": "test1"}, {"id": "345", "name": "test2"}]
+    headers = ["id", "name"]
+    file_writer = create_file_with_headers(headers, ";", FileTypes.CSV)
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    file_writer.write_rows(export_data, headers)
 
     # then
-    user_export_file.refresh_from_db()
+    with gzip.open(file_writer.finish(), "rt") as compressed_file:
+        file_content = compressed_file.read().split("\n")
+    assert file_content == ["id;name", "123;test1", "345;test2", ""]
 
-    file_content = temp_file.read().decode().split("\r\n")
-    assert ",".join(headers) in file_content
-    assert ",".join(export_data[0].values()) in file_content
-    assert (",".join(export_data[1].values()) + ",") in file_content
+    file_writer.close()
 
-    temp_file.close()
-    shutil.rmtree(tmpdir)
 
-
-def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
+def test_file_writer_write_rows_for_xlsx():
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
         {"id": "345", "name": "test2"},
     ]
     expected_headers = ["id", "name", "collections"]
-
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=""
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(expected_headers, ",", FileTypes.XLSX)
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, ",")
+    file_writer.write_rows(export_data, expected_headers)
 
     # then
-    user_export_file.refresh_from_db()
-
-    workbook = openpyxl.load_workbook(temp_file)
+    workbook = openpyxl.load_workbook(file_writer.finish())
 
     sheet = workbook.worksheets[0]
     assert sheet.cell(1, 1).value == expected_headers[0]
     assert sheet.cell(1, 2).value == expected_headers[1]
     assert sheet.cell(1, 3).value == expected_headers[2]
-    assert sheet.cell(3, 1).value == export_data[0]["id"]
-    assert sheet.cell(3, 2).value == export_data[0]["name"]
-    assert sheet.cell(3, 3).value == export_data[0]["collections"]
-    assert sheet.cell(4, 1).value == export_data[1]["id"]
-    assert sheet.cell(4, 2).value == export_data[1]["name"]
-    assert sheet.cell(4, 3).value is None
-
-    temp_file.close()
-    shutil.rmtree(tmpdir)
+    assert sheet.cell(2, 1).value == export_data[0]["id"]
+    assert sheet.cell(2, 2).value == export_data[0]["name"]
+    assert sheet.cell(2, 3).value == export_data[0]["collections"]
+    assert sheet.cell(3, 1).value == export_data[1]["id"]
+    assert sheet.cell(3, 2).value == export_data[1]["name"]
+    assert sheet.cell(3, 3).value is None
+
+    file_writer.close()
 
 
 @patch("saleor.csv.utils.export.BATCH_SIZE", 1)
@@ -700,10 +713,7 @@ def test_export_products_in_batches_for_csv(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    file_writer = create_file_with_headers(expected_headers, ",", FileTypes.CSV)
 
     # when
     export_products_in_batches(
@@ -711,9 +721,7 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.CSV,
+        file_writer,
     )
 
     # then
@@ -729,7 +737,7 @@ def test_export_products_in_batches_for_csv(
             product_data.append(str(variant.sku))
             expected_data.append(product_data)
 
-    file_content = temp_file.read().decode().split("\r\n")
+    file_content = file_writer.finish().read().decode().split("\r\n")
 
     # ensure headers are in file
     assert ",".join(expected_headers) in file_content
@@ -770,10 +778,7 @@ def test_export_products_in_batches_for_xlsx(
     export_fields = ["id", "name", "description_as_str", "variants__sku"]
     expected_headers = ["id", "name", "description", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(expected_headers, ",", FileTypes.XLSX)
 
     # when
     export_products_in_batches(
@@ -781,9 +786,7 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.XLSX,
+        file_writer,
     )
 
     # then
@@ -799,7 +802,7 @@ def test_export_products_in_batches_for_xlsx(
             product_data.append(variant.sku)
             expected_data.append(product_data)
 
-    wb_obj = openpyxl.load_workbook(temp_file)
+    wb_obj = openpyxl.load_workbook(file_writer.finish())
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
@@ -829,21 +832,17 @@ def test_export_gift_cards_in_batches_to_csv(
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    file_writer = create_file_with_headers(["code"], ",", FileTypes.CSV)
 
     # when
     export_gift_cards_in_batches(
         gift_cards,
         ["code"],
-        ",",
-        temp_file,
-        "csv",
+        file_writer,
     )
 
     # then
-    file_content = temp_file.read().decode().split("\r\n")
+    file_content = file_writer.finish().read().decode().split("\r\n")
 
     # ensure headers are in the file
     assert "code" in file_content
@@ -864,21 +863,17 @@ def test_export_gift_cards_in_batches_to_xlsx(
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(["code"], ",", FileTypes.XLSX)
 
     # when
     export_gift_cards_in_batches(
         gift_cards,
         ["code"],
-        ",",
-        temp_file,
-        "xlsx",
+        file_writer,
     )
 
     # then
-    wb_obj = openpyxl.load_workbook(temp_file)
+    wb_obj = openpyxl.load_workbook(file_writer.finish())
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
@@ -950,7 +945,7 @@ def test_export_voucher_codes_by_voucher_id(
     voucher_with_many_codes,
     voucher_percentage,
 ):
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
     file_type = FileTypes.CSV
     voucher = voucher_with_many_codes
@@ -968,14 +963,14 @@ def test_export_voucher_codes_by_voucher_id(
     )
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "voucher codes")
 
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -991,7 +986,7 @@ def test_export_voucher_codes_by_ids(
     voucher_with_many_codes,
     voucher_percentage,
 ):
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
     file_type = FileTypes.CSV
     voucher = voucher_with_many_codes
@@ -1010,14 +1005,14 @@ def test_export_voucher_codes_by_ids(
     )
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "voucher codes")
 
-    save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        user_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.csv.utils.export.create_file_with_headers")
@@ -1032,7 +1027,7 @@ def test_export_voucher_codes_by_app(
     app_export_file,
     voucher_with_many_codes,
 ):
-    mock_file = MagicMock(spec=File)
+    mock_file = MagicMock(spec=ExportFileWriter)
     create_file_with_headers_mock.return_value = mock_file
     file_type = FileTypes.CSV
     voucher = voucher_with_many_codes
@@ -1050,14 +1045,14 @@ def test_export_voucher_codes_by_app(
     )
     assert args[1:] == (
         ["code"],
-        ",",
         mock_file,
-        file_type,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "voucher codes")
 
-    save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
+    save_file_mock.assert_called_once_with(
+        app_export_file, mock_file.finish.return_value, ANY
+    )
 
 
 @patch("saleor.plugins.manager.PluginsManager.voucher_code_export_completed")
@@ -1085,21 +1080,17 @@ def test_export_voucher_codes_in_batches_to_csv(
     # given
     voucher_codes = voucher_with_many_codes.codes.all()
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    file_writer = create_file_with_headers(["code"], ",", FileTypes.CSV)
 
     # when
     export_voucher_codes_in_batches(
         voucher_codes,
         ["code"],
-        ",",
-        temp_file,
-        "csv",
+        file_writer,
     )
 
     # then
-    file_content = temp_file.read().decode().split("\r\n")
+    file_content = file_writer.finish().read().decode().split("\r\n")
 
     # ensure headers are in the file
     assert "code" in file_content
@@ -1118,21 +1109,17 @@ def test_export_voucher_codes_in_batches_to_xlsx(
     # given
     voucher_codes = voucher_with_many_codes.codes.all()
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(["code"], ",", FileTypes.XLSX)
 
     # when
     export_voucher_codes_in_batches(
         voucher_codes,
         ["code"],
-        ",",
-        temp_file,
-        "xlsx",
+        file_writer,
     )
 
     # then
-    wb_obj = openpyxl.load_workbook(temp_file)
+    wb_obj = openpyxl.load_workbook(file_writer.finish())
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
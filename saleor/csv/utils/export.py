@@ -1,9 +1,9 @@
 import uuid
 from datetime import date, datetime
-from tempfile import NamedTemporaryFile
+from itertools import islice
 from typing import IO, TYPE_CHECKING, Any, Optional, Union
 
-import petl as etl
+from django.conf import settings
 from django.utils import timezone
 
 from ...discount.models import VoucherCode
@@ -13,6 +13,7 @@ from .. import FileTypes
 from ..notifications import send_export_download_link_notification
 from .product_headers import get_product_export_fields_and_headers_info
 from .products_data import get_products_data
+from .writers import ExportFileWriter, get_file_writer
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -41,20 +42,18 @@ def export_products(
         data_headers,
     ) = get_product_export_fields_and_headers_info(export_info)
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    file_writer = create_file_with_headers(file_headers, delimiter, file_type)
 
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        file_writer,
     )
 
-    save_csv_file_in_export_file(export_file, temporary_file, file_name)
-    temporary_file.close()
+    save_csv_file_in_export_file(export_file, file_writer.finish(), file_name)
+    file_writer.close()
 
     send_export_download_link_notification(export_file, "products")
 
@@ -74,18 +73,12 @@ def export_gift_cards(
     queryset = queryset.filter(used_by_email__isnull=True)
 
     export_fields = ["code"]
-    temporary_file = create_file_with_headers(export_fields, delimiter, file_type)
+    file_writer = create_file_with_headers(export_fields, delimiter, file_type)
 
-    export_gift_cards_in_batches(
-        queryset,
-        export_fields,
-        delimiter,
-        temporary_file,
-        file_type,
-    )
+    export_gift_cards_in_batches(queryset, export_fields, file_writer)
 
-    save_csv_file_in_export_file(export_file, temporary_file, file_name)
-    temporary_file.close()
+    save_csv_file_in_export_file(export_file, file_writer.finish(), file_name)
+    file_writer.close()
 
     send_export_download_link_notification(export_file, "gift cards")
 
@@ -106,28 +99,27 @@ def export_voucher_codes(
         qs = VoucherCode.objects.filter(id__in=ids)
 
     export_fields = ["code"]
-    temporary_file = create_file_with_headers(export_fields, delimiter, file_type)
+    file_writer = create_file_with_headers(export_fields, delimiter, file_type)
 
-    export_voucher_codes_in_batches(
-        qs,
-        export_fields,
-        delimiter,
-        temporary_file,
-        file_type,
-    )
+    export_voucher_codes_in_batches(qs, export_fields, file_writer)
 
-    save_csv_file_in_export_file(export_file, temporary_file, file_name)
-    temporary_file.close()
+    save_csv_file_in_export_file(export_file, file_writer.finish(), file_name)
+    file_writer.close()
     send_export_download_link_notification(export_file, "voucher codes")
 
 
 def get_filename(model_name: str, file_type: str) -> str:
     hash = uuid.uuid4()
+    extension = f"{file_type}.gz" if is_compressed(file_type) else file_type
     return "{}_data_{}_{}.{}".format(
-        model_name, timezone.now().strftime("%d_%m_%Y_%H_%M_%S"), hash, file_type
+        model_name, timezone.now().strftime("%d_%m_%Y_%H_%M_%S"), hash, extension
     )
 
 
+def is_compressed(file_type: str) -> bool:
+    return file_type == FileTypes.CSV and settings.EXPORT_FILES_CSV_GZIP_ENABLED
+
+
 def get_queryset(model, filter, scope: dict[str, Union[str, dict]]) -> "QuerySet":
     queryset = model.objects.all()
     if "ids" in scope:
@@ -169,17 +161,12 @@ def parse_input(data: Any) -> dict[str, Union[str, dict]]:
     return data
 
 
-def create_file_with_headers(file_headers: list[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
-
-    if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
-    else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
-
-    return temp_file
+def create_file_with_headers(
+    file_headers: list[str], delimiter: str, file_type: str
+) -> ExportFileWriter:
+    return get_file_writer(
+        file_headers, delimiter, file_type, compress=is_compressed(file_type)
+    )
 
 
 def export_products_in_batches(
@@ -187,9 +174,7 @@ def export_products_in_batches(
     export_info: dict[str, list],
     export_fields: set[str],
     headers: list[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    file_writer: ExportFileWriter,
 ):
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
@@ -209,71 +194,44 @@ def export_products_in_batches(
             product_batch, export_fields, attributes, warehouses, channels
         )
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+        file_writer.write_rows(export_data, headers)
 
 
 def export_gift_cards_in_batches(
     queryset: "QuerySet",
     export_fields: list[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    file_writer: ExportFileWriter,
 ):
     for batch_pks in queryset_in_batches(queryset):
         gift_card_batch = GiftCard.objects.filter(pk__in=batch_pks)
 
         export_data = list(gift_card_batch.values(*export_fields))
 
-        append_to_file(export_data, export_fields, temporary_file, file_type, delimiter)
+        file_writer.write_rows(export_data, export_fields)
 
 
 def export_voucher_codes_in_batches(
     queryset: "QuerySet",
     export_fields: list[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    file_writer: ExportFileWriter,
 ):
     for batch_pks in queryset_in_batches(queryset):
         voucher_codes_batch = VoucherCode.objects.filter(pk__in=batch_pks)
 
         export_data = list(voucher_codes_batch.values(*export_fields))
 
-        append_to_file(export_data, export_fields, temporary_file, file_type, delimiter)
+        file_writer.write_rows(export_data, export_fields)
 
 
 def queryset_in_batches(queryset):
-    """Slice a queryset into batches.
+    """Slice a queryset into batches of pks.
 
-    Input queryset should be sorted be pk.
+    The pks are read through a server-side cursor, so the queryset is queried once
+    instead of once per batch.
     """
-    start_pk = 0
-
-    while True:
-        qs = queryset.order_by("pk").filter(pk__gt=start_pk)[:BATCH_SIZE]
-        pks = list(qs.values_list("pk", flat=True))
-
-        if not pks:
-            break
-
-        yield pks
-
-        start_pk = pks[-1]
-
-
-def append_to_file(
-    export_data: list[dict[str, Union[str, bool]]],
-    headers: list[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
-):
-    table = etl.fromdicts(export_data, header=headers, missing="")
-
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
+    pks = queryset.order_by("pk").values_list("pk", flat=True).iterator(BATCH_SIZE)
+    while batch_pks := list(islice(pks, BATCH_SIZE)):
+        yield batch_pks
 
 
 def save_csv_file_in_export_file(
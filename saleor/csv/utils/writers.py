@@ -0,0 +1,94 @@
+import csv
+import gzip
+import io
+from tempfile import NamedTemporaryFile
+from typing import IO, Union
+
+from openpyxl import Workbook
+
+from .. import FileTypes
+
+ExportData = list[dict[str, Union[str, bool]]]
+
+
+class ExportFileWriter:
+    """Write the exported rows to a temporary file kept open for the whole export.
+
+    Rows are written as they come, so the memory usage doesn't depend on the number
+    of exported rows, and the file is not re-opened for each batch.
+    """
+
+    suffix = ""
+
+    def __init__(self):
+        self.temporary_file = NamedTemporaryFile("w+b", suffix=self.suffix)
+
+    def write_row(self, row: list):
+        raise NotImplementedError()
+
+    def write_rows(self, export_data: ExportData, headers: list[str]):
+        """Write the values of given headers; missing values are left empty."""
+        for data in export_data:
+            self.write_row([data.get(header, "") for header in headers])
+
+    def finish(self) -> IO[bytes]:
+        """Complete the file and return it ready to be read from the beginning."""
+        self.temporary_file.flush()
+        self.temporary_file.seek(0)
+        return self.temporary_file
+
+    def close(self):
+        self.temporary_file.close()
+
+
+class CSVFileWriter(ExportFileWriter):
+    suffix = ".csv"
+
+    def __init__(self, file_headers: list[str], delimiter: str, compress=False):
+        super().__init__()
+        self.compressed_file = (
+            gzip.GzipFile(fileobj=self.temporary_file, mode="wb") if compress else None
+        )
+        self.stream = io.TextIOWrapper(
+            self.compressed_file or self.temporary_file,  # type: ignore[arg-type]
+            encoding="utf-8",
+            newline="",
+        )
+        self.writer = csv.writer(self.stream, delimiter=delimiter)
+        self.write_row(file_headers)
+
+    def write_row(self, row: list):
+        self.writer.writerow(row)
+
+    def finish(self) -> IO[bytes]:
+        self.stream.flush()
+        # Detach the wrapper, so it doesn't close the temporary file.
+        self.stream.detach()
+        if self.compressed_file:
+            self.compressed_file.close()
+        return super().finish()
+
+
+class XLSXFileWriter(ExportFileWriter):
+    suffix = ".xlsx"
+
+    def __init__(self, file_headers: list[str]):
+        super().__init__()
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet()
+        self.write_row(file_headers)
+
+    def write_row(self, row: list):
+        self.worksheet.append(row)
+
+    def finish(self) -> IO[bytes]:
+        self.workbook.save(self.temporary_file)
+        return super().finish()
+
+
+def get_file_writer(
+    file_headers: list[str], delimiter: str, file_type: str, compress=False
+) -> ExportFileWriter:
+    if file_type == FileTypes.CSV:
+        return CSVFileWriter(file_headers, delimiter, compress=compress)
+    return XLSXFileWriter(file_headers)
@@ -7,6 +7,7 @@ from django.utils.functional import LazyObject
 from promise import Promise
 
 from ...app.models import App, AppExtension, AppToken
+from ...app.token_cache import get_verified_app_token_cache
 from ...core.auth import get_token_from_request
 from ...core.utils.lazyobjects import unwrap_lazy
 from ..core import SaleorContext
@@ -87,13 +88,21 @@ class AppByTokenLoader(DataLoader):
         tokens = (
             AppToken.objects.using(self.database_connection_name)
             .filter(token_last_4__in=last_4s_to_raw_token_map.keys())
-            .values_list("auth_token", "token_last_4", "app_id")
+            .values_list("id", "auth_token", "token_last_4", "app_id")
         )
+        # Checking the password hash is slow, so tokens already verified against
+        # the stored hash are cached.
+        token_cache = get_verified_app_token_cache()
         authed_apps = {}
-        for auth_token, token_last_4, app_id in tokens:
+        for token_id, auth_token, token_last_4, app_id in tokens:
             for raw_token in last_4s_to_raw_token_map[token_last_4]:
-                if check_password(raw_token, auth_token):
+                if raw_token in authed_apps:
+                    continue
+                if token_cache.is_verified(raw_token, token_id, auth_token):
                     authed_apps[raw_token] = app_id
+                elif check_password(raw_token, auth_token):
+                    authed_apps[raw_token] = app_id
+                    token_cache.set_verified(raw_token, token_id, auth_token)
 
         apps = (
             App.objects.using(self.database_connection_name)
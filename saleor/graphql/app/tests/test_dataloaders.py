@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.hashers import check_password
+
+from ....app import token_cache
+from ....app.models import AppToken
+from ....app.token_cache import VerifiedAppTokenCache
+from ...core import SaleorContext
+from ..dataloaders import AppByTokenLoader
+
+
+@pytest.fixture
+def verified_app_token_cache(monkeypatch):
+    cache = VerifiedAppTokenCache(max_size=10, timeout=60, use_shared_cache=False)
+    monkeypatch.setattr(token_cache, "_verified_app_token_cache", cache)
+    return cache
+
+
+def _load_app_by_token(raw_token):
+    return AppByTokenLoader(SaleorContext()).load(raw_token).get()
+
+
+@mock.patch("saleor.graphql.app.dataloaders.check_password", wraps=check_password)
+def test_app_by_token_loader_uses_verified_token_cache(
+    mocked_check_password, app, verified_app_token_cache
+):
+    # given
+    _, raw_token = AppToken.objects.create_with_token(app=app)
+
+    # when
+    first_app = _load_app_by_token(raw_token)
+    second_app = _load_app_by_token(raw_token)
+
+    # then
+    assert first_app == second_app == app
+    mocked_check_password.assert_called_once()
+    assert verified_app_token_cache.get_stats()["hits"] == 1
+
+
+def test_app_by_token_loader_token_deleted(app, verified_app_token_cache):
+    # given
+    app_token, raw_token = AppToken.objects.create_with_token(app=app)
+    assert _load_app_by_token(raw_token) == app
+
+    # when
+    app_token.delete()
+
+    # then
+    assert _load_app_by_token(raw_token) is None
+
+
+def test_app_by_token_loader_app_deactivated(app, verified_app_token_cache):
+    # given
+    _, raw_token = AppToken.objects.create_with_token(app=app)
+    assert _load_app_by_token(raw_token) == app
+
+    # when
+    app.is_active = False
+    app.save(update_fields=["is_active"])
+
+    # then
+    assert _load_app_by_token(raw_token) is None
+
+
+def test_app_by_token_loader_invalid_token(app, verified_app_token_cache):
+    # given
+    _, raw_token = AppToken.objects.create_with_token(app=app)
+    invalid_token = "x" * 26 + raw_token[-4:]
+
+    # when
+    loaded_app = _load_app_by_token(invalid_token)
+
+    # then
+    assert loaded_app is None
+    assert verified_app_token_cache.get_stats()["size"] == 0
@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class GraphQLAppConfig(AppConfig):
+    name = "saleor.graphql"
+
+    def ready(self):
+        from django.apps import apps
+
+        from .core.dataloader_cache import VERSIONED_MODELS, invalidate_dataloader_cache
+
+        # the signals are connected in every process, also in the ones that don't
+        # load the schema, like Celery workers
+        for label in VERSIONED_MODELS:
+            model = apps.get_model(label)
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    invalidate_dataloader_cache,
+                    sender=model,
+                    dispatch_uid=f"invalidate_dataloader_cache_{label}",
+                )
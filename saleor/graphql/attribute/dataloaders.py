@@ -1,6 +1,7 @@
 from collections import defaultdict
 
 from ...attribute.models import Attribute, AttributeValue
+from ..core.dataloader_cache import SharedDataLoaderCache
 from ..core.dataloaders import DataLoader
 
 
@@ -31,6 +32,7 @@ class AttributesByAttributeId(DataLoader):
 
 class AttributeValueByIdLoader(DataLoader):
     context_key = "attributevalue_by_id"
+    shared_cache = SharedDataLoaderCache(models=[AttributeValue])
 
     def batch_load(self, keys):
         attribute_values = AttributeValue.objects.using(
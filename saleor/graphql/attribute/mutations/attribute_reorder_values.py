@@ -7,6 +7,7 @@ from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductTypePermissions
 from ....webhook.event_types import WebhookEventAsyncType
 from ...core import ResolveInfo
+from ...core.dataloader_cache import invalidate_model_cache_version
 from ...core.doc_category import DOC_CATEGORY_ATTRIBUTES
 from ...core.inputs import ReorderInput
 from ...core.mutations import BaseMutation
@@ -93,6 +94,8 @@ class AttributeReorderValues(BaseMutation):
 
         with traced_atomic_transaction():
             perform_reordering(values_m2m, operations)
+        # the sort order is updated in bulk, without the model signals
+        invalidate_model_cache_version(models.AttributeValue)
         attribute.refresh_from_db(fields=["values"])
         manager = get_plugin_manager_promise(info.context).get()
         events_list = [v for v in values_m2m if v.id in operations.keys()]
@@ -149,6 +149,41 @@ def test_sort_values_within_attribute(
     assert actual_order == expected_order
 
 
+@mock.patch(
+    "saleor.graphql.attribute.mutations.attribute_reorder_values"
+    ".invalidate_model_cache_version"
+)
+def test_sort_values_invalidates_dataloader_cache(
+    mocked_invalidate_model_cache_version,
+    staff_api_client,
+    color_attribute,
+    permission_manage_product_types_and_attributes,
+):
+    # given
+    staff_api_client.user.user_permissions.add(
+        permission_manage_product_types_and_attributes
+    )
+    value = color_attribute.values.first()
+    variables = {
+        "attributeId": graphene.Node.to_global_id("Attribute", color_attribute.id),
+        "moves": [
+            {
+                "id": graphene.Node.to_global_id("AttributeValue", value.pk),
+                "sortOrder": +1,
+            }
+        ],
+    }
+
+    # when
+    content = get_graphql_content(
+        staff_api_client.post_graphql(ATTRIBUTE_VALUES_REORDER_MUTATION, variables)
+    )["data"]["attributeReorderValues"]
+
+    # then
+    assert not content["errors"]
+    mocked_invalidate_model_cache_version.assert_called_once_with(AttributeValue)
+
+
 @freeze_time("2022-05-12 12:00:00")
 @mock.patch("saleor.plugins.webhook.plugin.get_webhooks_for_event")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_async")
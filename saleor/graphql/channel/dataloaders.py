@@ -2,12 +2,14 @@ from django.db.models import Exists, OuterRef
 
 from ...channel.models import Channel
 from ...order.models import Order
+from ..core.dataloader_cache import LocalDataLoaderCache
 from ..core.dataloaders import DataLoader
 from ..order.dataloaders import OrderByIdLoader, OrderLineByIdLoader
 
 
 class ChannelByIdLoader(DataLoader):
     context_key = "channel_by_id"
+    shared_cache = LocalDataLoaderCache(models=[Channel])
 
     def batch_load(self, keys):
         channels = Channel.objects.using(self.database_connection_name).in_bulk(keys)
@@ -16,6 +18,7 @@ class ChannelByIdLoader(DataLoader):
 
 class ChannelBySlugLoader(DataLoader):
     context_key = "channel_by_slug"
+    shared_cache = LocalDataLoaderCache(models=[Channel])
 
     def batch_load(self, keys):
         channels = Channel.objects.using(self.database_connection_name).in_bulk(
@@ -373,7 +373,7 @@ def test_invalidate_checkout_prices_with_save(checkout, plugins_manager):
     # then
     checkout.refresh_from_db()
     assert checkout.price_expiration == timezone.now()
-    assert updated_fields == ["price_expiration", "last_change"]
+    assert updated_fields == ["price_expiration", "price_inputs_hash", "last_change"]
 
 
 @freeze_time("2020-12-12 12:00:00")
@@ -394,4 +394,4 @@ def test_invalidate_checkout_prices_without_save(checkout, plugins_manager):
     # then
     checkout.refresh_from_db()
     assert checkout.price_expiration == original_expiration
-    assert updated_fields == ["price_expiration", "last_change"]
+    assert updated_fields == ["price_expiration", "price_inputs_hash", "last_change"]
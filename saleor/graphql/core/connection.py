@@ -11,8 +11,9 @@ from typing import (
 
 import graphene
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Q, QuerySet, Value
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
 from graphene.relay import Connection
 from graphql import GraphQLError
 from graphql.language.ast import FragmentSpread
@@ -21,11 +22,13 @@ from graphql_relay.connection.connectiontypes import Edge, PageInfo
 from graphql_relay.utils import base64, unbase64
 
 from ...channel.exceptions import ChannelNotDefined, NoDefaultChannel
+from ...core.postgres import RowValueComparison
 from ..channel import ChannelContext, ChannelQsContext
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core.enums import OrderDirection
 from ..core.types import BaseConnection, NonNullList
 from ..utils.sorting import sort_queryset_for_connection
+from .total_count import get_queryset_total_count
 
 if TYPE_CHECKING:
     from ..core import ResolveInfo
@@ -147,6 +150,55 @@ def _prepare_filter(
     return filter_kwargs
 
 
+def _get_keyset_fields(
+    qs: QuerySet, sorting_fields: list[str]
+) -> Optional[list[Field]]:
+    """Return the model fields used for sorting, if they can be compared as a row.
+
+    All sorting fields must be non-null columns of the queryset model; annotations
+    and fields of the related models are not supported.
+    """
+    fields = []
+    for field_name in sorting_fields:
+        if field_name in qs.query.annotations:
+            return None
+        try:
+            field = (
+                qs.model._meta.pk
+                if field_name == "pk"
+                else qs.model._meta.get_field(field_name)
+            )
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation or field.null:
+            return None
+        fields.append(field)
+    return fields
+
+
+def _prepare_keyset_filter(
+    cursor: list[str],
+    sorting_fields: list[str],
+    sorting_direction: str,
+    keyset_fields: list[Field],
+) -> RowValueComparison:
+    """Create a row comparison of the sorting fields and the cursor values.
+
+    Unlike the filter created by `_prepare_filter`, the row comparison can be
+    resolved with a multicolumn index on the sorting fields.
+    """
+    try:
+        values = [
+            Value(field.to_python(value), output_field=field)
+            for field, value in zip(keyset_fields, cursor)
+        ]
+    except ValidationError:
+        raise GraphQLError("Received cursor is invalid.")
+    return RowValueComparison(
+        [F(field_name) for field_name in sorting_fields], sorting_direction, values
+    )
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -217,18 +269,13 @@ def _get_edges_for_connection(edge_type, qs, args, sorting_fields):
     if not first and not last:
         return [], {"has_previous_page": False, "has_next_page": False}
 
-    if last:
-        start_slice, end_slice = 1, None
-    else:
-        start_slice, end_slice = 0, requested_count
-
     matching_records = list(qs)
-    if last:
-        matching_records = list(reversed(matching_records))
-        if len(matching_records) <= requested_count:
-            start_slice = 0
     page_info = _get_page_info(matching_records, cursor, first, last)
-    matching_records = matching_records[start_slice:end_slice]
+    # one record more than requested is fetched to check if there are more pages
+    matching_records = matching_records[:requested_count]
+    if last:
+        # records of the `last` page are fetched in the reversed order
+        matching_records.reverse()
 
     edges = [
         edge_type(
@@ -278,16 +325,19 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(
+    keyset_fields = _get_keyset_fields(qs, sorting_fields) if cursor else None
+    filter_kwargs: Union[Q, RowValueComparison] = Q()
+    if cursor and keyset_fields and None not in cursor:
+        filter_kwargs = _prepare_keyset_filter(
+            cursor, sorting_fields, sorting_direction, keyset_fields
+        )
+    elif cursor:
+        filter_kwargs = _prepare_filter(
             cursor,
             sorting_fields,
             sorting_direction,
             _get_id_coercion(qs),
         )
-        if cursor
-        else Q()
-    )
     try:
         filtered_qs = qs.filter(filter_kwargs)
     except ValueError:
@@ -300,7 +350,7 @@ def connection_from_queryset_slice(
     if "total_count" in connection_type._meta.fields:
 
         def get_total_count():
-            return qs.count()
+            return get_queryset_total_count(qs)
 
         return connection_type(
             edges=edges,
@@ -9,7 +9,9 @@ from ...account.models import User
 from ...app.models import App
 
 if TYPE_CHECKING:
+    from .dataloader_stats import DataLoaderStats
     from .dataloaders import DataLoader
+    from .introspection_cache import CachedIntrospection
 
 
 class SaleorContext(HttpRequest):
@@ -17,10 +19,12 @@ class SaleorContext(HttpRequest):
     decoded_auth_token: Optional[dict[str, Any]]
     allow_replica: bool = True
     dataloaders: dict[str, "DataLoader"]
+    dataloader_stats: "DataLoaderStats"
     app: Optional[App]
     user: Optional[User]  # type: ignore[assignment]
     requestor: Union[App, User, None]
     request_time: datetime.datetime
+    cached_introspection: Optional["CachedIntrospection"]
 
 
 def disallow_replica_in_context(context: SaleorContext) -> None:
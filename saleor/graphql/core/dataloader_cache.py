@@ -0,0 +1,219 @@
+"""Second-level cache of the values loaded by data loaders, shared by requests.
+
+Data loaders cache the values only for a single request. Loaders of the models that
+rarely change can declare a `DataLoaderCache`, so the values are kept between the
+requests, in the process memory or in the shared cache (`CACHE_URL`).
+
+Each cached model has a version kept in the shared cache, which is bumped when an
+instance of the model is saved or deleted. Cached values are stored by the versions
+of their models, so after any change of a model all processes stop serving the
+values loaded before it. Changes made with `QuerySet.update()`, `bulk_create()` or
+`bulk_update()` don't send the signals; code updating the cached models this way
+has to call `invalidate_model_cache_version`. Values are kept at most for
+`DATALOADER_CACHE_TIMEOUT` anyway.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections.abc import Hashable, Iterable
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Model
+
+from ...core.utils.lru_cache import LRUCache
+
+DATALOADER_CACHE_KEY_PREFIX = "dataloader:"
+MODEL_VERSION_CACHE_KEY_PREFIX = "dataloader_model_version:"
+
+# Models which versions are bumped when their instances are saved or deleted. Only
+# these models can be declared by the cached data loaders.
+VERSIONED_MODELS = [
+    "attribute.AttributeValue",
+    "channel.Channel",
+    "product.Category",
+    "shipping.ShippingZone",
+    "tax.TaxConfiguration",
+    "warehouse.Warehouse",
+]
+
+ModelVersions = tuple[int, ...]
+
+
+def get_model_version_cache_key(model: type[Model]) -> str:
+    return f"{MODEL_VERSION_CACHE_KEY_PREFIX}{model._meta.label_lower}"
+
+
+def _get_initial_model_version() -> int:
+    # Start from the current time, so a version evicted from the shared cache is not
+    # reused by the values cached before the eviction.
+    return time.time_ns()
+
+
+def get_model_versions(models: Iterable[type[Model]]) -> ModelVersions:
+    keys = [get_model_version_cache_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing_keys = [key for key in keys if key not in versions]
+    if missing_keys:
+        for key in missing_keys:
+            cache.add(key, _get_initial_model_version(), timeout=None)
+        versions.update(cache.get_many(missing_keys))
+    return tuple(versions[key] for key in keys)
+
+
+def invalidate_model_cache_version(*models: type[Model]):
+    """Make all processes drop the data loader values of the models."""
+    for model in models:
+        key = get_model_version_cache_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The key doesn't exist yet or was evicted from the cache.
+            cache.set(key, _get_initial_model_version(), timeout=None)
+
+
+def invalidate_dataloader_cache(sender, using=None, **kwargs):
+    if not settings.DATALOADER_CACHE_ENABLED:
+        return
+    invalidate_model_cache_version(sender)
+    # Values read by other requests before the changes were committed are dropped as
+    # well.
+    transaction.on_commit(lambda: invalidate_model_cache_version(sender), using=using)
+
+
+class DataLoaderCache:
+    """Cache of the values of a data loader, shared by the requests.
+
+    Values are stored by the loader, the versions of the models and the key. `None`
+    values are not cached. Hits and misses are counted to report the hit ratio.
+    """
+
+    def __init__(self, models: Iterable[type[Model]], timeout: Optional[float] = None):
+        self.models = list(models)
+        for model in self.models:
+            if model._meta.label not in VERSIONED_MODELS:
+                raise ImproperlyConfigured(
+                    f"Model {model._meta.label} is not versioned, add it to "
+                    "VERSIONED_MODELS to cache its data loaders."
+                )
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def timeout(self) -> float:
+        if self._timeout is None:
+            return settings.DATALOADER_CACHE_TIMEOUT
+        return self._timeout
+
+    def get_cache_key(self, loader_key: str, versions: ModelVersions, key) -> str:
+        key_hash = hashlib.sha256(f"{versions}:{key!r}".encode()).hexdigest()
+        return f"{DATALOADER_CACHE_KEY_PREFIX}{loader_key}:{key_hash}"
+
+    def get_many(
+        self, loader_key: str, keys: Iterable[Hashable]
+    ) -> tuple[dict[Any, Any], ModelVersions]:
+        """Return the cached values by keys and the current versions of the models.
+
+        The versions have to be passed to `set_many`, so values loaded after
+        a change of the models are not stored by the versions from before it.
+        """
+        versions = get_model_versions(self.models)
+        cache_keys = {
+            self.get_cache_key(loader_key, versions, key): key for key in keys
+        }
+        values = {
+            cache_keys[cache_key]: value
+            for cache_key, value in self._get_many(list(cache_keys)).items()
+        }
+        with self._lock:
+            self.hits += len(values)
+            self.misses += len(cache_keys) - len(values)
+        return values, versions
+
+    def set_many(self, loader_key: str, versions: ModelVersions, values: dict):
+        self._set_many(
+            {
+                self.get_cache_key(loader_key, versions, key): value
+                for key, value in values.items()
+                if value is not None
+            }
+        )
+
+    def _get_many(self, cache_keys: list[str]) -> dict[str, Any]:
+        raise NotImplementedError()
+
+    def _set_many(self, values: dict[str, Any]):
+        raise NotImplementedError()
+
+    def clear(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class LocalDataLoaderCache(DataLoaderCache):
+    """Cache of the data loader values in the memory of each process.
+
+    Suited for small sets of values read by most of the requests, like channels.
+    Values are copied on read, so changes made by one request don't leak to others.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[type[Model]],
+        max_size: int = 1000,
+        timeout: Optional[float] = None,
+    ):
+        super().__init__(models, timeout)
+        self._local_cache: LRUCache[tuple[float, Any]] = LRUCache(max_size)
+
+    def _get_many(self, cache_keys: list[str]) -> dict[str, Any]:
+        values = {}
+        now = time.monotonic()
+        for cache_key in cache_keys:
+            cached_value = self._local_cache.get(cache_key)
+            if cached_value is None:
+                continue
+            expires_at, value = cached_value
+            if expires_at <= now:
+                self._local_cache.delete(cache_key)
+                continue
+            values[cache_key] = copy.copy(value)
+        return values
+
+    def _set_many(self, values: dict[str, Any]):
+        expires_at = time.monotonic() + self.timeout
+        for cache_key, value in values.items():
+            self._local_cache.set(cache_key, (expires_at, copy.copy(value)))
+
+    def clear(self):
+        super().clear()
+        self._local_cache.clear()
+
+
+class SharedDataLoaderCache(DataLoaderCache):
+    """Cache of the data loader values in the shared cache (`CACHE_URL`).
+
+    Suited for larger sets of values, like categories or attribute values.
+    """
+
+    def _get_many(self, cache_keys: list[str]) -> dict[str, Any]:
+        return cache.get_many(cache_keys)
+
+    def _set_many(self, values: dict[str, Any]):
+        if values:
+            cache.set_many(values, timeout=self.timeout)
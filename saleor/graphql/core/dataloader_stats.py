@@ -0,0 +1,141 @@
+"""Statistics of the data loaders used by a single request.
+
+When `DATALOADER_STATS_ENABLED` is set, every batch records the number of keys,
+the time spent and the database queries issued by the loader. Only the synchronous
+part of `batch_load` is measured; queries of the loaders it chains are recorded by
+these loaders.
+
+A loader that dispatches many single-key batches in one request is reported, as
+it means that a resolver loads the values one by one instead of batching them.
+"""
+
+import json
+import logging
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoaderStats:
+    batches: int = 0
+    keys: int = 0
+    duration: float = 0.0
+    queries: int = 0
+    # Number of batches by the number of keys.
+    batch_sizes: Counter = field(default_factory=Counter)
+
+    @property
+    def single_key_batches(self) -> int:
+        return self.batch_sizes[1]
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "keys": self.keys,
+            "duration": round(self.duration, 6),
+            "queries": self.queries,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
+
+
+class DataLoaderStats:
+    """Statistics of the data loaders used by a single request, by loader name."""
+
+    def __init__(self):
+        self.loaders: dict[str, LoaderStats] = {}
+
+    def __getitem__(self, loader_name: str) -> LoaderStats:
+        return self.loaders[loader_name]
+
+    def __contains__(self, loader_name: str) -> bool:
+        return loader_name in self.loaders
+
+    def record(self, loader_name: str, keys: int, duration: float, queries: int):
+        stats = self.loaders.setdefault(loader_name, LoaderStats())
+        stats.batches += 1
+        stats.keys += keys
+        stats.duration += duration
+        stats.queries += queries
+        stats.batch_sizes[keys] += 1
+
+    def merge(self, other: "DataLoaderStats"):
+        for loader_name, other_stats in other.loaders.items():
+            stats = self.loaders.setdefault(loader_name, LoaderStats())
+            stats.batches += other_stats.batches
+            stats.keys += other_stats.keys
+            stats.duration += other_stats.duration
+            stats.queries += other_stats.queries
+            stats.batch_sizes.update(other_stats.batch_sizes)
+
+    def get_unbatched_loaders(self, threshold: Optional[int] = None) -> list[str]:
+        """Return the loaders that dispatched at least `threshold` single-key batches.
+
+        The threshold defaults to `DATALOADER_UNBATCHED_THRESHOLD`.
+        """
+        if threshold is None:
+            threshold = settings.DATALOADER_UNBATCHED_THRESHOLD
+        if threshold <= 0:
+            return []
+        return [
+            loader_name
+            for loader_name, stats in self.loaders.items()
+            if stats.single_key_batches >= threshold
+        ]
+
+    def as_dict(self) -> dict[str, dict]:
+        return {
+            loader_name: stats.as_dict()
+            for loader_name, stats in sorted(self.loaders.items())
+        }
+
+
+# Statistics collected by `capture_dataloader_stats`.
+_collectors: list[DataLoaderStats] = []
+
+
+@contextmanager
+def capture_dataloader_stats() -> Iterator[DataLoaderStats]:
+    """Collect the statistics of all requests reported within the block.
+
+    Used in tests, together with `DATALOADER_STATS_ENABLED`, to check how the
+    loaders are batched for a given query.
+    """
+    stats = DataLoaderStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+
+def report_dataloader_stats(stats: DataLoaderStats, span):
+    """Export the statistics of a request to the tracing span and the collectors.
+
+    Loaders that bypass batching are logged as warnings.
+    """
+    for collector in _collectors:
+        collector.merge(stats)
+    if not stats.loaders:
+        return
+    span.set_tag("dataloaders.batches", sum(s.batches for s in stats.loaders.values()))
+    span.set_tag("dataloaders.queries", sum(s.queries for s in stats.loaders.values()))
+    span.set_tag("dataloaders.stats", json.dumps(stats.as_dict()))
+    unbatched_loaders = stats.get_unbatched_loaders()
+    if unbatched_loaders:
+        span.set_tag("dataloaders.unbatched", ",".join(unbatched_loaders))
+    for loader_name in unbatched_loaders:
+        loader_stats = stats[loader_name]
+        logger.warning(
+            "Data loader %s dispatched %s single-key batches in one request, "
+            "a resolver may load the values one by one.",
+            loader_name,
+            loader_stats.single_key_batches,
+            extra={"loader": loader_name, "stats": loader_stats.as_dict()},
+        )
@@ -1,9 +1,13 @@
+import time
 from collections import defaultdict
 from collections.abc import Iterable
-from typing import Generic, Optional, TypeVar, Union
+from contextlib import ExitStack
+from typing import Generic, Optional, TypeVar, Union, cast
 
 import opentracing
 import opentracing.tags
+from django.conf import settings
+from django.db import connections
 from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
@@ -11,15 +15,29 @@ from ...thumbnail.models import Thumbnail
 from ...thumbnail.utils import get_thumbnail_format
 from . import SaleorContext
 from .context import get_database_connection_name
+from .dataloader_cache import DataLoaderCache
+from .dataloader_stats import DataLoaderStats
 
 K = TypeVar("K")
 R = TypeVar("R")
 
 
+# Data loaders declaring the cache shared by the requests, by the class name.
+CACHED_DATALOADERS: dict[str, type["DataLoader"]] = {}
+
+
 class DataLoader(BaseLoader, Generic[K, R]):
     context_key: str
     context: SaleorContext
     database_connection_name: str
+    # Optional cache of the loaded values shared by the requests, used when
+    # `DATALOADER_CACHE_ENABLED` is set.
+    shared_cache: Optional[DataLoaderCache] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get("shared_cache") is not None:
+            CACHED_DATALOADERS[cls.__name__] = cls
 
     def __new__(cls, context: SaleorContext):
         key = cls.context_key
@@ -47,15 +65,113 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
-            results = self.batch_load(keys)
+            if settings.DATALOADER_STATS_ENABLED:
+                results = self.batch_load_with_stats(keys, span)
+            else:
+                results = self._batch_load(keys, span)
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
             return results
 
+    def _batch_load(self, keys: Iterable[K], span) -> Union[Promise[list[R]], list[R]]:
+        if self.shared_cache is not None and self.is_shared_cache_enabled():
+            return self.batch_load_cached(keys, span)
+        return self.batch_load(keys)
+
+    def batch_load_with_stats(
+        self, keys: Iterable[K], span
+    ) -> Union[Promise[list[R]], list[R]]:
+        """Load the batch and record its size, duration and database queries."""
+        keys = list(keys)
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            # values stored in the shared cache are loaded from the writer
+            for connection_name in {
+                self.database_connection_name,
+                settings.DATABASE_CONNECTION_DEFAULT_NAME,
+            }:
+                stack.enter_context(
+                    connections[connection_name].execute_wrapper(count_query)
+                )
+            results = self._batch_load(keys, span)
+        duration = time.perf_counter() - start
+        span.set_tag("dataloader.keys", len(keys))
+        span.set_tag("dataloader.queries", queries)
+        get_dataloader_stats(self.context).record(
+            self.__class__.__name__, len(keys), duration, queries
+        )
+        return results
+
+    def is_shared_cache_enabled(self) -> bool:
+        # Cached values are loaded from the writer. Values read inside its
+        # transaction may be rolled back, so they can't be shared with other requests.
+        writer = connections[settings.DATABASE_CONNECTION_DEFAULT_NAME]
+        return settings.DATALOADER_CACHE_ENABLED and not writer.in_atomic_block
+
+    def batch_load_cached(
+        self, keys: Iterable[K], span
+    ) -> Union[Promise[list[R]], list[R]]:
+        """Load the values missing in the shared cache and store them.
+
+        The missing values are loaded from the writer, as a replica may still return
+        the rows from before a change whose cache version is already bumped, which
+        would be stored under the new version.
+        """
+        shared_cache = cast(DataLoaderCache, self.shared_cache)
+        keys = list(keys)
+        cached_values, versions = shared_cache.get_many(self.context_key, keys)
+        span.set_tag("dataloader.cache_hits", len(cached_values))
+        missing_keys = [key for key in keys if key not in cached_values]
+        if not missing_keys:
+            return [cached_values[key] for key in keys]
+
+        def store(results: list[R]) -> list[R]:
+            loaded_values = dict(zip(missing_keys, results))
+            shared_cache.set_many(self.context_key, versions, loaded_values)
+            loaded_values.update(cached_values)
+            return [loaded_values[key] for key in keys]
+
+        results = self.batch_load_from_writer(missing_keys)
+        if isinstance(results, Promise):
+            return results.then(store)
+        return store(results)
+
+    def batch_load_from_writer(
+        self, keys: Iterable[K]
+    ) -> Union[Promise[list[R]], list[R]]:
+        database_connection_name = self.database_connection_name
+        self.database_connection_name = settings.DATABASE_CONNECTION_DEFAULT_NAME
+        try:
+            return self.batch_load(keys)
+        finally:
+            self.database_connection_name = database_connection_name
+
     def batch_load(self, keys: Iterable[K]) -> Union[Promise[list[R]], list[R]]:
         raise NotImplementedError()
 
 
+def get_dataloader_stats(context: SaleorContext) -> DataLoaderStats:
+    """Return the statistics of the data loaders used by the request."""
+    if not hasattr(context, "dataloader_stats"):
+        context.dataloader_stats = DataLoaderStats()
+    return context.dataloader_stats
+
+
+def get_dataloader_cache_stats() -> dict[str, dict[str, float]]:
+    """Return the hits, misses and hit ratio of the shared cache of each loader."""
+    return {
+        name: cast(DataLoaderCache, loader.shared_cache).get_stats()
+        for name, loader in CACHED_DATALOADERS.items()
+    }
+
+
 class BaseThumbnailBySizeAndFormatLoader(
     DataLoader[tuple[int, int, Optional[str]], Thumbnail]
 ):
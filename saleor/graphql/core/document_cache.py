@@ -0,0 +1,134 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.conf import settings
+from graphql import GraphQLDocument
+from graphql.language.visitor import Visitor, visit
+
+from ...core.utils.lru_cache import LRUCache
+from ..query_cost_map import COST_MAP
+from ..utils import query_fingerprint, query_identifier
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    """Parsed and validated GraphQL document shared between requests."""
+
+    document: GraphQLDocument
+    query_hash: str
+    identifier: str
+    fingerprint: str
+    # Names of the variables whose values can change the query cost.
+    cost_variable_names: tuple[str, ...]
+
+
+document_cache: LRUCache[CachedDocument] = LRUCache(
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE
+)
+query_cost_cache: LRUCache[int] = LRUCache(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+def get_cost_argument_names(cost_map: dict[str, Any]) -> set[str]:
+    """Return names of the field arguments used as cost multipliers."""
+    names = set()
+    for type_fields in cost_map.values():
+        for field_cost in type_fields.values():
+            for multiplier in field_cost.get("multipliers", []):
+                names.add(multiplier.split(".")[0])
+    return names
+
+
+COST_ARGUMENT_NAMES = get_cost_argument_names(COST_MAP)
+
+
+class CostVariablesVisitor(Visitor):
+    """Collect variables passed to the cost multiplier arguments."""
+
+    def __init__(self, argument_names: set[str]):
+        self.argument_names = argument_names
+        self.variable_names: set[str] = set()
+        self.cost_argument_depth = 0
+
+    def enter_Argument(self, node, *_args):
+        if node.name.value in self.argument_names:
+            self.cost_argument_depth += 1
+
+    def leave_Argument(self, node, *_args):
+        if node.name.value in self.argument_names:
+            self.cost_argument_depth -= 1
+
+    def enter_Variable(self, node, *_args):
+        if self.cost_argument_depth:
+            self.variable_names.add(node.name.value)
+
+
+def get_cost_variable_names(document: GraphQLDocument) -> tuple[str, ...]:
+    visitor = CostVariablesVisitor(COST_ARGUMENT_NAMES)
+    visit(document.document_ast, visitor)
+    return tuple(sorted(visitor.variable_names))
+
+
+def get_query_hash(query: Any) -> Optional[str]:
+    if not query or not isinstance(query, str):
+        return None
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_cached_document(query_hash: Optional[str]) -> Optional[CachedDocument]:
+    if query_hash is None:
+        return None
+    return document_cache.get(query_hash)
+
+
+def cache_document(query_hash: str, document: GraphQLDocument) -> CachedDocument:
+    """Store a document that passed the validation for the subsequent requests."""
+    cached_document = CachedDocument(
+        document=document,
+        query_hash=query_hash,
+        identifier=query_identifier(document),
+        fingerprint=query_fingerprint(document),
+        cost_variable_names=get_cost_variable_names(document),
+    )
+    document_cache.set(query_hash, cached_document)
+    return cached_document
+
+
+def get_query_cost_cache_key(
+    cached_document: CachedDocument, variables: Any
+) -> Optional[tuple[str, str, int]]:
+    """Return the key of the query cost computed for the given variables.
+
+    Only the values of the variables used by the cost multiplier arguments
+    are part of the key, so requests differing e.g. in the product slug share
+    the same query cost.
+    """
+    if variables is None:
+        variables = {}
+    if not isinstance(variables, dict):
+        return None
+    cost_variables = {
+        name: variables.get(name) for name in cached_document.cost_variable_names
+    }
+    try:
+        cost_variables_key = json.dumps(cost_variables, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return (
+        cached_document.query_hash,
+        cost_variables_key,
+        settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+    )
+
+
+def get_document_cache_stats() -> dict[str, dict[str, int]]:
+    return {
+        "documents": document_cache.get_stats(),
+        "query_costs": query_cost_cache.get_stats(),
+    }
+
+
+def clear_document_cache():
+    document_cache.clear()
+    query_cost_cache.clear()
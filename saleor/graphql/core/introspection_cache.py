@@ -0,0 +1,87 @@
+import functools
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from graphql.utils.schema_printer import print_schema
+
+from ...core.utils.lru_cache import LRUCache
+
+INTROSPECTION_CACHE_KEY_PREFIX = "introspection:"
+# Clients send only a few different introspection queries, each result takes a few
+# megabytes.
+INTROSPECTION_CACHE_SIZE = 10
+
+
+@dataclass(frozen=True)
+class CachedIntrospection:
+    """Serialized response to the introspection query."""
+
+    content: bytes
+    etag: str
+
+
+@functools.cache
+def get_schema_version(schema) -> str:
+    """Return the hash of the schema definition, which changes with the schema."""
+    return hashlib.sha256(print_schema(schema).encode("utf-8")).hexdigest()
+
+
+def get_introspection_cache_key(
+    schema, query: str, operation_name: Optional[str]
+) -> str:
+    query_hash = hashlib.sha256(f"{operation_name}:{query}".encode()).hexdigest()
+    return f"{INTROSPECTION_CACHE_KEY_PREFIX}{get_schema_version(schema)}:{query_hash}"
+
+
+def get_etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+class IntrospectionCache:
+    """Cache of the responses to introspection queries, serialized to JSON.
+
+    Responses are kept in the process memory and in the shared cache (`CACHE_URL`),
+    so they survive restarts, by the schema version and the query string.
+    """
+
+    def __init__(self, max_size: int, timeout: float):
+        self.timeout = timeout
+        self._local_cache: LRUCache[CachedIntrospection] = LRUCache(max_size)
+
+    def get(
+        self, schema, query: str, operation_name: Optional[str]
+    ) -> Optional[CachedIntrospection]:
+        key = get_introspection_cache_key(schema, query, operation_name)
+        if cached_introspection := self._local_cache.get(key):
+            return cached_introspection
+        content = cache.get(key)
+        if content is None:
+            return None
+        cached_introspection = CachedIntrospection(content, get_etag(content))
+        self._local_cache.set(key, cached_introspection)
+        return cached_introspection
+
+    def set(
+        self, schema, query: str, operation_name: Optional[str], response: dict
+    ) -> CachedIntrospection:
+        """Serialize and cache the response to the introspection query."""
+        key = get_introspection_cache_key(schema, query, operation_name)
+        content = json.dumps(response, cls=DjangoJSONEncoder).encode("utf-8")
+        cached_introspection = CachedIntrospection(content, get_etag(content))
+        self._local_cache.set(key, cached_introspection)
+        cache.set(key, content, timeout=self.timeout)
+        return cached_introspection
+
+    def clear(self):
+        self._local_cache.clear()
+
+
+introspection_cache = IntrospectionCache(
+    max_size=INTROSPECTION_CACHE_SIZE,
+    timeout=settings.GRAPHQL_INTROSPECTION_CACHE_TIMEOUT,
+)
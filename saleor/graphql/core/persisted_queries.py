@@ -0,0 +1,162 @@
+"""Automatic persisted queries (APQ).
+
+Clients may send only the SHA-256 hash of the query in the
+`extensions.persistedQuery.sha256Hash` request field. When the hash is not known,
+the `PersistedQueryNotFound` error is returned and the client retries the request
+with both the hash and the full query, which registers the query in the store.
+"""
+import datetime
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from graphql.error import GraphQLError
+
+from ...core.models import PersistedQuery
+from .document_cache import document_cache, get_query_hash
+
+PERSISTED_QUERY_VERSION = 1
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+
+class PersistedQueryError(GraphQLError):
+    pass
+
+
+class BasePersistedQueryStore:
+    def get(self, query_hash: str) -> Optional[str]:
+        raise NotImplementedError(
+            "subclasses of BasePersistedQueryStore must provide a get() method"
+        )
+
+    def set(self, query_hash: str, query: str):
+        raise NotImplementedError(
+            "subclasses of BasePersistedQueryStore must provide a set() method"
+        )
+
+
+class CachePersistedQueryStore(BasePersistedQueryStore):
+    """Keep persisted queries in the Django cache."""
+
+    key_prefix = "persisted-query"
+
+    def get_cache_key(self, query_hash: str) -> str:
+        return f"{self.key_prefix}:{query_hash}"
+
+    def get(self, query_hash: str) -> Optional[str]:
+        return cache.get(self.get_cache_key(query_hash))
+
+    def set(self, query_hash: str, query: str):
+        cache.set(
+            self.get_cache_key(query_hash),
+            query,
+            timeout=settings.PERSISTED_QUERY_CACHE_TIMEOUT,
+        )
+
+
+class DatabasePersistedQueryStore(BasePersistedQueryStore):
+    """Keep persisted queries in the `PersistedQuery` table.
+
+    Queries expire after `PERSISTED_QUERY_CACHE_TIMEOUT`, the expired rows are
+    removed by `delete_expired_persisted_queries_task`.
+    """
+
+    def get(self, query_hash: str) -> Optional[str]:
+        return (
+            PersistedQuery.objects.filter(
+                hash=query_hash, created_at__gt=get_persisted_query_expiration_date()
+            )
+            .values_list("query", flat=True)
+            .first()
+        )
+
+    def set(self, query_hash: str, query: str):
+        # The query is registered by every request sending it with its hash, so
+        # the row is written only when it's missing or expired; the expired row
+        # may not be deleted yet.
+        if self.get(query_hash) is not None:
+            return
+        PersistedQuery.objects.update_or_create(
+            hash=query_hash, defaults={"query": query, "created_at": timezone.now()}
+        )
+
+
+def get_persisted_query_expiration_date() -> datetime.datetime:
+    return timezone.now() - datetime.timedelta(
+        seconds=settings.PERSISTED_QUERY_CACHE_TIMEOUT
+    )
+
+
+def get_persisted_query_store() -> BasePersistedQueryStore:
+    return import_string(settings.PERSISTED_QUERY_STORE_PATH)()
+
+
+def get_persisted_query_hash(extensions: Any) -> Optional[str]:
+    """Return the query hash sent in the request extensions.
+
+    Raise PersistedQueryError when the persisted query version is not supported.
+    """
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Persisted query hash must be provided.")
+    return query_hash
+
+
+def resolve_persisted_query(query: Any, extensions: Any) -> Any:
+    """Return the query to execute for the given request.
+
+    Requests without the persisted query extension are returned unchanged. When
+    only the hash is provided, the query is fetched from the store. When both are
+    provided, the hash is verified; the query is registered in the store by
+    `register_persisted_query` once it's validated.
+    """
+    query_hash = get_persisted_query_hash(extensions)
+    if query_hash is None:
+        return query
+    if not settings.PERSISTED_QUERIES_ENABLED:
+        raise PersistedQueryError(
+            PERSISTED_QUERY_NOT_SUPPORTED,
+            extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+        )
+
+    if not query:
+        # Documents are cached under the same hash, so the store can be skipped
+        # for queries that were recently executed by this process.
+        if cached_document := document_cache.get(query_hash):
+            return cached_document.document.document_string
+        query = get_persisted_query_store().get(query_hash)
+        if query is None:
+            raise PersistedQueryError(
+                PERSISTED_QUERY_NOT_FOUND,
+                extensions={"code": "PERSISTED_QUERY_NOT_FOUND"},
+            )
+        return query
+
+    if not isinstance(query, str):
+        return query
+    if get_query_hash(query) != query_hash:
+        raise PersistedQueryError("Provided sha256Hash does not match the query.")
+    return query
+
+
+def register_persisted_query(query: str, extensions: Any):
+    """Store the query sent along with its hash.
+
+    Must be called only for the queries resolved by `resolve_persisted_query`
+    and validated against the schema, so the store is not filled with invalid
+    documents.
+    """
+    if not settings.PERSISTED_QUERIES_ENABLED:
+        return
+    if query_hash := get_persisted_query_hash(extensions):
+        get_persisted_query_store().set(query_hash, query)
@@ -0,0 +1,197 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ....channel.models import Channel
+from ....order.models import Order
+from ...channel.dataloaders import ChannelByIdLoader
+from ...product.dataloaders import CategoryByIdLoader
+from .. import SaleorContext
+from ..dataloader_cache import (
+    LocalDataLoaderCache,
+    get_model_versions,
+    invalidate_model_cache_version,
+)
+from ..dataloaders import CACHED_DATALOADERS, DataLoader, get_dataloader_cache_stats
+
+
+def _clear_dataloader_caches():
+    cache.clear()
+    for loader in CACHED_DATALOADERS.values():
+        loader.shared_cache.clear()
+
+
+@pytest.fixture
+def _enable_dataloader_cache(settings):
+    settings.DATALOADER_CACHE_ENABLED = True
+    _clear_dataloader_caches()
+    # tests run inside a transaction, in which the cache is not used
+    with mock.patch.object(DataLoader, "is_shared_cache_enabled", return_value=True):
+        yield
+    _clear_dataloader_caches()
+
+
+def _load(loader_class, key):
+    # each load uses a new context, like a separate request
+    return loader_class(SaleorContext()).load(key).get()
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_local_dataloader_cache_shared_by_requests(channel_USD):
+    # given
+    _load(ChannelByIdLoader, channel_USD.pk)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        channel = _load(ChannelByIdLoader, channel_USD.pk)
+
+    # then
+    assert channel == channel_USD
+    assert channel is not _load(ChannelByIdLoader, channel_USD.pk)
+    assert len(queries) == 0
+    assert get_dataloader_cache_stats()["ChannelByIdLoader"] == {
+        "hits": 2,
+        "misses": 1,
+        "hit_ratio": 2 / 3,
+    }
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_local_dataloader_cache_invalidated_on_save(channel_USD):
+    # given
+    _load(ChannelByIdLoader, channel_USD.pk)
+
+    # when
+    channel_USD.name = "New name"
+    channel_USD.save(update_fields=["name"])
+
+    # then
+    assert _load(ChannelByIdLoader, channel_USD.pk).name == "New name"
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_local_dataloader_cache_invalidated_on_delete(channel_USD, channel_PLN):
+    # given
+    _load(ChannelByIdLoader, channel_USD.pk)
+    Channel.objects.filter(pk=channel_USD.pk).update(name="New name")
+
+    # when
+    channel_PLN.delete()
+
+    # then
+    assert _load(ChannelByIdLoader, channel_USD.pk).name == "New name"
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_local_dataloader_cache_expired(channel_USD, settings):
+    # given
+    settings.DATALOADER_CACHE_TIMEOUT = 0
+    _load(ChannelByIdLoader, channel_USD.pk)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _load(ChannelByIdLoader, channel_USD.pk)
+
+    # then
+    assert len(queries) == 1
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_shared_dataloader_cache(categories):
+    # given
+    category = categories[0]
+    _load(CategoryByIdLoader, category.pk)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        cached_category = _load(CategoryByIdLoader, category.pk)
+
+    # then
+    assert cached_category == category
+    assert len(queries) == 0
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_shared_dataloader_cache_missing_values_not_cached(category):
+    # given
+    category_id = category.pk
+    category.delete()
+    assert _load(CategoryByIdLoader, category_id) is None
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _load(CategoryByIdLoader, category_id)
+
+    # then
+    assert len(queries) == 1
+
+
+@pytest.mark.usefixtures("_enable_dataloader_cache")
+def test_dataloader_cache_values_loaded_from_writer(channel_USD, settings):
+    # given
+    loader = ChannelByIdLoader(SaleorContext())
+    replica_name = settings.DATABASE_CONNECTION_REPLICA_NAME
+    assert loader.database_connection_name == replica_name
+    batch_load = ChannelByIdLoader.batch_load
+    connection_names = []
+
+    def record_connection_name(self, keys):
+        connection_names.append(self.database_connection_name)
+        return batch_load(self, keys)
+
+    # when
+    with mock.patch.object(ChannelByIdLoader, "batch_load", record_connection_name):
+        channel = loader.load(channel_USD.pk).get()
+
+    # then
+    assert channel == channel_USD
+    assert connection_names == [settings.DATABASE_CONNECTION_DEFAULT_NAME]
+    assert loader.database_connection_name == replica_name
+
+
+def test_dataloader_cache_not_used_in_transaction(channel_USD, settings):
+    # given
+    settings.DATALOADER_CACHE_ENABLED = True
+    _clear_dataloader_caches()
+    _load(ChannelByIdLoader, channel_USD.pk)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        _load(ChannelByIdLoader, channel_USD.pk)
+
+    # then
+    assert len(queries) == 1
+    assert get_dataloader_cache_stats()["ChannelByIdLoader"]["hits"] == 0
+
+
+def test_invalidate_model_cache_version():
+    # given
+    cache.clear()
+    (version,) = get_model_versions([Channel])
+
+    # when
+    invalidate_model_cache_version(Channel)
+
+    # then
+    assert get_model_versions([Channel]) == (version + 1,)
+
+
+def test_invalidate_model_cache_version_evicted():
+    # given
+    cache.clear()
+
+    # when
+    invalidate_model_cache_version(Channel)
+
+    # then
+    assert get_model_versions([Channel])
+
+
+def test_dataloader_cache_not_versioned_model():
+    # when & then
+    with pytest.raises(ImproperlyConfigured):
+        LocalDataLoaderCache(models=[Order])
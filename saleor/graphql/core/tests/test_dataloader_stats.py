@@ -0,0 +1,123 @@
+import json
+import logging
+from unittest import mock
+
+from ....product.models import Product
+from ...channel.dataloaders import ChannelByIdLoader
+from ...tests.utils import get_graphql_content
+from .. import SaleorContext
+from ..dataloader_stats import DataLoaderStats, report_dataloader_stats
+from ..dataloaders import get_dataloader_stats
+
+PRODUCTS_QUERY = """
+    query Products($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                    category {
+                        name
+                    }
+                    productType {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_dataloader_stats_recorded(channel_USD, channel_PLN, settings):
+    # given
+    settings.DATALOADER_STATS_ENABLED = True
+    context = SaleorContext()
+
+    # when
+    # outside of the query execution each `load` is dispatched separately
+    ChannelByIdLoader(context).batch_load_fn([channel_USD.pk, channel_PLN.pk]).get()
+
+    # then
+    stats = get_dataloader_stats(context)["ChannelByIdLoader"]
+    assert stats.batches == 1
+    assert stats.keys == 2
+    assert stats.queries == 1
+    assert stats.batch_sizes == {2: 1}
+    assert stats.duration > 0
+
+
+def test_dataloader_stats_disabled(channel_USD, settings):
+    # given
+    settings.DATALOADER_STATS_ENABLED = False
+    context = SaleorContext()
+
+    # when
+    ChannelByIdLoader(context).load(channel_USD.pk).get()
+
+    # then
+    assert not hasattr(context, "dataloader_stats")
+
+
+def test_dataloader_stats_unbatched_loader(channel_USD, channel_PLN, settings):
+    # given
+    settings.DATALOADER_STATS_ENABLED = True
+    settings.DATALOADER_UNBATCHED_THRESHOLD = 2
+    context = SaleorContext()
+
+    # when
+    # each `get()` dispatches the pending loads, as a resolver resolving the loaded
+    # values right away would do
+    for channel in [channel_USD, channel_PLN]:
+        ChannelByIdLoader(context).load(channel.pk).get()
+
+    # then
+    stats = get_dataloader_stats(context)
+    assert stats["ChannelByIdLoader"].single_key_batches == 2
+    assert stats.get_unbatched_loaders() == ["ChannelByIdLoader"]
+    assert stats.get_unbatched_loaders(threshold=3) == []
+
+
+def test_report_dataloader_stats(caplog, settings):
+    # given
+    settings.DATALOADER_UNBATCHED_THRESHOLD = 2
+    stats = DataLoaderStats()
+    stats.record("ChannelByIdLoader", keys=1, duration=0.1, queries=1)
+    stats.record("ChannelByIdLoader", keys=1, duration=0.1, queries=1)
+    stats.record("CategoryByIdLoader", keys=5, duration=0.1, queries=1)
+    span = mock.Mock()
+
+    # when
+    with caplog.at_level(logging.WARNING):
+        report_dataloader_stats(stats, span)
+
+    # then
+    span.set_tag.assert_any_call("dataloaders.batches", 3)
+    span.set_tag.assert_any_call("dataloaders.queries", 3)
+    span.set_tag.assert_any_call("dataloaders.unbatched", "ChannelByIdLoader")
+    tags = {call.args[0]: call.args[1] for call in span.set_tag.call_args_list}
+    assert json.loads(tags["dataloaders.stats"])["ChannelByIdLoader"] == {
+        "batches": 2,
+        "keys": 2,
+        "duration": 0.2,
+        "queries": 2,
+        "batch_sizes": {"1": 2},
+    }
+    assert len(caplog.records) == 1
+    assert caplog.records[0].loader == "ChannelByIdLoader"
+
+
+def test_products_query_batches_dataloaders(
+    api_client, product_list, channel_USD, dataloader_stats
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert len(content["data"]["products"]["edges"]) == Product.objects.count()
+    assert dataloader_stats["CategoryByIdLoader"].batches == 1
+    assert dataloader_stats["ProductTypeByIdLoader"].batches == 1
+    assert not dataloader_stats.get_unbatched_loaders(threshold=2)
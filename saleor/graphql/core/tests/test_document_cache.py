@@ -0,0 +1,143 @@
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from ....core.utils.lru_cache import LRUCache
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ...views import GraphQLView
+from ..document_cache import (
+    clear_document_cache,
+    document_cache,
+    get_query_hash,
+    query_cost_cache,
+)
+
+PRODUCTS_QUERY = """
+    query Products($first: Int, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clean_document_cache():
+    clear_document_cache()
+    document_cache.reset_stats()
+    query_cost_cache.reset_stats()
+    yield
+    clear_document_cache()
+
+
+def test_lru_cache_evicts_least_recently_used_entry():
+    # given
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # when
+    cache.set("c", 3)
+
+    # then
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get_stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 0,
+        "evictions": 1,
+    }
+
+
+def test_lru_cache_with_zero_size_is_disabled():
+    # given
+    cache = LRUCache(max_size=0)
+
+    # when
+    cache.set("a", 1)
+
+    # then
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@mock.patch.object(
+    GraphQLView, "parse_query", autospec=True, side_effect=GraphQLView.parse_query
+)
+def test_document_is_parsed_only_once(
+    mocked_parse_query, api_client, product, channel_USD
+):
+    # given
+    variables = {"first": 10, "channel": channel_USD.slug}
+
+    # when
+    responses = [api_client.post_graphql(PRODUCTS_QUERY, variables) for _ in range(3)]
+
+    # then
+    contents = [get_graphql_content(response) for response in responses]
+    assert contents[0] == contents[1] == contents[2]
+    assert contents[0]["data"]["products"]["edges"][0]["node"]["name"] == (product.name)
+    mocked_parse_query.assert_called_once()
+    assert document_cache.hits == 2
+    assert query_cost_cache.hits == 1
+    assert document_cache.get(get_query_hash(PRODUCTS_QUERY))
+
+
+def test_query_cost_is_cached_per_cost_variables(api_client, product, channel_USD):
+    # given
+    api_client.post_graphql(PRODUCTS_QUERY, {"first": 10, "channel": "x"})
+
+    # when
+    response = api_client.post_graphql(
+        PRODUCTS_QUERY, {"first": 20, "channel": channel_USD.slug}
+    )
+    cached_response = api_client.post_graphql(
+        PRODUCTS_QUERY, {"first": 20, "channel": "other-channel"}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    cached_content = get_graphql_content_from_response(cached_response)
+    assert content["extensions"]["cost"]["requestedQueryCost"] == 20
+    assert cached_content["extensions"]["cost"]["requestedQueryCost"] == 20
+    assert query_cost_cache.misses == 1
+    assert query_cost_cache.hits == 1
+
+
+@override_settings(GRAPHQL_QUERY_MAX_COMPLEXITY=5)
+def test_query_cost_error_is_not_cached(api_client, channel_USD):
+    # given
+    variables = {"first": 10, "channel": channel_USD.slug}
+    api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    # when
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "The query exceeds the maximum cost of 5. Actual cost is 10"
+    )
+    assert len(query_cost_cache) == 0
+
+
+def test_invalid_document_is_not_cached(api_client):
+    # given
+    query = "query { products { invalidField } }"
+
+    # when
+    response = api_client.post_graphql(query)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"]
+    assert response.status_code == 400
+    assert len(document_cache) == 0
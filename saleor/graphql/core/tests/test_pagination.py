@@ -310,3 +310,23 @@ def test_query_with_pagination_and_fragments_no_first_or_last_raises_an_error(bo
         "the `books` connection."
     )
     assert str(result.errors[0]) == expected_err_msg
+
+
+def test_pagination_uses_row_value_comparison(books, django_assert_num_queries):
+    # given
+    variables = {"first": 5}
+    result = schema.execute(QUERY_PAGINATION_TEST, variables=variables)
+    end_cursor = result.data["books"]["pageInfo"]["endCursor"]
+
+    # when
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute(
+            QUERY_PAGINATION_TEST, variables={"first": 5, "after": end_cursor}
+        )
+
+    # then
+    assert not result.errors
+    assert [edge["node"]["name"] for edge in result.data["books"]["edges"]] == [
+        book.name for book in books[5:10]
+    ]
+    assert '(("tests_book"."id") > (' in captured.captured_queries[0]["sql"]
@@ -0,0 +1,246 @@
+import hashlib
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from ....core.models import PersistedQuery
+from ....core.tasks import delete_expired_persisted_queries_task
+from ...tests.fixtures import API_PATH
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ..document_cache import clear_document_cache
+from ..persisted_queries import CachePersistedQueryStore
+
+SHOP_QUERY = "query { shop { name } }"
+SHOP_QUERY_HASH = hashlib.sha256(SHOP_QUERY.encode("utf-8")).hexdigest()
+
+
+def _persisted_query_extensions(query_hash=SHOP_QUERY_HASH, version=1):
+    return {"persistedQuery": {"version": version, "sha256Hash": query_hash}}
+
+
+@pytest.fixture(autouse=True)
+def _clean_caches():
+    clear_document_cache()
+    cache.delete(CachePersistedQueryStore().get_cache_key(SHOP_QUERY_HASH))
+    yield
+    clear_document_cache()
+
+
+def test_persisted_query_not_found(api_client):
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions()})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+    assert content["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+
+def test_persisted_query_registered_on_miss(api_client, site_settings):
+    # given
+    api_client.post({"query": SHOP_QUERY, "extensions": _persisted_query_extensions()})
+    clear_document_cache()
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions()})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    # when
+    response = api_client.post(
+        {"query": SHOP_QUERY, "extensions": _persisted_query_extensions("abc")}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match the query."
+    )
+
+
+def test_persisted_query_unsupported_version(api_client):
+    # when
+    response = api_client.post(
+        {"query": SHOP_QUERY, "extensions": _persisted_query_extensions(version=2)}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
+
+
+def test_persisted_query_disabled(api_client, settings):
+    # given
+    settings.PERSISTED_QUERIES_ENABLED = False
+
+    # when
+    response = api_client.post(
+        {"query": SHOP_QUERY, "extensions": _persisted_query_extensions()}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_persisted_query_database_store(api_client, settings, site_settings):
+    # given
+    settings.PERSISTED_QUERY_STORE_PATH = (
+        "saleor.graphql.core.persisted_queries.DatabasePersistedQueryStore"
+    )
+    api_client.post({"query": SHOP_QUERY, "extensions": _persisted_query_extensions()})
+    clear_document_cache()
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions()})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert PersistedQuery.objects.get(hash=SHOP_QUERY_HASH).query == SHOP_QUERY
+
+
+def test_stored_persisted_query_is_not_written_again(api_client, settings):
+    # given
+    settings.PERSISTED_QUERY_STORE_PATH = (
+        "saleor.graphql.core.persisted_queries.DatabasePersistedQueryStore"
+    )
+    created_at = timezone.now() - timedelta(minutes=5)
+    persisted_query = PersistedQuery.objects.create(
+        hash=SHOP_QUERY_HASH, query=SHOP_QUERY
+    )
+    PersistedQuery.objects.filter(pk=persisted_query.pk).update(created_at=created_at)
+
+    # when
+    api_client.post({"query": SHOP_QUERY, "extensions": _persisted_query_extensions()})
+
+    # then
+    persisted_query.refresh_from_db()
+    assert persisted_query.created_at == created_at
+
+
+def test_expired_persisted_query_is_registered_again(api_client, settings):
+    # given
+    settings.PERSISTED_QUERY_STORE_PATH = (
+        "saleor.graphql.core.persisted_queries.DatabasePersistedQueryStore"
+    )
+    settings.PERSISTED_QUERY_CACHE_TIMEOUT = 60
+    created_at = timezone.now() - timedelta(minutes=2)
+    persisted_query = PersistedQuery.objects.create(
+        hash=SHOP_QUERY_HASH, query=SHOP_QUERY
+    )
+    PersistedQuery.objects.filter(pk=persisted_query.pk).update(created_at=created_at)
+
+    # when
+    api_client.post({"query": SHOP_QUERY, "extensions": _persisted_query_extensions()})
+
+    # then
+    persisted_query.refresh_from_db()
+    assert persisted_query.created_at > created_at
+
+
+def test_persisted_query_with_get_request(api_client, site_settings):
+    # given
+    api_client.post({"query": SHOP_QUERY, "extensions": _persisted_query_extensions()})
+
+    # when
+    response = api_client.get(
+        API_PATH, {"extensions": json.dumps(_persisted_query_extensions())}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_get_request_with_mutation_is_rejected(api_client):
+    # given
+    query = 'mutation { tokenCreate(email: "a", password: "b") { token } }'
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    # when
+    response = api_client.get(
+        API_PATH,
+        {
+            "query": query,
+            "extensions": json.dumps(_persisted_query_extensions(query_hash)),
+        },
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Only query operations can be executed with GET requests."
+    )
+
+
+def test_get_request_with_persisted_queries_disabled_renders_playground(
+    api_client, settings
+):
+    # given
+    settings.PERSISTED_QUERIES_ENABLED = False
+    settings.PLAYGROUND_ENABLED = True
+
+    # when
+    response = api_client.get(
+        API_PATH, {"extensions": json.dumps(_persisted_query_extensions())}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/html")
+
+
+def test_get_request_without_persisted_query_renders_playground(api_client, settings):
+    # given
+    settings.PLAYGROUND_ENABLED = True
+
+    # when
+    response = api_client.get(API_PATH, {"query": SHOP_QUERY})
+
+    # then
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/html")
+
+
+def test_invalid_persisted_query_is_not_registered(api_client):
+    # given
+    query = "query { shop { unknownField } }"
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    api_client.post(
+        {"query": query, "extensions": _persisted_query_extensions(query_hash)}
+    )
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_expired_persisted_queries_are_deleted(settings):
+    # given
+    settings.PERSISTED_QUERY_CACHE_TIMEOUT = 60
+    expired_query = PersistedQuery.objects.create(hash="expired", query=SHOP_QUERY)
+    PersistedQuery.objects.filter(pk=expired_query.pk).update(
+        created_at=timezone.now() - timedelta(minutes=2)
+    )
+    PersistedQuery.objects.create(hash=SHOP_QUERY_HASH, query=SHOP_QUERY)
+
+    # when
+    delete_expired_persisted_queries_task()
+
+    # then
+    assert list(PersistedQuery.objects.values_list("hash", flat=True)) == [
+        SHOP_QUERY_HASH
+    ]
@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+import pytest
+
+from ....tests.models import Book
+from ..total_count import get_estimated_count, get_queryset_total_count
+
+
+@pytest.fixture
+def books(db):
+    return Book.objects.bulk_create([Book(name=f"Book{index}") for index in range(5)])
+
+
+def test_get_queryset_total_count(books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 0
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 0
+
+    # when
+    total_count = get_queryset_total_count(Book.objects.filter(name__in=["Book1"]))
+
+    # then
+    assert total_count == 1
+
+
+@patch("saleor.graphql.core.total_count.get_total_count_cache_key")
+@patch("saleor.graphql.core.total_count.get_estimated_count")
+def test_get_queryset_total_count_settings_disabled(
+    mocked_estimated_count, mocked_cache_key, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 0
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 0
+
+    # when
+    total_count = get_queryset_total_count(Book.objects.all())
+
+    # then
+    assert total_count == len(books)
+    mocked_estimated_count.assert_not_called()
+    mocked_cache_key.assert_not_called()
+
+
+def test_get_queryset_total_count_empty_result(books):
+    # when
+    total_count = get_queryset_total_count(Book.objects.filter(pk__in=[]))
+
+    # then
+    assert total_count == 0
+
+
+@patch("saleor.graphql.core.total_count.get_estimated_count", return_value=10_000)
+def test_get_queryset_total_count_estimated_above_threshold(
+    mocked_estimated_count, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 1000
+
+    # when
+    total_count = get_queryset_total_count(Book.objects.all())
+
+    # then
+    assert total_count == 10_000
+    mocked_estimated_count.assert_called_once()
+
+
+@patch("saleor.graphql.core.total_count.get_estimated_count", return_value=10)
+def test_get_queryset_total_count_counted_below_threshold(
+    mocked_estimated_count, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 1000
+
+    # when
+    total_count = get_queryset_total_count(Book.objects.all())
+
+    # then
+    assert total_count == len(books)
+
+
+def test_get_queryset_total_count_cached(books, settings, django_assert_num_queries):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 60
+    qs = Book.objects.filter(name__startswith="Book")
+    assert get_queryset_total_count(qs) == len(books)
+    Book.objects.create(name="Book5")
+
+    # when
+    with django_assert_num_queries(0):
+        total_count = get_queryset_total_count(qs)
+
+    # then
+    assert total_count == len(books)
+    assert get_queryset_total_count(Book.objects.filter(name="Book5")) == 1
+
+
+def test_get_estimated_count(books):
+    # given
+    qs = Book.objects.all()
+    sql, params = qs.query.get_compiler(using=qs.db).as_sql()
+
+    # when
+    estimated_count = get_estimated_count(qs, sql, params)
+
+    # then
+    assert isinstance(estimated_count, int)
+    assert estimated_count >= 0
@@ -2,14 +2,17 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
 from django.test import override_settings
-from graphql.execution.base import ExecutionResult
+from graphql.utils.introspection_query import introspection_query
 
-from .... import __version__ as saleor_version
 from ....graphql.utils import INTERNAL_ERROR_MESSAGE
+from ...api import schema
 from ...tests.fixtures import API_PATH
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...views import GraphQLView
+from ..introspection_cache import introspection_cache
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -279,49 +282,150 @@ query IntrospectionQuery {
 INTROSPECTION_RESULT = {"__schema": {"queryType": {"name": "Query"}}}
 
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
+@pytest.fixture
+def _clear_introspection_cache():
+    introspection_cache.clear()
+    cache.clear()
+    yield
+    introspection_cache.clear()
+
+
 @override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
-def test_introspection_query_is_cached(cache_get_mock, cache_set_mock, api_client):
-    cache_get_mock.return_value = None
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
+def test_introspection_query_is_cached(api_client, _clear_introspection_cache):
+    # when
     response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
     content = get_graphql_content(response)
     assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_called_once_with(cache_key)
-    cache_set_mock.assert_called_once_with(
-        cache_key, ExecutionResult(data=INTROSPECTION_RESULT)
+    cached_introspection = introspection_cache.get(schema, INTROSPECTION_QUERY, None)
+    assert cached_introspection
+    assert response["ETag"] == cached_introspection.etag
+    assert response.content == cached_introspection.content
+
+
+@override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
+def test_cached_introspection_query_is_not_executed(
+    api_client, _clear_introspection_cache
+):
+    # given
+    first_response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # when
+    with mock.patch.object(GraphQLView, "execute_graphql_request") as mocked_execute:
+        response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
+    mocked_execute.assert_not_called()
+    assert response.status_code == 200
+    assert response.content == first_response.content
+    assert get_graphql_content(response)["data"] == INTROSPECTION_RESULT
+
+
+@override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
+def test_cached_introspection_query_not_modified(
+    api_client, _clear_introspection_cache
+):
+    # given
+    etag = api_client.post_graphql(INTROSPECTION_QUERY)["ETag"]
+
+    # when
+    response = api_client.post_graphql(INTROSPECTION_QUERY, HTTP_IF_NONE_MATCH=etag)
+
+    # then
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert not response.content
+
+
+@override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
+def test_cached_introspection_query_modified(api_client, _clear_introspection_cache):
+    # given
+    api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # when
+    response = api_client.post_graphql(
+        INTROSPECTION_QUERY, HTTP_IF_NONE_MATCH='"outdated"'
     )
 
+    # then
+    assert response.status_code == 200
+    assert get_graphql_content(response)["data"] == INTROSPECTION_RESULT
+
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
 @override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
-def test_introspection_query_is_cached_only_once(
-    cache_get_mock, cache_set_mock, api_client
+def test_introspection_query_cached_in_shared_cache(
+    api_client, _clear_introspection_cache
 ):
-    cache_get_mock.return_value = ExecutionResult(data=INTROSPECTION_RESULT)
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
-    response = api_client.post_graphql(INTROSPECTION_QUERY)
+    # given
+    api_client.post_graphql(INTROSPECTION_QUERY)
+    # e.g. after the restart
+    introspection_cache.clear()
+
+    # when
+    with mock.patch.object(GraphQLView, "execute_graphql_request") as mocked_execute:
+        response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
+    mocked_execute.assert_not_called()
+    assert get_graphql_content(response)["data"] == INTROSPECTION_RESULT
+
+
+@override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
+def test_precomputed_introspection_query_is_not_executed(
+    api_client, _clear_introspection_cache
+):
+    # given
+    cached_introspection = GraphQLView(schema=schema).precompute_introspection(
+        INTROSPECTION_QUERY
+    )
+
+    # when
+    with mock.patch.object(GraphQLView, "execute_graphql_request") as mocked_execute:
+        response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
+    mocked_execute.assert_not_called()
+    assert response.content == cached_introspection.content
     content = get_graphql_content(response)
     assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_called_once_with(cache_key)
-    cache_set_mock.assert_not_called()
+    assert "cost" in content["extensions"]
 
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
 @override_settings(DEBUG=True, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
 def test_introspection_query_is_not_cached_in_debug_mode(
-    cache_get_mock, cache_set_mock, api_client
+    api_client, _clear_introspection_cache
 ):
+    # when
     response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
     content = get_graphql_content(response)
     assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_not_called()
-    cache_set_mock.assert_not_called()
+    assert not introspection_cache.get(schema, INTROSPECTION_QUERY, None)
+    assert "ETag" not in response
+
 
+def test_cache_introspection_command(_clear_introspection_cache, tmp_path):
+    # given
+    query_file = tmp_path / "introspection.graphql"
+    query_file.write_text(INTROSPECTION_QUERY)
+
+    # when
+    call_command("cache_introspection", str(query_file))
+
+    # then
+    assert introspection_cache.get(schema, INTROSPECTION_QUERY, None)
+    assert introspection_cache.get(schema, introspection_query, None)
+
+
+def test_cache_introspection_command_query_without_schema(
+    _clear_introspection_cache, tmp_path
+):
+    # given
+    query_file = tmp_path / "query.graphql"
+    query_file.write_text("{ shop { name } }")
 
-def test_generate_cache_key_use_saleor_version():
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
-    assert saleor_version in cache_key
+    # when & then
+    with pytest.raises(CommandError):
+        call_command("cache_introspection", str(query_file))
@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+
+TOTAL_COUNT_CACHE_KEY_PREFIX = "graphql_total_count:"
+
+
+def get_queryset_total_count(qs: QuerySet) -> int:
+    """Return the number of objects in the queryset.
+
+    When `GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD` is set, the query planner estimate is
+    returned for querysets estimated to have at least that many objects. Otherwise,
+    the objects are counted and, when `GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT` is set,
+    the count is cached for that time by the SQL query, which includes the filters.
+    """
+    threshold = settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD
+    timeout = settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT
+    if not threshold and not timeout:
+        return qs.count()
+
+    qs = qs.order_by()
+    try:
+        sql, params = qs.query.get_compiler(using=qs.db).as_sql()
+    except EmptyResultSet:
+        return 0
+
+    if threshold:
+        estimated_count = get_estimated_count(qs, sql, params)
+        if estimated_count >= threshold:
+            return estimated_count
+
+    if not timeout:
+        return qs.count()
+    cache_key = get_total_count_cache_key(qs.db, sql, params)
+    total_count = cache.get(cache_key)
+    if total_count is None:
+        total_count = qs.count()
+        cache.set(cache_key, total_count, timeout=timeout)
+    return total_count
+
+
+def get_estimated_count(qs: QuerySet, sql: str, params) -> int:
+    """Return the number of rows returned by the query, estimated by the planner."""
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_total_count_cache_key(db: str, sql: str, params) -> str:
+    query_hash = hashlib.sha256(f"{db}:{sql}:{params!r}".encode()).hexdigest()
+    return f"{TOTAL_COUNT_CACHE_KEY_PREFIX}{query_hash}"
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from .....discount import events, models
 from .....permission.enums import DiscountPermissions
 from .....product.tasks import update_discounted_prices_task
+from .....product.utils.variants import fetch_variants_for_promotion_rules
 from .....webhook.event_types import WebhookEventAsyncType
 from ....app.dataloaders import get_app_promise
 from ....core import ResolveInfo
@@ -17,7 +18,6 @@ from ....core.utils import WebhookEventInfo
 from ....plugins.dataloaders import get_plugin_manager_promise
 from ...enums import PromotionRuleCreateErrorCode
 from ...types import PromotionRule
-from ...utils import get_products_for_rule
 from ..utils import clear_promotion_old_sale_id
 from .promotion_create import PromotionRuleInput
 from .validators import clean_promotion_rule
@@ -68,11 +68,11 @@ class PromotionRuleCreate(ModelMutation):
 
     @classmethod
     def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
-        products = get_products_for_rule(instance, update_rule_variants=True)
-        if products:
-            update_discounted_prices_task.delay(
-                list(products.values_list("id", flat=True))
-            )
+        product_ids = fetch_variants_for_promotion_rules(
+            models.PromotionRule.objects.filter(pk=instance.pk)
+        )
+        if product_ids:
+            update_discounted_prices_task.delay(list(product_ids))
         clear_promotion_old_sale_id(instance.promotion, save=True)
         app = get_app_promise(info.context).get()
         events.rule_created_event(info.context.user, app, [instance])
@@ -6,6 +6,7 @@ from .....discount import RewardValueType, events, models
 from .....discount.utils import get_current_products_for_rules
 from .....permission.enums import DiscountPermissions
 from .....product.tasks import update_discounted_prices_task
+from .....product.utils.variants import fetch_variants_for_promotion_rules
 from .....webhook.event_types import WebhookEventAsyncType
 from ....app.dataloaders import get_app_promise
 from ....core import ResolveInfo
@@ -27,6 +28,14 @@ from .validators import (
     clean_predicate,
 )
 
+# Input fields changing the discount of all products of the rule.
+PRICE_INPUT_FIELDS = {
+    "reward_value_type",
+    "reward_value",
+    "add_channels",
+    "remove_channels",
+}
+
 
 class PromotionRuleUpdateError(Error):
     code = PromotionRuleUpdateErrorCode(description="The error code.", required=True)
@@ -87,7 +96,7 @@ class PromotionRuleUpdate(ModelMutation):
         cls.clean_instance(info, instance)
         cls.save(info, instance, cleaned_input)
         cls._save_m2m(info, instance, cleaned_input)
-        cls.post_save_actions(info, instance, previous_product_ids)
+        cls.post_save_actions(info, instance, previous_product_ids, cleaned_input)
 
         return cls.success_response(instance)
 
@@ -196,9 +205,20 @@ class PromotionRuleUpdate(ModelMutation):
                 instance.channels.add(*add_channels)
 
     @classmethod
-    def post_save_actions(cls, info: ResolveInfo, instance, previous_product_ids):
-        products = get_products_for_rule(instance, update_rule_variants=True)
-        product_ids = set(products.values_list("id", flat=True)) | previous_product_ids
+    def post_save_actions(
+        cls, info: ResolveInfo, instance, previous_product_ids, cleaned_input
+    ):
+        changed_product_ids = fetch_variants_for_promotion_rules(
+            models.PromotionRule.objects.filter(pk=instance.pk)
+        )
+        if PRICE_INPUT_FIELDS & cleaned_input.keys():
+            products = get_products_for_rule(instance)
+            product_ids = (
+                set(products.values_list("id", flat=True)) | previous_product_ids
+            )
+        else:
+            # only the products added to or removed from the rule get a new discount
+            product_ids = changed_product_ids
         if product_ids:
             update_discounted_prices_task.delay(list(product_ids))
         clear_promotion_old_sale_id(instance.promotion, save=True)
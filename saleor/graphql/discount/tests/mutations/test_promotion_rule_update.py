@@ -191,6 +191,53 @@ def test_promotion_rule_update_by_app(
     update_discounted_prices_task_mock.assert_called_once_with([product.id])
 
 
+@patch("saleor.product.tasks.update_discounted_prices_task.delay")
+def test_promotion_rule_update_catalogue_predicate_only_changed_products(
+    update_discounted_prices_task_mock,
+    staff_api_client,
+    permission_group_manage_discounts,
+    promotion,
+    product_list,
+):
+    # given
+    permission_group_manage_discounts.user_set.add(staff_api_client.user)
+    rule = promotion.rules.create(
+        name="Rule",
+        catalogue_predicate={
+            "productPredicate": {
+                "ids": [graphene.Node.to_global_id("Product", product_list[0].id)]
+            }
+        },
+        reward_value_type=RewardValueType.PERCENTAGE,
+        reward_value=Decimal("5"),
+    )
+    rule.variants.set(product_list[0].variants.all())
+    catalogue_predicate = {
+        "productPredicate": {
+            "ids": [
+                graphene.Node.to_global_id("Product", product.id)
+                for product in product_list[:2]
+            ]
+        }
+    }
+    variables = {
+        "id": graphene.Node.to_global_id("PromotionRule", rule.id),
+        "input": {"cataloguePredicate": catalogue_predicate},
+    }
+
+    # when
+    response = staff_api_client.post_graphql(PROMOTION_RULE_UPDATE_MUTATION, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["promotionRuleUpdate"]["errors"]
+    assert set(rule.variants.values_list("product_id", flat=True)) == {
+        product_list[0].id,
+        product_list[1].id,
+    }
+    update_discounted_prices_task_mock.assert_called_once_with([product_list[1].id])
+
+
 @patch("saleor.product.tasks.update_discounted_prices_task.delay")
 def test_promotion_rule_update_by_customer(
     update_discounted_prices_task_mock,
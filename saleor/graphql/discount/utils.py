@@ -4,7 +4,6 @@ from enum import Enum
 from typing import Optional, Union, cast
 
 import graphene
-from django.db import transaction
 from django.db.models import Exists, OuterRef, QuerySet
 from graphene.utils.str_converters import to_camel_case
 
@@ -17,6 +16,7 @@ from ...product.models import (
     Product,
     ProductVariant,
 )
+from ...product.utils.variants import fetch_variants_for_promotion_rules
 from ..core.connection import where_filter_qs
 from ..product.filters import (
     CategoryWhere,
@@ -65,7 +65,7 @@ def get_products_for_rule(
     """Get products that are included in the rule based on catalogue predicate."""
     variants = get_variants_for_predicate(deepcopy(rule.catalogue_predicate))
     if update_rule_variants:
-        rule.variants.set(variants)
+        fetch_variants_for_promotion_rules(PromotionRule.objects.filter(pk=rule.pk))
     return Product.objects.filter(Exists(variants.filter(product_id=OuterRef("id"))))
 
 
@@ -74,28 +74,10 @@ def get_variants_for_promotion(
 ) -> ProductVariantQueryset:
     """Get variants that are included in the promotion based on catalogue predicate."""
     queryset = ProductVariant.objects.none()
-    promotion_rule_variants = []
-    PromotionRuleVariant = PromotionRule.variants.through
-    rules = promotion.rules
-    for rule in list(rules.iterator()):
-        variants = get_variants_for_predicate(rule.catalogue_predicate)
-        queryset |= variants
-        if update_rule_variants:
-            promotion_rule_variants.extend(
-                [
-                    PromotionRuleVariant(
-                        promotionrule_id=rule.pk, productvariant_id=variant.pk
-                    )
-                    for variant in variants
-                ]
-            )
-    if promotion_rule_variants:
-        with transaction.atomic():
-            # Clear existing variants assigned to promotion rules
-            PromotionRuleVariant.objects.filter(
-                Exists(rules.filter(pk=OuterRef("promotionrule_id")))
-            ).delete()
-            PromotionRuleVariant.objects.bulk_create(promotion_rule_variants)
+    for rule in list(promotion.rules.iterator()):
+        queryset |= get_variants_for_predicate(rule.catalogue_predicate)
+    if update_rule_variants:
+        fetch_variants_for_promotion_rules(promotion.rules.all())
     return queryset
 
 
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from graphql.utils.introspection_query import introspection_query
+
+from ...api import schema
+from ...views import GraphQLView
+
+
+class Command(BaseCommand):
+    help = (
+        "Execute the introspection queries and store their responses in the cache, "
+        "so they are served without executing the queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "query_files",
+            nargs="*",
+            help=(
+                "Files with the introspection queries sent by the clients. "
+                "The standard introspection query is cached by default."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        queries = [introspection_query]
+        for query_file in options["query_files"]:
+            with open(query_file) as f:
+                queries.append(f.read())
+
+        view = GraphQLView(schema=schema)
+        for query in queries:
+            try:
+                cached_introspection = view.precompute_introspection(query)
+            except ValueError as e:
+                raise CommandError(str(e))
+            if not cached_introspection:
+                raise CommandError("The introspection query is invalid.")
+            self.stdout.write(
+                f"Cached the introspection response {cached_introspection.etag} "
+                f"({len(cached_introspection.content)} bytes)."
+            )
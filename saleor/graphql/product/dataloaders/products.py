@@ -19,6 +19,7 @@ from ....product.models import (
     VariantChannelListingPromotionRule,
     VariantMedia,
 )
+from ...core.dataloader_cache import SharedDataLoaderCache
 from ...core.dataloaders import BaseThumbnailBySizeAndFormatLoader, DataLoader
 
 ProductIdAndChannelSlug = tuple[int, str]
@@ -27,6 +28,7 @@ VariantIdAndChannelSlug = tuple[int, str]
 
 class CategoryByIdLoader(DataLoader[int, Category]):
     context_key = "category_by_id"
+    shared_cache = SharedDataLoaderCache(models=[Category])
 
     def batch_load(self, keys):
         categories = Category.objects.using(self.database_connection_name).in_bulk(keys)
@@ -35,6 +37,7 @@ class CategoryByIdLoader(DataLoader[int, Category]):
 
 class CategoryBySlugLoader(DataLoader[str, Category]):
     context_key = "category_by_slug"
+    shared_cache = SharedDataLoaderCache(models=[Category])
 
     def batch_load(self, keys):
         categories = Category.objects.using(self.database_connection_name).in_bulk(
@@ -638,6 +641,7 @@ class CollectionChannelListingByCollectionIdAndChannelSlugLoader(DataLoader):
 
 class CategoryChildrenByCategoryIdLoader(DataLoader):
     context_key = "categorychildren_by_category"
+    shared_cache = SharedDataLoaderCache(models=[Category])
 
     def batch_load(self, keys):
         categories = Category.objects.using(self.database_connection_name).filter(
@@ -5,6 +5,7 @@ from .....core.utils.editorjs import clean_editor_js
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....product.error_codes import ProductErrorCode
+from .....thumbnail.generation import prewarm_thumbnails
 from ....core import ResolveInfo
 from ....core.descriptions import ADDED_IN_38, RICH_CONTENT
 from ....core.doc_category import DOC_CATEGORY_PRODUCTS
@@ -103,6 +104,8 @@ class CategoryCreate(ModelMutation):
         return super().perform_mutation(root, info, **data)
 
     @classmethod
-    def post_save_action(cls, info: ResolveInfo, instance, _cleaned_input):
+    def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
+        if cleaned_input.get("background_image"):
+            prewarm_thumbnails("Category", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.category_created, instance)
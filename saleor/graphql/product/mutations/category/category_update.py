@@ -3,6 +3,7 @@ import graphene
 from .....permission.enums import ProductPermissions
 from .....product import models
 from .....thumbnail import models as thumbnail_models
+from .....thumbnail.generation import prewarm_thumbnails
 from ....core import ResolveInfo
 from ....core.types import ProductError
 from ....plugins.dataloaders import get_plugin_manager_promise
@@ -36,6 +37,8 @@ class CategoryUpdate(CategoryCreate):
         return super().construct_instance(instance, cleaned_data)
 
     @classmethod
-    def post_save_action(cls, info: ResolveInfo, instance, _cleaned_input):
+    def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
+        if cleaned_input.get("background_image"):
+            prewarm_thumbnails("Category", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.category_updated, instance)
@@ -81,6 +81,41 @@ def test_product_media_create_mutation(
     product_media_created.assert_called_once_with(product_image)
 
 
+@patch("saleor.thumbnail.tasks.create_thumbnails_task.delay")
+def test_product_media_create_mutation_prewarms_thumbnails(
+    mocked_create_thumbnails_task,
+    staff_api_client,
+    product,
+    permission_manage_products,
+    media_root,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.THUMBNAIL_PREWARM_ENABLED = True
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    image_file, image_name = create_image()
+    variables = {
+        "product": graphene.Node.to_global_id("Product", product.id),
+        "alt": "",
+        "image": image_name,
+    }
+    body = get_multipart_request_body(
+        PRODUCT_MEDIA_CREATE_QUERY, variables, image_file, image_name
+    )
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_multipart(body)
+    get_graphql_content(response)
+
+    # then
+    product_media = product.media.last()
+    mocked_create_thumbnails_task.assert_called_once_with(
+        "ProductMedia", str(product_media.pk)
+    )
+
+
 def test_product_media_create_mutation_without_file(
     monkeypatch, staff_api_client, product, permission_manage_products, media_root
 ):
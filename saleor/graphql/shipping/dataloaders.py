@@ -9,6 +9,7 @@ from ...shipping.models import (
     ShippingMethodPostalCodeRule,
     ShippingZone,
 )
+from ..core.dataloader_cache import LocalDataLoaderCache
 from ..core.dataloaders import DataLoader
 
 
@@ -24,6 +25,7 @@ class ShippingMethodByIdLoader(DataLoader):
 
 class ShippingZoneByIdLoader(DataLoader):
     context_key = "shippingzone_by_id"
+    shared_cache = LocalDataLoaderCache(models=[ShippingZone])
 
     def batch_load(self, keys):
         shipping_zones = ShippingZone.objects.using(
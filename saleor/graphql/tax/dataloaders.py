@@ -10,6 +10,7 @@ from ...tax.models import (
     TaxConfiguration,
     TaxConfigurationPerCountry,
 )
+from ..core.dataloader_cache import LocalDataLoaderCache
 from ..core.dataloaders import DataLoader
 from ..product.dataloaders import (
     ProductByIdLoader,
@@ -36,6 +37,7 @@ class TaxConfigurationPerCountryByTaxConfigurationIDLoader(DataLoader):
 
 class TaxConfigurationByChannelId(DataLoader[int, TaxConfiguration]):
     context_key = "tax_configuration_by_channel_id"
+    shared_cache = LocalDataLoaderCache(models=[TaxConfiguration])
 
     def batch_load(self, keys):
         tax_configs = TaxConfiguration.objects.using(
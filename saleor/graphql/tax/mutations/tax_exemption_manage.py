@@ -95,7 +95,14 @@ class TaxExemptionManage(BaseMutation):
 
         if isinstance(obj, Checkout):
             cls._invalidate_checkout_prices(info, obj)
-            obj.save(update_fields=["tax_exemption", "price_expiration", "last_change"])
+            obj.save(
+                update_fields=[
+                    "tax_exemption",
+                    "price_expiration",
+                    "price_inputs_hash",
+                    "last_change",
+                ]
+            )
 
         if isinstance(obj, Order):
             cls.validate_order_status(obj)
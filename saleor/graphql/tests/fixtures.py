@@ -14,6 +14,7 @@ from ...account.models import User
 from ...core.jwt import create_access_token
 from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
+from ..core.dataloader_stats import capture_dataloader_stats
 from ..utils import handled_errors_logger, unhandled_errors_logger
 from .utils import assert_no_permission
 
@@ -197,6 +198,18 @@ def graphql_log_handler():
     return log_handler
 
 
+@pytest.fixture
+def dataloader_stats(settings):
+    """Collect the statistics of the data loaders used by the API requests.
+
+    Tests can assert the batching of their queries, e.g. with
+    `assert not dataloader_stats.get_unbatched_loaders()`.
+    """
+    settings.DATALOADER_STATS_ENABLED = True
+    with capture_dataloader_stats() as stats:
+        yield stats
+
+
 @pytest.fixture
 def superuser(db):
     superuser = User.objects.create_user(
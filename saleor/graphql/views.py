@@ -1,4 +1,3 @@
-import hashlib
 import importlib
 import json
 from inspect import isclass
@@ -7,24 +6,45 @@ from typing import Any, Optional, Union
 import opentracing
 import opentracing.tags
 from django.conf import settings
-from django.core.cache import cache
 from django.db import connection
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    HttpResponseNotModified,
+    JsonResponse,
+)
 from django.shortcuts import render
 from django.views.generic import View
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument, get_default_backend, validate
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
 from requests_hardened.ip_filter import InvalidIPAddress
 
-from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from ..webhook import observability
+from ..webhook.transport.asynchronous.transport import webhook_delivery_batch
 from .api import API_PATH, schema
 from .context import get_context_value
+from .core.dataloader_stats import report_dataloader_stats
+from .core.dataloaders import get_dataloader_stats
+from .core.document_cache import (
+    CachedDocument,
+    cache_document,
+    get_cached_document,
+    get_query_cost_cache_key,
+    get_query_hash,
+    query_cost_cache,
+)
+from .core.introspection_cache import CachedIntrospection, introspection_cache
+from .core.persisted_queries import (
+    PersistedQueryError,
+    register_persisted_query,
+    resolve_persisted_query,
+)
 from .core.validators.query_cost import validate_query_cost
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
@@ -106,6 +126,8 @@ class GraphQLView(View):
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
         if request.method == "GET":
+            if self.is_persisted_query_request(request):
+                return self.handle_query(request)
             if settings.PLAYGROUND_ENABLED:
                 return self.render_playground(request)
             return HttpResponseNotAllowed(["OPTIONS", "POST"])
@@ -117,6 +139,17 @@ class GraphQLView(View):
             else:
                 return HttpResponseNotAllowed(["OPTIONS", "POST"])
 
+    @staticmethod
+    def is_persisted_query_request(request: HttpRequest) -> bool:
+        """Return True for GET requests sending the persisted query extension.
+
+        Only persisted queries are executed with GET requests, so they can be cached
+        by CDNs. Other GET requests, like `?query=...` links, render the playground.
+        """
+        return settings.PERSISTED_QUERIES_ENABLED and (
+            "persistedQuery" in request.GET.get("extensions", "")
+        )
+
     def render_playground(self, request):
         return render(
             request,
@@ -127,7 +160,7 @@ class GraphQLView(View):
             },
         )
 
-    def _handle_query(self, request: HttpRequest) -> JsonResponse:
+    def _handle_query(self, request: HttpRequest) -> HttpResponse:
         try:
             data = self.parse_body(request)
         except ValueError:
@@ -143,10 +176,82 @@ class GraphQLView(View):
             ]
             status_code = max((code for response, code in responses), default=200)
         else:
+            if cached_introspection := self.get_cached_introspection(request, data):
+                return self.get_introspection_response(request, cached_introspection)
             result, status_code = self.get_response(request, data)
+            # respond with the ETag to the request that cached the introspection
+            if cached_introspection := getattr(request, "cached_introspection", None):
+                return self.get_introspection_response(request, cached_introspection)
         return JsonResponse(data=result, status=status_code, safe=False)
 
-    def handle_query(self, request: HttpRequest) -> JsonResponse:
+    def get_cached_introspection(
+        self, request: HttpRequest, data: dict
+    ) -> Optional[CachedIntrospection]:
+        """Return the cached response to the introspection query, if it's cached."""
+        if settings.DEBUG:
+            return None
+        query, _variables, operation_name = self.get_graphql_params(request, data)
+        # avoid looking up the cache for other queries; queries sent only as
+        # persisted query hashes are looked up when they are executed
+        if not isinstance(query, str) or "__schema" not in query:
+            return None
+        try:
+            resolve_persisted_query(query, data.get("extensions"))
+        except PersistedQueryError:
+            return None
+        return introspection_cache.get(self.schema, query, operation_name)
+
+    @staticmethod
+    def get_introspection_response(
+        request: HttpRequest, cached_introspection: CachedIntrospection
+    ) -> HttpResponse:
+        etag = cached_introspection.etag
+        if_none_match = request.headers.get("If-None-Match", "")
+        etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in etags or if_none_match.strip() == "*":
+            response: HttpResponse = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                cached_introspection.content, content_type="application/json"
+            )
+        response["ETag"] = etag
+        return response
+
+    def cache_introspection(
+        self, query: str, operation_name: Optional[str], result: ExecutionResult
+    ) -> Optional[CachedIntrospection]:
+        """Cache the response to the introspection query, if it succeeded."""
+        if result.errors or result.invalid:
+            return None
+        response: dict[str, Any] = {"data": result.data}
+        if result.extensions:
+            response["extensions"] = result.extensions
+        return introspection_cache.set(self.schema, query, operation_name, response)
+
+    def precompute_introspection(
+        self, query: str, operation_name: Optional[str] = None
+    ) -> Optional[CachedIntrospection]:
+        """Execute the introspection query and cache the response.
+
+        Used to fill the cache before the requests come, e.g. during the deployment.
+        """
+        document, error = self.parse_query(query)
+        if error or document is None:
+            return None
+        if not self.check_if_query_contains_only_schema(document):
+            raise ValueError("The query doesn't contain the `__schema` field.")
+        query_cost, _cost_errors = self.get_query_cost(document, None, None)
+        result = document.execute(
+            root=self.get_root_value(),
+            operation_name=operation_name,
+            context=get_context_value(HttpRequest()),
+            middleware=self.middleware,
+        )
+        return self.cache_introspection(
+            query, operation_name, set_query_cost_on_result(result, query_cost)
+        )
+
+    def handle_query(self, request: HttpRequest) -> HttpResponse:
         tracer = opentracing.global_tracer()
 
         # Disable extending spans from header due to:
@@ -265,6 +370,56 @@ class GraphQLView(View):
                         raise GraphQLError(msg)
         return query_with_schema
 
+    def get_query_cost(
+        self,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        cached_document: Optional[CachedDocument],
+    ):
+        """Return the query cost, reusing the cost computed by a previous request.
+
+        Cost is reused only for already validated documents requested with the same
+        values of the variables used as cost multipliers.
+        """
+        cost_cache_key = None
+        if cached_document:
+            cost_cache_key = get_query_cost_cache_key(cached_document, variables)
+            if cost_cache_key:
+                cached_query_cost = query_cost_cache.get(cost_cache_key)
+                if cached_query_cost is not None:
+                    return cached_query_cost, None
+
+        query_cost, cost_errors = validate_query_cost(
+            schema,
+            document,
+            variables,
+            COST_MAP,
+            settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+        )
+        if cost_cache_key and not cost_errors:
+            query_cost_cache.set(cost_cache_key, query_cost)
+        return query_cost, cost_errors
+
+    def validate_document(
+        self,
+        document: GraphQLDocument,
+        query_hash: Optional[str],
+        cached_document: Optional[CachedDocument],
+    ) -> Optional[ExecutionResult]:
+        """Validate the document against the schema unless it was validated before.
+
+        Valid documents are stored in the document cache, so the following requests
+        with the same query skip parsing and validation.
+        """
+        if cached_document:
+            return None
+        validation_errors = validate(document.schema, document.document_ast)
+        if validation_errors:
+            return ExecutionResult(errors=validation_errors, invalid=True)
+        if query_hash:
+            cache_document(query_hash, document)
+        return None
+
     def execute_graphql_request(self, request: HttpRequest, data: dict):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
@@ -275,8 +430,19 @@ class GraphQLView(View):
             )
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            should_register_persisted_query = bool(query)
+            try:
+                query = resolve_persisted_query(query, data.get("extensions"))
+            except PersistedQueryError as e:
+                return ExecutionResult(errors=[e], invalid=True)
 
-            document, error = self.parse_query(query)
+            query_hash = get_query_hash(query)
+            cached_document = get_cached_document(query_hash)
+            document: Optional[GraphQLDocument]
+            if cached_document:
+                document, error = cached_document.document, None
+            else:
+                document, error = self.parse_query(query)
             with observability.report_gql_operation() as operation:
                 operation.query = document
                 operation.name = operation_name
@@ -284,10 +450,27 @@ class GraphQLView(View):
             if error or document is None:
                 return error
 
+            if request.method == "GET" and (
+                document.get_operation_type(operation_name) != "query"
+            ):
+                return ExecutionResult(
+                    errors=[
+                        GraphQLError(
+                            "Only query operations can be executed with GET requests."
+                        )
+                    ],
+                    invalid=True,
+                )
+
             raw_query_string = document.document_string
             span.set_tag("graphql.query", raw_query_string)
-            span.set_tag("graphql.query_identifier", query_identifier(document))
-            span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
+            if cached_document:
+                span.set_tag("graphql.query_identifier", cached_document.identifier)
+                span.set_tag("graphql.query_fingerprint", cached_document.fingerprint)
+            else:
+                span.set_tag("graphql.query_identifier", query_identifier(document))
+                span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
+            span.set_tag("graphql.document_cache_hit", bool(cached_document))
             try:
                 query_contains_schema = self.check_if_query_contains_only_schema(
                     document
@@ -295,12 +478,8 @@ class GraphQLView(View):
             except GraphQLError as e:
                 return ExecutionResult(errors=[e], invalid=True)
 
-            query_cost, cost_errors = validate_query_cost(
-                schema,
-                document,
-                variables,
-                COST_MAP,
-                settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+            query_cost, cost_errors = self.get_query_cost(
+                document, variables, cached_document
             )
             span.set_tag("graphql.query_cost", query_cost)
             if settings.GRAPHQL_QUERY_MAX_COMPLEXITY and cost_errors:
@@ -321,27 +500,43 @@ class GraphQLView(View):
 
             try:
                 with connection.execute_wrapper(tracing_wrapper):
-                    response = None
                     should_use_cache_for_scheme = query_contains_schema & (
                         not settings.DEBUG
                     )
                     if should_use_cache_for_scheme:
-                        key = generate_cache_key(raw_query_string)
-                        response = cache.get(key)
+                        cached_introspection = introspection_cache.get(
+                            self.schema, query, operation_name
+                        )
+                        if cached_introspection:
+                            return ExecutionResult(
+                                **json.loads(cached_introspection.content)
+                            )
 
-                    if not response:
+                    validation_error = self.validate_document(
+                        document, query_hash, cached_document
+                    )
+                    if validation_error:
+                        return set_query_cost_on_result(validation_error, query_cost)
+                    if should_register_persisted_query:
+                        register_persisted_query(query, data.get("extensions"))
+                    with webhook_delivery_batch():
                         response = document.execute(
                             root=self.get_root_value(),
                             variables=variables,
                             operation_name=operation_name,
                             context=context,
                             middleware=self.middleware,
+                            validate=False,
                             **extra_options,
                         )
-                        if should_use_cache_for_scheme:
-                            cache.set(key, response)
-
-                    return set_query_cost_on_result(response, query_cost)
+                    if settings.DATALOADER_STATS_ENABLED:
+                        report_dataloader_stats(get_dataloader_stats(context), span)
+                    response = set_query_cost_on_result(response, query_cost)
+                    if should_use_cache_for_scheme:
+                        context.cached_introspection = self.cache_introspection(
+                            query, operation_name, response
+                        )
+                    return response
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
 
@@ -354,6 +549,12 @@ class GraphQLView(View):
 
     @staticmethod
     def parse_body(request: HttpRequest):
+        if request.method == "GET":
+            data = request.GET.dict()
+            for field in ["variables", "extensions"]:
+                if data.get(field):
+                    data[field] = json.loads(data[field])
+            return data
         content_type = request.content_type
         if content_type == "application/graphql":
             return {"query": request.body.decode("utf-8")}
@@ -442,11 +643,6 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
-def generate_cache_key(raw_query: str) -> str:
-    hashed_query = hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
-    return f"{saleor_version}-{hashed_query}"
-
-
 def set_query_cost_on_result(execution_result: ExecutionResult, query_cost):
     if settings.GRAPHQL_QUERY_MAX_COMPLEXITY:
         execution_result.extensions.update(
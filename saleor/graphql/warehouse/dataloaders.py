@@ -28,6 +28,7 @@ from ...warehouse.models import (
     Warehouse,
 )
 from ...warehouse.reservations import is_reservation_enabled
+from ..core.dataloader_cache import LocalDataLoaderCache
 from ..core.dataloaders import DataLoader
 from ..site.dataloaders import get_site_promise
 
@@ -546,6 +547,7 @@ class PreorderQuantityReservedByVariantChannelListingIdLoader(DataLoader[int, in
 
 class WarehouseByIdLoader(DataLoader):
     context_key = "warehouse_by_id"
+    shared_cache = LocalDataLoaderCache(models=[Warehouse])
 
     def batch_load(self, keys: Iterable[UUID]) -> list[Optional[Warehouse]]:
         warehouses = (
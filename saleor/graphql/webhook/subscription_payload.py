@@ -5,7 +5,9 @@ from django.conf import settings
 from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from graphql import get_default_backend, parse
-from graphql.error import GraphQLError
+from graphql.error import GraphQLError, GraphQLSyntaxError
+from graphql.language.printer import print_ast
+from graphql.language.visitor import Visitor, visit
 from promise import Promise
 
 from ...app.models import App
@@ -16,6 +18,21 @@ from ..utils import format_error
 
 logger = get_task_logger(__name__)
 
+# Fields which resolve differently for each app, regardless of its permissions.
+# Metadata of an app is visible to the app itself without any permission, so
+# the metadata fields and the fields of the `App` type depend on the app as well.
+APP_SPECIFIC_FIELDS = {
+    "recipient",
+    "app",
+    "metadata",
+    "metafield",
+    "metafields",
+    "privateMetadata",
+    "privateMetafield",
+    "privateMetafields",
+}
+APP_SPECIFIC_TYPES = {"App"}
+
 
 def initialize_request(
     requestor=None,
@@ -49,6 +66,55 @@ def initialize_request(
     return request
 
 
+class AppSpecificFieldsVisitor(Visitor):
+    """Check if the query selects any of the app specific fields or types."""
+
+    def __init__(self):
+        self.has_app_specific_fields = False
+
+    def enter_Field(self, node, *_args):
+        if node.name.value in APP_SPECIFIC_FIELDS:
+            self.has_app_specific_fields = True
+
+    def enter_InlineFragment(self, node, *_args):
+        self._check_type_condition(node)
+
+    def enter_FragmentDefinition(self, node, *_args):
+        self._check_type_condition(node)
+
+    def _check_type_condition(self, node):
+        type_condition = node.type_condition
+        if type_condition and type_condition.name.value in APP_SPECIFIC_TYPES:
+            self.has_app_specific_fields = True
+
+
+def get_subscription_payload_cache_key(
+    event_type: str,
+    subscribable_object,
+    subscription_query: Optional[str],
+    app: Optional[App] = None,
+) -> Optional[tuple[str, str, tuple[str, ...], Optional[int]]]:
+    """Return a key identifying the payload generated for the subscription query.
+
+    Payloads generated from the same query for apps with the same permissions are
+    identical, so the payload can be generated once and reused by the other apps.
+    When the query selects fields resolved differently for each app, the payload is
+    reused only by the webhooks of the same app.
+    Return None when the payload can't be reused.
+    """
+    if not subscription_query or isinstance(subscribable_object, App):
+        return None
+    try:
+        ast = parse(subscription_query)
+    except GraphQLSyntaxError:
+        return None
+    visitor = AppSpecificFieldsVisitor()
+    visit(ast, visitor)
+    app_id = app.pk if app and visitor.has_app_specific_fields else None
+    permissions = tuple(sorted(app.get_permissions())) if app else ()
+    return print_ast(ast), event_type, permissions, app_id
+
+
 def get_event_payload(event):
     # Queries that use dataloaders return Promise object for the "event" field. In that
     # case, we need to resolve them first.
@@ -0,0 +1,140 @@
+import copy
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..channel.models import Channel
+from .models import PluginConfiguration
+
+PLUGINS_CONFIGURATION_VERSION_KEY = "plugins-configuration-version"
+
+
+def _copy_plugin_configuration(
+    db_config: PluginConfiguration, channel: Optional[Channel]
+) -> PluginConfiguration:
+    db_config = copy.copy(db_config)
+    # the configuration is the only value modified in place by the plugins
+    db_config.configuration = copy.deepcopy(db_config.configuration)
+    if channel is not None:
+        db_config.channel = channel
+    return db_config
+
+
+@dataclass
+class PluginsConfiguration:
+    """Snapshot of channels and plugin configurations used by `PluginsManager`."""
+
+    version: Optional[str] = None
+    channel_map: dict[int, Channel] = field(default_factory=dict)
+    global_configs: dict[str, PluginConfiguration] = field(default_factory=dict)
+    channel_configs: dict[int, dict[str, PluginConfiguration]] = field(
+        default_factory=dict
+    )
+
+    def copy(self) -> "PluginsConfiguration":
+        """Return a copy that can be modified without changing this snapshot.
+
+        Channels and global configurations are copied shallowly. Configurations of
+        channel plugins are shared and copied by `get_channel_configs`, so only the
+        channels used by the request are copied.
+        """
+        return PluginsConfiguration(
+            version=self.version,
+            channel_map={
+                channel_pk: copy.copy(channel)
+                for channel_pk, channel in self.channel_map.items()
+            },
+            global_configs={
+                identifier: _copy_plugin_configuration(db_config, None)
+                for identifier, db_config in self.global_configs.items()
+            },
+            channel_configs=self.channel_configs,
+        )
+
+    def get_channel_configs(self, channel_pk: int) -> dict[str, PluginConfiguration]:
+        """Return copies of the plugin configurations of the channel."""
+        channel = self.channel_map[channel_pk]
+        return {
+            identifier: _copy_plugin_configuration(db_config, channel)
+            for identifier, db_config in self.channel_configs.get(
+                channel_pk, {}
+            ).items()
+        }
+
+
+_lock = threading.Lock()
+_configurations: dict[str, PluginsConfiguration] = {}
+
+
+def fetch_plugins_configuration(database: str) -> PluginsConfiguration:
+    channel_map = {
+        channel.pk: channel
+        for channel in Channel.objects.using(database).all().iterator()
+    }
+    configuration = PluginsConfiguration(channel_map=channel_map)
+    for db_config in PluginConfiguration.objects.using(database).all().iterator():
+        channel = channel_map.get(db_config.channel_id)
+        if channel is None:
+            configuration.global_configs[db_config.identifier] = db_config
+        else:
+            db_config.channel = channel
+            configuration.channel_configs.setdefault(channel.pk, {})[
+                db_config.identifier
+            ] = db_config
+    return configuration
+
+
+def get_plugins_configuration_version() -> str:
+    version = cache.get(PLUGINS_CONFIGURATION_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(PLUGINS_CONFIGURATION_VERSION_KEY, version, timeout=None):
+            version = cache.get(PLUGINS_CONFIGURATION_VERSION_KEY, version)
+    return version
+
+
+def get_plugins_configuration(database: str) -> PluginsConfiguration:
+    """Return the channels and the plugin configurations.
+
+    The configuration is cached in the process memory and shared between the
+    plugin managers. The cache is valid as long as the version stored in the shared
+    cache is not changed by `invalidate_plugins_configuration`.
+    Each call returns a copy, as plugins are allowed to modify their configuration;
+    see `PluginsConfiguration.copy`.
+    """
+    if not settings.PLUGINS_CONFIGURATION_CACHE_ENABLED:
+        return fetch_plugins_configuration(database)
+
+    # The version has to be read before fetching the data, so a change made in the
+    # meantime is detected by the next call.
+    version = get_plugins_configuration_version()
+    configuration = _configurations.get(database)
+    if configuration is None or configuration.version != version:
+        configuration = fetch_plugins_configuration(database)
+        configuration.version = version
+        with _lock:
+            _configurations[database] = configuration
+    return configuration.copy()
+
+
+def _bump_plugins_configuration_version():
+    cache.set(PLUGINS_CONFIGURATION_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_plugins_configuration():
+    if not settings.PLUGINS_CONFIGURATION_CACHE_ENABLED:
+        return
+    # Invalidate immediately for the current transaction and once again after the
+    # commit, so other processes cannot cache the not yet committed state.
+    _bump_plugins_configuration_version()
+    transaction.on_commit(_bump_plugins_configuration_version)
+
+
+def clear_plugins_configuration_cache():
+    with _lock:
+        _configurations.clear()
@@ -1,3 +1,4 @@
+import functools
 from collections import defaultdict
 from collections.abc import Iterable
 from decimal import Decimal
@@ -52,6 +53,7 @@ from ..payment.interface import (
 )
 from ..tax.utils import calculate_tax_rate
 from .base_plugin import ExcludedShippingMethod, ExternalAccessTokens
+from .cache import get_plugins_configuration
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -89,12 +91,24 @@ if TYPE_CHECKING:
 NotifyEventTypeChoice = str
 
 
+class PluginsPerChannel(dict[str, list["BasePlugin"]]):
+    """Plugins of the channels, instantiated on the first access to a channel."""
+
+    def __init__(self, load_channel_plugins: Callable[[str], list["BasePlugin"]]):
+        super().__init__()
+        self._load_channel_plugins = load_channel_plugins
+
+    def __missing__(self, channel_slug: str) -> list["BasePlugin"]:
+        plugins = self._load_channel_plugins(channel_slug)
+        self[channel_slug] = plugins
+        return plugins
+
+
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
     plugins_per_channel: dict[str, list["BasePlugin"]] = {}
     global_plugins: list["BasePlugin"] = []
-    all_plugins: list["BasePlugin"] = []
 
     @property
     def database(self):
@@ -134,61 +148,81 @@ class PluginsManager(PaymentInterface):
     def __init__(self, plugins: list[str], requestor_getter=None, allow_replica=True):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self._allow_replica = allow_replica
-            self.all_plugins = []
+            self._requestor_getter = requestor_getter
+            self._all_plugins: Optional[list["BasePlugin"]] = None
+            self._plugin_classes: list[type["BasePlugin"]] = []
+            self._channel_plugin_classes: list[type["BasePlugin"]] = []
             self.global_plugins = []
-            self.plugins_per_channel = defaultdict(list)
-
-            channel_map = self._get_channel_map()
-            global_db_configs, channel_db_configs = self._get_db_plugin_configs(
-                channel_map
-            )
+            self.plugins_per_channel = PluginsPerChannel(self._load_channel_plugins)
+            self._plugins_per_method: dict[
+                tuple[Optional[str], str], list["BasePlugin"]
+            ] = {}
+
+            configuration = get_plugins_configuration(self.database)
+            self._channel_map = configuration.channel_map
+            self._channels_by_slug = {
+                channel.slug: channel for channel in self._channel_map.values()
+            }
+            self._plugins_configuration = configuration
 
             for plugin_path in plugins:
+                PluginClass = import_string(plugin_path)
+                self._plugin_classes.append(PluginClass)
+                if getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
+                    # Plugins configured per channel are instantiated on the first
+                    # access to the channel plugins.
+                    self._channel_plugin_classes.append(PluginClass)
+                    continue
                 with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
-                    PluginClass = import_string(plugin_path)
-                    if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
-                        plugin = self._load_plugin(
-                            PluginClass,
-                            global_db_configs,
-                            requestor_getter=requestor_getter,
-                            allow_replica=allow_replica,
-                        )
-                        self.global_plugins.append(plugin)
-                        self.all_plugins.append(plugin)
-                    else:
-                        for channel in channel_map.values():
-                            channel_configs = channel_db_configs.get(channel, {})
-                            plugin = self._load_plugin(
-                                PluginClass,
-                                channel_configs,
-                                channel,
-                                requestor_getter,
-                                allow_replica,
-                            )
-                            self.plugins_per_channel[channel.slug].append(plugin)
-                            self.all_plugins.append(plugin)
-
-            for channel in channel_map.values():
-                self.plugins_per_channel[channel.slug].extend(self.global_plugins)
-
-    def _get_db_plugin_configs(self, channel_map):
-        with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
-            plugin_manager_configs = PluginConfiguration.objects.using(
-                self.database
-            ).all()
-            channel_configs: defaultdict[Channel, dict] = defaultdict(dict)
-            global_configs = {}
-            for db_plugin_config in plugin_manager_configs.iterator():
-                channel = channel_map.get(db_plugin_config.channel_id)
-                if channel is None:
-                    global_configs[db_plugin_config.identifier] = db_plugin_config
-                else:
-                    db_plugin_config.channel = channel
-                    channel_configs[channel][
-                        db_plugin_config.identifier
-                    ] = db_plugin_config
+                    plugin = self._load_plugin(
+                        PluginClass,
+                        configuration.global_configs,
+                        requestor_getter=requestor_getter,
+                        allow_replica=allow_replica,
+                    )
+                    self.global_plugins.append(plugin)
+
+    def _load_channel_plugins(self, channel_slug: str) -> list["BasePlugin"]:
+        channel = self._channels_by_slug.get(channel_slug)
+        if channel is None:
+            return []
+        with opentracing.global_tracer().start_active_span(
+            "PluginsManager._load_channel_plugins"
+        ):
+            channel_configs = self._plugins_configuration.get_channel_configs(
+                channel.pk
+            )
+            plugins = [
+                self._load_plugin(
+                    PluginClass,
+                    channel_configs,
+                    channel,
+                    self._requestor_getter,
+                    self._allow_replica,
+                )
+                for PluginClass in self._channel_plugin_classes
+            ]
+            return plugins + self.global_plugins
 
-            return global_configs, channel_configs
+    @property
+    def all_plugins(self) -> list["BasePlugin"]:
+        """Return plugins of all channels, in the order of the plugins settings."""
+        if self._all_plugins is None:
+            all_plugins: list["BasePlugin"] = []
+            global_plugins = iter(self.global_plugins)
+            channels_plugins = [
+                iter(self.plugins_per_channel[channel.slug])
+                for channel in self._channel_map.values()
+            ]
+            for PluginClass in self._plugin_classes:
+                if PluginClass in self._channel_plugin_classes:
+                    all_plugins.extend(
+                        next(channel_plugins) for channel_plugins in channels_plugins
+                    )
+                else:
+                    all_plugins.append(next(global_plugins))
+            self._all_plugins = all_plugins
+        return self._all_plugins
 
     def __run_method_on_plugins(
         self,
@@ -200,13 +234,35 @@ class PluginsManager(PaymentInterface):
     ):
         """Try to run a method with the given name on each declared active plugin."""
         value = default_value
-        plugins = self.get_plugins(channel_slug=channel_slug, active_only=True)
+        plugins = self._get_plugins_with_method(method_name, channel_slug=channel_slug)
         for plugin in plugins:
+            if not plugin.active:
+                continue
             value = self.__run_method_on_single_plugin(
                 plugin, method_name, value, *args, **kwargs
             )
         return value
 
+    def _get_plugins_with_method(
+        self, method_name: str, channel_slug: Optional[str] = None
+    ) -> list["BasePlugin"]:
+        """Return plugins of the channel that implement the given method.
+
+        The result is stored per channel and method name, so the subsequent calls
+        of the method skip plugins that don't implement it. The plugin activity is
+        not stored, as it can be changed by the plugin configuration update.
+        """
+        key = (channel_slug or None, method_name)
+        plugins = self._plugins_per_method.get(key)
+        if plugins is None:
+            plugins = [
+                plugin
+                for plugin in self.get_plugins(channel_slug=channel_slug)
+                if plugin_class_implements_method(type(plugin), method_name)
+            ]
+            self._plugins_per_method[key] = plugins
+        return plugins
+
     def __run_method_on_single_plugin(
         self,
         plugin: Optional["BasePlugin"],
@@ -1849,7 +1905,7 @@ class PluginsManager(PaymentInterface):
         *args,
         channel_slug: Optional[str] = None,
     ):
-        plugins = self.get_plugins(channel_slug=channel_slug)
+        plugins = self._get_plugins_with_method(method_name, channel_slug=channel_slug)
         for plugin in plugins:
             result = self.__run_method_on_single_plugin(
                 plugin, method_name, None, *args
@@ -2114,10 +2170,19 @@ class PluginsManager(PaymentInterface):
         return any([plugin.is_event_active(event) for plugin in only_active_plugins])
 
     def _get_channel_map(self):
-        return {
-            channel.pk: channel
-            for channel in Channel.objects.using(self.database).all().iterator()
-        }
+        return self._channel_map
+
+
+@functools.cache
+def plugin_class_implements_method(
+    plugin_class: type["BasePlugin"], method_name: str
+) -> bool:
+    """Return whether the plugin class overrides the given plugin method.
+
+    Plugin methods are declared in `BasePlugin` only as annotations, so the result
+    depends only on the class and is computed once per process.
+    """
+    return getattr(plugin_class, method_name, NotImplemented) is not NotImplemented
 
 
 def get_plugins_manager(
@@ -0,0 +1,5 @@
+from .cache import invalidate_plugins_configuration
+
+
+def invalidate_plugins_configuration_cache(sender, instance, **kwargs):
+    invalidate_plugins_configuration()
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from ...manager import get_plugins_manager, plugin_class_implements_method
+from ..sample_plugins import ALL_PLUGINS
+
+PLUGINS = [
+    f"{plugin_class.__module__}.{plugin_class.__name__}" for plugin_class in ALL_PLUGINS
+]
+
+
+@mock.patch(
+    "saleor.plugins.manager.PluginsManager._PluginsManager__run_method_on_single_plugin"
+)
+def test_dispatch_method_without_implementations(
+    mocked_run_on_single_plugin, settings, channel_USD
+):
+    # given
+    settings.PLUGINS = PLUGINS
+    manager = get_plugins_manager(allow_replica=False)
+    method_name = "change_user_address"
+
+    # when
+    manager._PluginsManager__run_method_on_plugins(  # type: ignore
+        method_name, None, channel_slug=channel_USD.slug
+    )
+
+    # then
+    assert manager._get_plugins_with_method(method_name, channel_USD.slug) == []
+    mocked_run_on_single_plugin.assert_not_called()
+
+
+@mock.patch(
+    "saleor.plugins.manager.PluginsManager._PluginsManager__run_method_on_single_plugin"
+)
+def test_dispatch_method_with_implementations(
+    mocked_run_on_single_plugin, settings, channel_USD
+):
+    # given
+    settings.PLUGINS = PLUGINS
+    manager = get_plugins_manager(allow_replica=False)
+    method_name = "get_payment_config"
+    channel_plugins = manager.get_plugins(channel_slug=channel_USD.slug)
+    expected_plugins = [
+        plugin
+        for plugin in channel_plugins
+        if getattr(plugin, method_name, NotImplemented) is not NotImplemented
+    ]
+
+    # when
+    manager._PluginsManager__run_method_on_plugins(  # type: ignore
+        method_name, [], channel_slug=channel_USD.slug
+    )
+
+    # then
+    plugins = manager._get_plugins_with_method(method_name, channel_USD.slug)
+    assert plugins == expected_plugins
+    assert len(plugins) < len(channel_plugins)
+    called_plugins = [call.args[0] for call in mocked_run_on_single_plugin.mock_calls]
+    assert called_plugins == [plugin for plugin in plugins if plugin.active]
+
+
+def test_plugin_class_implements_method_is_computed_once_per_class(
+    settings, channel_USD
+):
+    # given
+    settings.PLUGINS = PLUGINS
+    method_name = "get_payment_config"
+    get_plugins_manager(allow_replica=False)._get_plugins_with_method(
+        method_name, channel_USD.slug
+    )
+    cache_info = plugin_class_implements_method.cache_info()
+
+    # when
+    get_plugins_manager(allow_replica=False)._get_plugins_with_method(
+        method_name, channel_USD.slug
+    )
+
+    # then
+    assert plugin_class_implements_method.cache_info().misses == cache_info.misses
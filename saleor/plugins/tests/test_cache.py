@@ -0,0 +1,158 @@
+import pytest
+from django.core.cache import cache
+
+from ..cache import (
+    PLUGINS_CONFIGURATION_VERSION_KEY,
+    clear_plugins_configuration_cache,
+    get_plugins_configuration,
+)
+from ..manager import get_plugins_manager
+from ..models import PluginConfiguration
+from .sample_plugins import ChannelPluginSample, PluginSample
+
+
+@pytest.fixture(autouse=True)
+def _enable_plugins_configuration_cache(settings):
+    settings.PLUGINS_CONFIGURATION_CACHE_ENABLED = True
+    cache.delete(PLUGINS_CONFIGURATION_VERSION_KEY)
+    clear_plugins_configuration_cache()
+    yield
+    clear_plugins_configuration_cache()
+
+
+def test_get_plugins_configuration_is_cached(channel_USD, django_assert_num_queries):
+    # given
+    get_plugins_configuration("default")
+
+    # when
+    with django_assert_num_queries(0):
+        configuration = get_plugins_configuration("default")
+
+    # then
+    assert configuration.channel_map[channel_USD.pk] == channel_USD
+
+
+def test_get_plugins_configuration_returns_copy(channel_USD):
+    # given
+    configuration = get_plugins_configuration("default")
+
+    # when
+    configuration.channel_map.clear()
+
+    # then
+    assert channel_USD.pk in get_plugins_configuration("default").channel_map
+
+
+def test_get_plugins_configuration_cache_disabled(
+    settings, channel_USD, django_assert_num_queries
+):
+    # given
+    settings.PLUGINS_CONFIGURATION_CACHE_ENABLED = False
+    get_plugins_configuration("default")
+
+    # when
+    with django_assert_num_queries(2):
+        get_plugins_configuration("default")
+
+
+def test_channel_save_invalidates_plugins_configuration(channel_USD):
+    # given
+    get_plugins_configuration("default")
+
+    # when
+    channel_USD.name = "New name"
+    channel_USD.save(update_fields=["name"])
+
+    # then
+    configuration = get_plugins_configuration("default")
+    assert configuration.channel_map[channel_USD.pk].name == "New name"
+
+
+def test_plugin_configuration_save_invalidates_plugins_configuration(
+    channel_USD,
+):
+    # given
+    get_plugins_configuration("default")
+
+    # when
+    PluginConfiguration.objects.create(
+        identifier=PluginSample.PLUGIN_ID, active=True, configuration=[]
+    )
+
+    # then
+    configuration = get_plugins_configuration("default")
+    assert PluginSample.PLUGIN_ID in configuration.global_configs
+
+
+def test_plugin_configuration_delete_invalidates_plugins_configuration(
+    channel_USD,
+):
+    # given
+    plugin_configuration = PluginConfiguration.objects.create(
+        identifier=PluginSample.PLUGIN_ID, active=True, configuration=[]
+    )
+    get_plugins_configuration("default")
+
+    # when
+    plugin_configuration.delete()
+
+    # then
+    configuration = get_plugins_configuration("default")
+    assert PluginSample.PLUGIN_ID not in configuration.global_configs
+
+
+def test_manager_loads_channel_plugins_on_first_access(
+    settings, channel_USD, channel_PLN
+):
+    # given
+    settings.PLUGINS = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.ChannelPluginSample",
+    ]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    plugins = manager.plugins_per_channel[channel_USD.slug]
+
+    # then
+    assert list(manager.plugins_per_channel.keys()) == [channel_USD.slug]
+    assert isinstance(plugins[0], ChannelPluginSample)
+    assert plugins[0].channel == channel_USD
+    assert isinstance(plugins[1], PluginSample)
+
+
+def test_manager_channel_plugins_for_unknown_channel(settings, channel_USD):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    plugins = manager.plugins_per_channel["unknown-channel"]
+
+    # then
+    assert plugins == []
+
+
+def test_get_plugins_configuration_copies_channel_configs(channel_USD):
+    # given
+    PluginConfiguration.objects.create(
+        identifier=ChannelPluginSample.PLUGIN_ID,
+        channel=channel_USD,
+        active=True,
+        configuration=[{"name": "input-per-channel", "value": "value"}],
+    )
+    configuration = get_plugins_configuration("default")
+
+    # when
+    channel_configs = configuration.get_channel_configs(channel_USD.pk)
+    db_config = channel_configs[ChannelPluginSample.PLUGIN_ID]
+    db_config.configuration[0]["value"] = "changed"
+
+    # then
+    assert db_config.channel is configuration.channel_map[channel_USD.pk]
+    cached_configs = get_plugins_configuration("default").get_channel_configs(
+        channel_USD.pk
+    )
+    assert cached_configs[ChannelPluginSample.PLUGIN_ID].configuration == [
+        {"name": "input-per-channel", "value": "value"}
+    ]
@@ -34,7 +34,7 @@ from ...payment.interface import (
     TransactionSessionResult,
 )
 from ...product.models import Product
-from ..base_plugin import ExternalAccessTokens
+from ..base_plugin import BasePlugin, ExternalAccessTokens
 from ..manager import PluginsManager, get_plugins_manager
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
@@ -68,6 +68,12 @@ def test_manager_with_default_configuration_for_channel_plugins(
     manager = get_plugins_manager(allow_replica=False)
     assert len(manager.global_plugins) == 1
     assert isinstance(manager.global_plugins[0], PluginSample)
+    # channel plugins are loaded on the first access
+    assert not manager.plugins_per_channel
+
+    # global plugin + plugins for each channel
+    assert len(manager.all_plugins) == 3
+
     assert {channel_PLN.slug, channel_USD.slug} == set(
         manager.plugins_per_channel.keys()
     )
@@ -81,9 +87,6 @@ def test_manager_with_default_configuration_for_channel_plugins(
             ]
         )
 
-    # global plugin + plugins for each channel
-    assert len(manager.all_plugins) == 3
-
 
 def test_manager_with_channel_plugins(
     settings, channel_USD, channel_PLN, channel_plugin_configurations
@@ -93,6 +96,9 @@ def test_manager_with_channel_plugins(
     ]
     manager = get_plugins_manager(allow_replica=False)
 
+    # global plugin + plugins for each channel
+    assert len(manager.all_plugins) == 2
+
     assert {channel_PLN.slug, channel_USD.slug} == set(
         manager.plugins_per_channel.keys()
     )
@@ -102,9 +108,6 @@ def test_manager_with_channel_plugins(
         # make sure that we load proper config from DB
         assert plugins[0].configuration[0]["value"] == channel_slug
 
-    # global plugin + plugins for each channel
-    assert len(manager.all_plugins) == 2
-
 
 def test_manager_get_plugins_with_channel_slug(
     settings, channel_USD, plugin_configuration, inactive_plugin_configuration
@@ -990,6 +993,7 @@ def test_run_method_on_plugins_value_overridden_by_plugin_method(
     assert value == expected
 
 
+@mock.patch.object(BasePlugin, "test_method_name", mock.Mock(), create=True)
 @mock.patch(
     "saleor.plugins.manager.PluginsManager._PluginsManager__run_method_on_single_plugin"
 )
@@ -1015,6 +1019,7 @@ def test_run_method_on_plugins_only_on_active_ones(
     assert called_plugins_id == expected_active_plugins_id
 
 
+@mock.patch.object(BasePlugin, "test_method", mock.Mock(), create=True)
 @mock.patch(
     "saleor.plugins.manager.PluginsManager._PluginsManager__run_method_on_single_plugin"
 )
@@ -1557,3 +1562,41 @@ def test_plugin_manager__get_channel_map(
         channel_JPY.pk: channel_JPY,
         other_channel_USD.pk: other_channel_USD,
     }
+
+
+def test_manager_get_plugins_with_method(settings, channel_USD):
+    # given
+    settings.PLUGINS = [
+        "saleor.plugins.tests.sample_plugins.ActiveDummyPaymentGateway",
+        "saleor.plugins.tests.sample_plugins.ActivePlugin",
+    ]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    plugins = manager._get_plugins_with_method(
+        "check_payment_balance", channel_slug=channel_USD.slug
+    )
+
+    # then
+    assert len(plugins) == 1
+    assert isinstance(plugins[0], ActiveDummyPaymentGateway)
+
+
+def test_manager_run_method_skips_plugin_deactivated_after_first_call(
+    settings, channel_USD
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ActiveDummyPaymentGateway"]
+    manager = get_plugins_manager(allow_replica=False)
+    assert manager.check_payment_balance({}, channel_USD.slug) == {
+        "test_response": "success"
+    }
+    plugin = manager.get_plugin(
+        ActiveDummyPaymentGateway.PLUGIN_ID, channel_slug=channel_USD.slug
+    )
+
+    # when
+    plugin.active = False
+
+    # then
+    assert manager.check_payment_balance({}, channel_USD.slug) is None
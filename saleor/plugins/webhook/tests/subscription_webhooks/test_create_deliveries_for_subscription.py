@@ -7,8 +7,13 @@ import pytest
 from django.core.files import File
 from freezegun import freeze_time
 
+from .....app.models import App
 from .....channel.models import Channel
+from .....core.models import EventPayload
 from .....giftcard.models import GiftCard
+from .....graphql.webhook.subscription_payload import (
+    generate_payload_from_subscription,
+)
 from .....graphql.webhook.subscription_query import SubscriptionQuery
 from .....menu.models import Menu, MenuItem
 from .....product.models import Category
@@ -3079,3 +3084,166 @@ def test_thumbnail_created_user(thumbnail_user, subscription_thumbnail_created_w
     assert deliveries[0].payload.payload == expected_payload
     assert len(deliveries) == len(webhooks)
     assert deliveries[0].webhook == webhooks[0]
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_reuse_payload_for_same_query(
+    mocked_generate_payload, product, subscription_webhook, webhook_app
+):
+    # given
+    second_app = App.objects.create(name="Second app", is_active=True)
+    second_app.permissions.set(webhook_app.permissions.all())
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    webhooks = [
+        subscription_webhook(subscription_queries.PRODUCT_UPDATED, event_type),
+        subscription_webhook(
+            # the same query with a different formatting
+            " ".join(subscription_queries.PRODUCT_UPDATED.split()),
+            event_type,
+            app=second_app,
+        ),
+    ]
+    product_id = graphene.Node.to_global_id("Product", product.id)
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    mocked_generate_payload.assert_called_once()
+    assert len(deliveries) == 2
+    assert deliveries[0].payload == deliveries[1].payload
+    assert deliveries[0].payload.payload == json.dumps({"product": {"id": product_id}})
+    assert EventPayload.objects.count() == 1
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_payload_for_different_permissions(
+    mocked_generate_payload, product, subscription_webhook
+):
+    # given
+    app_without_permissions = App.objects.create(name="Second app", is_active=True)
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    webhooks = [
+        subscription_webhook(subscription_queries.PRODUCT_UPDATED, event_type),
+        subscription_webhook(
+            subscription_queries.PRODUCT_UPDATED,
+            event_type,
+            app=app_without_permissions,
+        ),
+    ]
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    assert mocked_generate_payload.call_count == 2
+    assert len(deliveries) == 2
+    # payloads are identical, so they are saved once
+    assert deliveries[0].payload == deliveries[1].payload
+    assert EventPayload.objects.count() == 1
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_query_with_recipient(
+    mocked_generate_payload, product, subscription_webhook, webhook_app
+):
+    # given
+    second_app = App.objects.create(name="Second app", is_active=True)
+    second_app.permissions.set(webhook_app.permissions.all())
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    query = """
+        subscription {
+          event {
+            recipient { id }
+            ... on ProductUpdated { product { id } }
+          }
+        }
+    """
+    webhooks = [
+        subscription_webhook(query, event_type),
+        subscription_webhook(query, event_type, app=second_app),
+    ]
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    assert mocked_generate_payload.call_count == 2
+    assert deliveries[0].payload != deliveries[1].payload
+    assert json.loads(deliveries[1].payload.payload)["recipient"]["id"] == (
+        graphene.Node.to_global_id("App", second_app.id)
+    )
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_query_with_app_type(
+    mocked_generate_payload, product, subscription_webhook, webhook_app
+):
+    # given
+    second_app = App.objects.create(name="Second app", is_active=True)
+    second_app.permissions.set(webhook_app.permissions.all())
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    query = """
+        subscription {
+          event {
+            issuingPrincipal { ... on App { id } }
+            ... on ProductUpdated { product { id } }
+          }
+        }
+    """
+    webhooks = [
+        subscription_webhook(query, event_type),
+        subscription_webhook(query, event_type, app=second_app),
+    ]
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    assert mocked_generate_payload.call_count == 2
+    assert len(deliveries) == 2
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_query_with_metadata_same_app(
+    mocked_generate_payload, product, subscription_webhook, webhook_app
+):
+    # given
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    query = """
+        subscription {
+          event {
+            ... on ProductUpdated { product { id privateMetadata { key } } }
+          }
+        }
+    """
+    second_app = App.objects.create(name="Second app", is_active=True)
+    second_app.permissions.set(webhook_app.permissions.all())
+    webhooks = [
+        subscription_webhook(query, event_type),
+        subscription_webhook(query, event_type),
+        subscription_webhook(query, event_type, app=second_app),
+    ]
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    # the payload is reused only by the webhooks of the same app
+    assert mocked_generate_payload.call_count == 2
+    assert len(deliveries) == 3
@@ -1,13 +1,16 @@
+import json
+import threading
+import time
 from unittest import mock
 
 import pytest
 
 from ....core import EventDeliveryStatus
-from ....core.models import EventDelivery, EventPayload
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
 from ....webhook.event_types import WebhookEventSyncType
 from ....webhook.models import Webhook, WebhookEvent
 from ....webhook.transport.synchronous.transport import trigger_all_webhooks_sync
-from ....webhook.transport.utils import parse_tax_data
+from ....webhook.transport.utils import WebhookResponse, parse_tax_data
 
 
 @pytest.fixture
@@ -139,3 +142,195 @@ def test_trigger_tax_webhook_sync_invalid_webhooks(
     # then
     assert mock_request.call_count == len(tax_checkout_webhooks)
     assert tax_data is None
+
+
+def _tax_webhook_response(data):
+    return WebhookResponse(content=json.dumps(data), response_status_code=200)
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_first_in_order(
+    mock_send_webhook_using_http,
+    settings,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+    slow_response_data = {**tax_data_response, "total_net_amount": 10.0}
+    first_request_sent = threading.Event()
+
+    def send_webhook_using_http(target_url, *args, **kwargs):
+        if target_url == tax_checkout_webhooks[0].target_url:
+            first_request_sent.set()
+            return _tax_webhook_response({})
+        if target_url == tax_checkout_webhooks[1].target_url:
+            # the response of the webhook with a higher priority comes last
+            first_request_sent.wait(timeout=1)
+            time.sleep(0.1)
+            return _tax_webhook_response(slow_response_data)
+        return _tax_webhook_response(tax_data_response)
+
+    mock_send_webhook_using_http.side_effect = send_webhook_using_http
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data == parse_tax_data(slow_response_data)
+    assert mock_send_webhook_using_http.call_count == len(tax_checkout_webhooks)
+    # all requests have finished successfully, so the deliveries are cleared
+    assert not EventDelivery.objects.exists()
+    assert not EventDeliveryAttempt.objects.exists()
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_invalid_webhooks(
+    mock_send_webhook_using_http, settings, tax_checkout_webhooks
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+    mock_send_webhook_using_http.return_value = _tax_webhook_response({})
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data is None
+    assert mock_send_webhook_using_http.call_count == len(tax_checkout_webhooks)
+    assert not EventDelivery.objects.exists()
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_slower_requests_not_awaited(
+    mock_send_webhook_using_http,
+    settings,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+    release_slow_requests = threading.Event()
+
+    def send_webhook_using_http(target_url, *args, **kwargs):
+        if target_url == tax_checkout_webhooks[0].target_url:
+            return _tax_webhook_response(tax_data_response)
+        release_slow_requests.wait(timeout=5)
+        return _tax_webhook_response({})
+
+    mock_send_webhook_using_http.side_effect = send_webhook_using_http
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    try:
+        tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+    finally:
+        release_slow_requests.set()
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    deliveries = EventDelivery.objects.all()
+    assert {delivery.webhook for delivery in deliveries} == set(
+        tax_checkout_webhooks[1:]
+    )
+    assert {delivery.status for delivery in deliveries} == {EventDeliveryStatus.FAILED}
+    attempts = EventDeliveryAttempt.objects.filter(delivery__in=deliveries)
+    assert len(attempts) == 2
+    for attempt in attempts:
+        assert attempt.status == EventDeliveryStatus.FAILED
+        assert "a webhook with higher priority responded" in attempt.response
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_webhook_with_invalid_scheme(
+    mock_send_webhook_using_http,
+    settings,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+    invalid_webhook = tax_checkout_webhooks[0]
+    invalid_webhook.target_url = "ftp://www.example.com/tax-checkout"
+    invalid_webhook.save(update_fields=["target_url"])
+    mock_send_webhook_using_http.return_value = _tax_webhook_response(tax_data_response)
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    delivery = EventDelivery.objects.get(webhook=invalid_webhook)
+    assert delivery.status == EventDeliveryStatus.FAILED
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_failed_request(
+    mock_send_webhook_using_http,
+    settings,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+
+    def send_webhook_using_http(target_url, *args, **kwargs):
+        if target_url == tax_checkout_webhooks[0].target_url:
+            raise RuntimeError("Unexpected error")
+        return _tax_webhook_response(tax_data_response)
+
+    mock_send_webhook_using_http.side_effect = send_webhook_using_http
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    delivery = EventDelivery.objects.get(webhook=tax_checkout_webhooks[0])
+    assert delivery.status == EventDeliveryStatus.FAILED
+    assert delivery.attempts.get().response == "Unexpected error"
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_tax_webhook_sync_concurrently_responses_awaited_in_time(
+    mock_send_webhook_using_http,
+    settings,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    settings.WEBHOOK_SYNC_CONCURRENT_ENABLED = True
+    settings.WEBHOOK_SYNC_TIMEOUT = 0.1
+    release_slow_requests = threading.Event()
+
+    def send_webhook_using_http(target_url, *args, **kwargs):
+        if target_url == tax_checkout_webhooks[2].target_url:
+            return _tax_webhook_response(tax_data_response)
+        release_slow_requests.wait(timeout=5)
+        return _tax_webhook_response(tax_data_response)
+
+    mock_send_webhook_using_http.side_effect = send_webhook_using_http
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    try:
+        tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+    finally:
+        release_slow_requests.set()
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    deliveries = EventDelivery.objects.filter(webhook__in=tax_checkout_webhooks[:2])
+    assert {delivery.status for delivery in deliveries} == {EventDeliveryStatus.FAILED}
+    for delivery in deliveries:
+        assert "did not respond in time" in delivery.attempts.get().response
@@ -0,0 +1,181 @@
+import random
+import time
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from prices import Money
+
+from ....channel.models import Channel
+from ....discount import PromotionRuleInfo, RewardValueType
+from ....discount.models import PromotionRule
+from ....discount.utils import calculate_discounted_price_for_promotions
+from ...utils.variant_prices import calculate_discounted_prices
+
+CURRENCIES = ["USD", "EUR", "PLN", "JPY", "GBP"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the calculation of the variants discounted prices on generated "
+        "in-memory data. The database is not used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100000)
+        parser.add_argument("--channels", type=int, default=10)
+        parser.add_argument("--promotions", type=int, default=20)
+        parser.add_argument(
+            "--rules-per-promotion",
+            type=int,
+            default=3,
+            help="Number of rules of each promotion, each in a subset of channels.",
+        )
+        parser.add_argument(
+            "--discounted-ratio",
+            type=float,
+            default=0.5,
+            help="Part of the products included in any promotion.",
+        )
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help=(
+                "Also calculate the prices variant by variant with `Money` "
+                "arithmetic, report the time and check that the results are equal."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        channels = [
+            Channel(
+                id=channel_id,
+                slug=f"channel-{channel_id}",
+                currency_code=CURRENCIES[channel_id % len(CURRENCIES)],
+            )
+            for channel_id in range(1, options["channels"] + 1)
+        ]
+        variant_ids = list(range(1, options["products"] + 1))
+        rules_info_per_variant_and_promotion_id = self.generate_promotions(
+            rng, channels, variant_ids, options
+        )
+        prices = [
+            Decimal(rng.randint(100, 100000)) / 100 for _ in range(len(variant_ids))
+        ]
+
+        rows = len(variant_ids) * len(channels)
+        start = time.perf_counter()
+        results = [
+            calculate_discounted_prices(
+                prices,
+                variant_ids,
+                rules_info_per_variant_and_promotion_id,
+                channel.id,
+                channel.currency_code,
+            )
+            for channel in channels
+        ]
+        duration = time.perf_counter() - start
+        self.report("Columnar calculation", rows, duration)
+
+        if options["compare"]:
+            start = time.perf_counter()
+            for channel, (discounted_prices, applied_discounts) in zip(
+                channels, results
+            ):
+                self.compare(
+                    prices,
+                    variant_ids,
+                    rules_info_per_variant_and_promotion_id,
+                    channel,
+                    discounted_prices,
+                    applied_discounts,
+                )
+            legacy_duration = time.perf_counter() - start
+            self.report("Per variant calculation", rows, legacy_duration)
+
+    def generate_promotions(self, rng, channels, variant_ids, options):
+        rules_info_per_variant_and_promotion_id: dict[
+            int, dict[uuid.UUID, list[PromotionRuleInfo]]
+        ] = defaultdict(lambda: defaultdict(list))
+        discounted_variant_ids = rng.sample(
+            variant_ids, int(len(variant_ids) * options["discounted_ratio"])
+        )
+        for _ in range(options["promotions"]):
+            promotion_id = uuid.uuid4()
+            rules_info = []
+            for _ in range(options["rules_per_promotion"]):
+                reward_value_type = rng.choice(
+                    [RewardValueType.FIXED, RewardValueType.PERCENTAGE]
+                )
+                rule = PromotionRule(
+                    id=uuid.uuid4(),
+                    promotion_id=promotion_id,
+                    reward_value_type=reward_value_type,
+                    reward_value=Decimal(rng.randint(1, 5000)) / 100
+                    if reward_value_type == RewardValueType.FIXED
+                    else Decimal(rng.randint(1, 50)),
+                )
+                channel_ids = [
+                    channel.id
+                    for channel in rng.sample(channels, rng.randint(1, len(channels)))
+                ]
+                rules_info.append(PromotionRuleInfo(rule=rule, channel_ids=channel_ids))
+            promotion_variant_ids = rng.sample(
+                discounted_variant_ids,
+                rng.randint(0, len(discounted_variant_ids) // 2),
+            )
+            for variant_id in promotion_variant_ids:
+                rules_info_per_variant_and_promotion_id[variant_id][
+                    promotion_id
+                ].extend(rules_info)
+        return rules_info_per_variant_and_promotion_id
+
+    def compare(
+        self,
+        prices,
+        variant_ids,
+        rules_info_per_variant_and_promotion_id,
+        channel,
+        discounted_prices,
+        applied_discounts,
+    ):
+        for price, variant_id, discounted_price, variant_discounts in zip(
+            prices, variant_ids, discounted_prices, applied_discounts
+        ):
+            expected_discounts = [
+                (rule_id, discount.amount)
+                for rule_id, discount in calculate_discounted_price_for_promotions(
+                    price=Money(price, channel.currency_code),
+                    rules_info_per_variant_and_promotion_id=(
+                        rules_info_per_variant_and_promotion_id
+                    ),
+                    channel=channel,
+                    variant_id=variant_id,
+                )
+            ]
+            expected_price = max(
+                price - sum(discount for _, discount in expected_discounts),
+                Decimal(0),
+            )
+            if discounted_price != expected_price:
+                raise CommandError(
+                    f"Discounted price of variant {variant_id} in channel "
+                    f"{channel.id} differs: {discounted_price} != {expected_price}."
+                )
+            if [rule_id for rule_id, _ in variant_discounts] != [
+                rule_id for rule_id, _ in expected_discounts
+            ][: len(variant_discounts)]:
+                raise CommandError(
+                    f"Applied rules of variant {variant_id} in channel "
+                    f"{channel.id} differ."
+                )
+
+    def report(self, label, rows, duration):
+        self.stdout.write(
+            f"{label}: {rows} variant listings in {duration:.2f}s "
+            f"({rows / duration if duration else 0:.0f} rows/s)."
+        )
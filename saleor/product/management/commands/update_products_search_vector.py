@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Product
+from ...search import update_dirty_products_search_vector
+from ...tasks import update_dirty_products_search_vector_in_parallel_task
+
+
+class Command(BaseCommand):
+    help = "Updates the search vectors of products marked as dirty."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Mark all the products as dirty to rebuild the whole search index.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help=(
+                "Split the products into the given number of Celery tasks. "
+                "By default, the products are updated in the current process."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            count = Product.objects.filter(search_index_dirty=False).update(
+                search_index_dirty=True
+            )
+            self.stdout.write(f"Marked {count} products as dirty.")
+
+        workers = options["workers"]
+        if workers:
+            update_dirty_products_search_vector_in_parallel_task.delay(workers)
+            self.stdout.write(
+                f"Scheduled updating the search vectors in {workers} tasks."
+            )
+            return
+
+        stats = update_dirty_products_search_vector()
+        self.stdout.write(
+            f"Updated search vectors of {stats.products} products in "
+            f"{stats.duration:.2f}s ({stats.products_per_second:.1f} products/s, "
+            f"peak memory {stats.peak_memory:.1f} MB)."
+        )
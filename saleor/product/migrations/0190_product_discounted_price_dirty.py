@@ -0,0 +1,17 @@
+# Generated by Django 3.2.23 on 2026-10-17 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0189_merge_20230929_0857"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="discounted_price_dirty",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.23 on 2026-10-17 15:28
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+from django.db.models import Q
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("product", "0190_product_discounted_price_dirty"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="product",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                condition=Q(discounted_price_dirty=True),
+                fields=["id"],
+                name="product_discounted_price_dirty",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.23 on 2026-10-17 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0191_product_discounted_price_dirty_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="discounted_price_claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -11,7 +11,7 @@ from django.contrib.postgres.indexes import BTreeIndex, GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
-from django.db.models import JSONField, TextField
+from django.db.models import JSONField, Q, TextField
 from django.urls import reverse
 from django.utils import timezone
 from django_measurement.models import MeasurementField
@@ -176,6 +176,8 @@ class Product(SeoModel, ModelWithMetadata, ModelWithExternalReference):
     search_document = models.TextField(blank=True, default="")
     search_vector = SearchVectorField(blank=True, null=True)
     search_index_dirty = models.BooleanField(default=False, db_index=True)
+    discounted_price_dirty = models.BooleanField(default=False)
+    discounted_price_claimed_at = models.DateTimeField(null=True, blank=True)
 
     category = models.ForeignKey(
         Category,
@@ -231,6 +233,11 @@ class Product(SeoModel, ModelWithMetadata, ModelWithExternalReference):
                 fields=["name", "slug"],
                 opclasses=["gin_trgm_ops"] * 2,
             ),
+            BTreeIndex(
+                name="product_discounted_price_dirty",
+                fields=["id"],
+                condition=Q(discounted_price_dirty=True),
+            ),
         ]
         indexes.extend(ModelWithMetadata.Meta.indexes)
 
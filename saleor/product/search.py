@@ -1,17 +1,16 @@
+import resource
+import sys
+import time
 from collections import defaultdict
-from typing import TYPE_CHECKING, Union
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Union
 
 from django.conf import settings
 from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db.models import F, Q, Value, prefetch_related_objects
-from django.db.models.expressions import Exists, OuterRef
 
 from ..attribute import AttributeInputType
-from ..attribute.models import (
-    AssignedProductAttributeValue,
-    Attribute,
-    AttributeProduct,
-)
+from ..attribute.models import Attribute
 from ..core.postgres import FlatConcatSearchVector, NoValidationSearchVector
 from ..core.utils.editorjs import clean_editor_js
 from .models import Product
@@ -22,7 +21,7 @@ if TYPE_CHECKING:
 PRODUCT_SEARCH_FIELDS = ["name", "description_plaintext"]
 PRODUCT_FIELDS_TO_PREFETCH = [
     "variants__attributes__values",
-    "variants__attributes",
+    "variants__attributes__assignment__attribute",
     "attributevalues__value",
     "product_type__attributeproduct__attribute",
 ]
@@ -47,17 +46,85 @@ def _prep_product_search_vector_index(products):
     )
 
 
-def update_products_search_vector(products: "QuerySet", use_batches=True):
-    if use_batches:
-        last_id = 0
-        while True:
-            products_batch = list(products.filter(id__gt=last_id)[:PRODUCTS_BATCH_SIZE])
-            if not products_batch:
-                break
-            last_id = products_batch[-1].id
-            _prep_product_search_vector_index(products_batch)
-    else:
-        _prep_product_search_vector_index(products)
+def update_products_search_vector(products: "QuerySet", use_batches=True) -> int:
+    """Update search vectors of the products and return the number of products."""
+    if not use_batches:
+        products_list = list(products)
+        _prep_product_search_vector_index(products_list)
+        return len(products_list)
+
+    updated_count = 0
+    last_id = 0
+    products = products.order_by("pk")
+    while True:
+        products_batch = list(products.filter(id__gt=last_id)[:PRODUCTS_BATCH_SIZE])
+        if not products_batch:
+            break
+        last_id = products_batch[-1].id
+        _prep_product_search_vector_index(products_batch)
+        updated_count += len(products_batch)
+    return updated_count
+
+
+@dataclass
+class SearchIndexStats:
+    products: int
+    duration: float
+    # Peak resident memory of the process, in megabytes.
+    peak_memory: float
+
+    @property
+    def products_per_second(self) -> float:
+        return self.products / self.duration if self.duration else 0.0
+
+
+def _get_peak_memory() -> float:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # `ru_maxrss` is in bytes on macOS and in kilobytes on Linux.
+    return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+
+def update_dirty_products_search_vector(
+    start_id: Optional[int] = None, end_id: Optional[int] = None
+) -> SearchIndexStats:
+    """Update search vectors of products marked with `search_index_dirty`.
+
+    Only products with ids between `start_id` and `end_id` (both inclusive) are
+    updated when given, so the catalog can be indexed by several workers at once.
+    """
+    products = Product.objects.filter(search_index_dirty=True)
+    if start_id is not None:
+        products = products.filter(id__gte=start_id)
+    if end_id is not None:
+        products = products.filter(id__lte=end_id)
+
+    start = time.monotonic()
+    updated_count = update_products_search_vector(products)
+    return SearchIndexStats(
+        products=updated_count,
+        duration=time.monotonic() - start,
+        peak_memory=_get_peak_memory(),
+    )
+
+
+def get_dirty_products_id_ranges(parts: int) -> list[tuple[int, Optional[int]]]:
+    """Split the ids of dirty products into ranges of a similar number of products.
+
+    The last range is open, so products marked as dirty in the meantime are
+    indexed as well.
+    """
+    dirty_ids = (
+        Product.objects.filter(search_index_dirty=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    count = dirty_ids.count()
+    parts = min(parts, count)
+    if not parts:
+        return []
+    start_ids = [dirty_ids[count * part // parts] for part in range(parts)]
+    end_ids: list[Optional[int]] = [start_id - 1 for start_id in start_ids[1:]]
+    return list(zip(start_ids, end_ids + [None]))
 
 
 def prepare_product_search_vector_value(
@@ -106,26 +173,22 @@ def generate_attributes_search_vector_value(
 ) -> list[NoValidationSearchVector]:
     """Prepare `search_vector` value for assigned attributes.
 
-    Method should receive assigned attributes with prefetched `values`
+    The attributes of the product type and the assigned values are taken from
+    the prefetched objects when available, so indexing a batch of products doesn't
+    query them for each product separately.
     """
-    product_attributes = AttributeProduct.objects.filter(
-        product_type_id=product.product_type_id
-    )
-    attributes = Attribute.objects.filter(
-        Exists(product_attributes.filter(attribute_id=OuterRef("id")))
-    ).order_by("attributeproduct__sort_order")[
-        : settings.PRODUCT_MAX_INDEXED_ATTRIBUTES
-    ]
-
-    assigned_values = AssignedProductAttributeValue.objects.filter(
-        product_id=product.pk
+    prefetch_related_objects(
+        [product], "attributevalues__value", "product_type__attributeproduct__attribute"
     )
-    prefetch_related_objects(assigned_values, "value")
+    attributes = [
+        attribute_product.attribute
+        for attribute_product in product.product_type.attributeproduct.all()
+    ][: settings.PRODUCT_MAX_INDEXED_ATTRIBUTES]
 
     search_vectors = []
 
     values_map = defaultdict(list)
-    for av in assigned_values:
+    for av in product.attributevalues.all():
         values_map[av.value.attribute_id].append(av.value)
 
     for attribute in attributes:
@@ -3,6 +3,7 @@ from collections.abc import Iterable
 from typing import Optional
 from uuid import UUID
 
+from celery import group
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
@@ -16,8 +17,17 @@ from ..discount.models import Promotion, PromotionRule
 from ..discount.utils import get_current_products_for_rules
 from ..warehouse.management import deactivate_preorder_for_variant
 from .models import Product, ProductType, ProductVariant
-from .search import PRODUCTS_BATCH_SIZE, update_products_search_vector
-from .utils.variant_prices import update_discounted_prices_for_promotion
+from .search import (
+    PRODUCTS_BATCH_SIZE,
+    get_dirty_products_id_ranges,
+    update_dirty_products_search_vector,
+    update_products_search_vector,
+)
+from .utils.variant_prices import (
+    get_dirty_products_discounted_prices_count,
+    mark_products_discounted_prices_dirty,
+    update_dirty_products_discounted_prices,
+)
 from .utils.variants import (
     fetch_variants_for_promotion_rules,
     generate_and_set_variant_name,
@@ -94,7 +104,8 @@ def update_products_discounted_prices_of_promotion_task(promotion_pk: UUID):
     previous_products = get_current_products_for_rules(promotion.rules.all())
     products = get_products_for_promotion(promotion, update_rule_variants=True)
     products |= previous_products
-    update_discounted_prices_task.delay(list(products.values_list("id", flat=True)))
+    mark_products_discounted_prices_dirty(products.values_list("id", flat=True))
+    update_dirty_products_discounted_prices_task.delay()
 
 
 @app.task
@@ -124,9 +135,12 @@ def update_products_discounted_prices_for_promotion_task(
     )
     if ids := list(rules.values_list("pk", flat=True)):
         qs = PromotionRule.objects.filter(pk__in=ids)
-        fetch_variants_for_promotion_rules(rules=qs)
+        # the products added to or removed from the rules get a new discount as well
+        changed_product_ids = fetch_variants_for_promotion_rules(rules=qs)
         update_products_discounted_prices_for_promotion_task.delay(
-            product_ids, ids[-1], rule_ids=rule_ids
+            [*product_ids, *(changed_product_ids - set(product_ids))],
+            ids[-1],
+            rule_ids=rule_ids,
         )
     else:
         # when all promotion rules variants are up to date, call discounted prices
@@ -136,13 +150,27 @@ def update_products_discounted_prices_for_promotion_task(
 
 @app.task
 def update_discounted_prices_task(product_ids: Iterable[int]):
-    """Update the product discounted prices for given product ids."""
-    ids = sorted(product_ids)[:DISCOUNTED_PRODUCT_BATCH]
-    qs = Product.objects.filter(pk__in=ids)
-    if ids:
-        update_discounted_prices_for_promotion(qs)
-        remaining_ids = list(set(product_ids) - set(ids))
-        update_discounted_prices_task.delay(remaining_ids)
+    """Queue the products for the discounted prices update and start the update."""
+    mark_products_discounted_prices_dirty(product_ids)
+    update_dirty_products_discounted_prices_task.delay()
+
+
+@app.task(
+    queue=settings.UPDATE_DISCOUNTED_PRICES_QUEUE_NAME,
+    expires=settings.BEAT_UPDATE_DISCOUNTED_PRICES_EXPIRE_AFTER_SEC,
+)
+def update_dirty_products_discounted_prices_task():
+    """Update the discounted prices of the queued products in batches."""
+    updated_count = update_dirty_products_discounted_prices(DISCOUNTED_PRODUCT_BATCH)
+    if not updated_count:
+        return
+    task_logger.info(
+        "Updated discounted prices of %d products, %d products remaining.",
+        updated_count,
+        get_dirty_products_discounted_prices_count(),
+    )
+    if updated_count == DISCOUNTED_PRODUCT_BATCH:
+        update_dirty_products_discounted_prices_task.delay()
 
 
 @app.task
@@ -171,3 +199,30 @@ def update_products_search_vector_task():
         :PRODUCTS_BATCH_SIZE
     ]
     update_products_search_vector(products, use_batches=False)
+
+
+@app.task(queue=settings.UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME)
+def update_dirty_products_search_vector_task(
+    start_id: Optional[int] = None, end_id: Optional[int] = None
+):
+    stats = update_dirty_products_search_vector(start_id, end_id)
+    task_logger.info(
+        "Updated search vectors of %d products with ids from %s to %s in %.2fs "
+        "(%.1f products/s, peak memory %.1f MB).",
+        stats.products,
+        start_id,
+        end_id,
+        stats.duration,
+        stats.products_per_second,
+        stats.peak_memory,
+    )
+
+
+@app.task(queue=settings.UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME)
+def update_dirty_products_search_vector_in_parallel_task(workers: int):
+    """Split updating the dirty products search vectors into `workers` tasks."""
+    id_ranges = get_dirty_products_id_ranges(workers)
+    group(
+        update_dirty_products_search_vector_task.s(start_id, end_id)
+        for start_id, end_id in id_ranges
+    ).apply_async()
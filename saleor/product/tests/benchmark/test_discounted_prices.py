@@ -0,0 +1,143 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from ....discount import RewardValueType
+from ....discount.models import Promotion
+from ...models import (
+    Product,
+    ProductChannelListing,
+    ProductVariant,
+    ProductVariantChannelListing,
+    VariantChannelListingPromotionRule,
+)
+from ...utils.variant_prices import update_discounted_prices_for_promotion
+
+
+def _create_products(product_type, category, channels, products_number):
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Benchmark product {i}",
+                slug=f"benchmark-product-{i}",
+                product_type=product_type,
+                category=category,
+            )
+            for i in range(products_number)
+        ]
+    )
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"BENCHMARK-{product.pk}-{i}")
+            for product in products
+            for i in range(2)
+        ]
+    )
+    ProductChannelListing.objects.bulk_create(
+        [
+            ProductChannelListing(
+                product=product, channel=channel, currency=channel.currency_code
+            )
+            for product in products
+            for channel in channels
+        ]
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        [
+            ProductVariantChannelListing(
+                variant=variant,
+                channel=channel,
+                price_amount=Decimal(10 + i),
+                currency=channel.currency_code,
+            )
+            for i, variant in enumerate(variants)
+            for channel in channels
+        ]
+    )
+    promotion = Promotion.objects.create(name="Benchmark promotion")
+    percentage_rule = promotion.rules.create(
+        reward_value_type=RewardValueType.PERCENTAGE, reward_value=Decimal("12.5")
+    )
+    percentage_rule.channels.add(*channels)
+    percentage_rule.variants.add(*variants)
+    fixed_rule = promotion.rules.create(
+        reward_value_type=RewardValueType.FIXED, reward_value=Decimal(3)
+    )
+    fixed_rule.channels.add(channels[0])
+    fixed_rule.variants.add(*variants)
+    return products
+
+
+@pytest.mark.parametrize("products_number", [1, 10, 100])
+def test_update_discounted_prices_queries_number_does_not_depend_on_products_number(
+    products_number,
+    product_type,
+    category,
+    channel_USD,
+    channel_PLN,
+    django_assert_num_queries,
+):
+    # given
+    products = _create_products(
+        product_type, category, [channel_USD, channel_PLN], products_number
+    )
+    product_ids = [product.pk for product in products]
+
+    # when
+    # variants and products listings, rules, relations and channels are fetched once,
+    # the listings are updated, and the relations are locked and created
+    with django_assert_num_queries(16):
+        update_discounted_prices_for_promotion(
+            Product.objects.filter(id__in=product_ids)
+        )
+
+    # then
+    assert (
+        ProductChannelListing.objects.filter(
+            product_id__in=product_ids, discounted_price_amount__isnull=True
+        ).count()
+        == 0
+    )
+    assert VariantChannelListingPromotionRule.objects.count() == (
+        products_number * 2 * 3
+    )
+
+
+def test_update_discounted_prices_queries_number_for_unchanged_prices(
+    product_type, category, channel_USD, channel_PLN, django_assert_max_num_queries
+):
+    # given
+    products = Product.objects.filter(
+        id__in=[
+            product.pk
+            for product in _create_products(
+                product_type, category, [channel_USD, channel_PLN], 10
+            )
+        ]
+    )
+    update_discounted_prices_for_promotion(products)
+
+    # when
+    with django_assert_max_num_queries(16) as queries:
+        update_discounted_prices_for_promotion(products)
+
+    # then
+    # nothing is saved when the prices did not change
+    assert not [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith(("UPDATE", "INSERT", "DELETE"))
+    ]
+
+
+def test_benchmark_discounted_prices_command():
+    # when
+    call_command(
+        "benchmark_discounted_prices",
+        "--products",
+        "200",
+        "--channels",
+        "3",
+        "--compare",
+    )
@@ -97,3 +97,76 @@ def test_fetch_variants_for_promotion_rules_relation_already_exist(
     # then
     rule.refresh_from_db()
     assert rule.variants.count() > 0
+
+
+def test_fetch_variants_for_promotion_rules_applies_only_changes(
+    promotion_without_rules, product, product_with_two_variants
+):
+    # given
+    PromotionRuleVariant = PromotionRule.variants.through
+    rule = promotion_without_rules.rules.create(
+        catalogue_predicate={
+            "productPredicate": {
+                "ids": [
+                    graphene.Node.to_global_id("Product", product_with_two_variants.id)
+                ]
+            }
+        },
+        reward_value_type=RewardValueType.FIXED,
+        reward_value=Decimal("2"),
+    )
+    kept_variant, removed_variant = product_with_two_variants.variants.all()
+    rule.variants.set([kept_variant, product.variants.first()])
+    kept_rule_variant = PromotionRuleVariant.objects.get(
+        promotionrule=rule, productvariant=kept_variant
+    )
+
+    # when
+    changed_product_ids = fetch_variants_for_promotion_rules(
+        PromotionRule.objects.all()
+    )
+
+    # then
+    assert changed_product_ids == {product.id, product_with_two_variants.id}
+    assert set(rule.variants.all()) == {kept_variant, removed_variant}
+    assert PromotionRuleVariant.objects.filter(pk=kept_rule_variant.pk).exists()
+
+
+def test_fetch_variants_for_promotion_rules_nothing_changed(promotion):
+    # given
+    fetch_variants_for_promotion_rules(PromotionRule.objects.all())
+    PromotionRuleVariant = PromotionRule.variants.through
+    rule_variant_ids = set(PromotionRuleVariant.objects.values_list("pk", flat=True))
+
+    # when
+    changed_product_ids = fetch_variants_for_promotion_rules(
+        PromotionRule.objects.all()
+    )
+
+    # then
+    assert changed_product_ids == set()
+    assert (
+        set(PromotionRuleVariant.objects.values_list("pk", flat=True))
+        == rule_variant_ids
+    )
+
+
+def test_fetch_variants_for_promotion_rules_empty_predicate(
+    promotion_without_rules, product
+):
+    # given
+    rule = promotion_without_rules.rules.create(
+        catalogue_predicate={},
+        reward_value_type=RewardValueType.FIXED,
+        reward_value=Decimal("2"),
+    )
+    rule.variants.set(product.variants.all())
+
+    # when
+    changed_product_ids = fetch_variants_for_promotion_rules(
+        PromotionRule.objects.all()
+    )
+
+    # then
+    assert changed_product_ids == {product.id}
+    assert not rule.variants.exists()
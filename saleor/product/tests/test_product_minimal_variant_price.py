@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import ROUND_HALF_UP, Decimal
 from unittest.mock import patch
 
@@ -5,12 +6,20 @@ import before_after
 import graphene
 import pytest
 from django.core.management import call_command
+from django.utils import timezone
 from prices import Money
 
-from ...discount import RewardValueType
+from ...discount import PromotionRuleInfo, RewardValueType
 from ...discount.models import Promotion, PromotionRule
 from ...product.models import Product, VariantChannelListingPromotionRule
-from ..utils.variant_prices import update_discounted_prices_for_promotion
+from ..utils.variant_prices import (
+    DISCOUNTED_PRICE_CLAIM_TIMEOUT,
+    calculate_discounted_prices,
+    get_dirty_products_discounted_prices_count,
+    mark_products_discounted_prices_dirty,
+    update_dirty_products_discounted_prices,
+    update_discounted_prices_for_promotion,
+)
 
 
 def test_update_discounted_price_for_promotion_no_discount(product, channel_USD):
@@ -472,6 +481,102 @@ def test_update_discounted_price_for_promotion_discount_one_rule_not_valid_anymo
         listing_promotion_rules[0].refresh_from_db()
 
 
+def test_update_discounted_price_for_promotion_rule_not_valid_price_not_changed(
+    product, channel_USD
+):
+    # given
+    variant = product.variants.first()
+    variant_channel_listing = variant.channel_listings.get(channel_id=channel_USD.id)
+    variant_price = variant_channel_listing.price
+
+    promotion = Promotion.objects.create(name="Promotion")
+    rule = promotion.rules.create(
+        name="Fixed promotion rule",
+        catalogue_predicate={},
+        reward_value_type=RewardValueType.FIXED,
+        reward_value=Decimal("2"),
+    )
+    rule.channels.add(channel_USD)
+    listing_promotion_rule = VariantChannelListingPromotionRule.objects.create(
+        variant_channel_listing=variant_channel_listing,
+        promotion_rule=rule,
+        discount_amount=Decimal("0"),
+        currency=channel_USD.currency_code,
+    )
+
+    # when
+    update_discounted_prices_for_promotion(Product.objects.filter(id__in=[product.id]))
+
+    # then
+    variant_channel_listing.refresh_from_db()
+    assert variant_channel_listing.discounted_price == variant_price
+    with pytest.raises(VariantChannelListingPromotionRule.DoesNotExist):
+        listing_promotion_rule.refresh_from_db()
+
+
+@pytest.mark.parametrize(
+    ("price", "currency", "expected_price"),
+    [
+        (Decimal("9.99"), "USD", Decimal("5.99")),
+        (Decimal("3.33"), "USD", Decimal("0")),
+        (Decimal("1005"), "JPY", Decimal("901")),
+    ],
+)
+def test_calculate_discounted_prices(price, currency, expected_price):
+    # given
+    channel_id = 1
+    promotion = Promotion(name="Promotion")
+    percentage_rule = PromotionRule(
+        promotion=promotion,
+        reward_value_type=RewardValueType.PERCENTAGE,
+        reward_value=Decimal("10"),
+    )
+    fixed_rule = PromotionRule(
+        promotion=promotion,
+        reward_value_type=RewardValueType.FIXED,
+        reward_value=Decimal("3"),
+    )
+    worse_rule = PromotionRule(
+        reward_value_type=RewardValueType.FIXED, reward_value=Decimal("1")
+    )
+    other_channel_rule = PromotionRule(
+        reward_value_type=RewardValueType.FIXED, reward_value=Decimal("1000")
+    )
+    variant_id = 10
+    rules_info_per_variant_and_promotion_id = {
+        variant_id: {
+            promotion.id: [
+                PromotionRuleInfo(rule=percentage_rule, channel_ids=[channel_id]),
+                PromotionRuleInfo(rule=fixed_rule, channel_ids=[channel_id]),
+            ],
+            worse_rule.id: [PromotionRuleInfo(rule=worse_rule, channel_ids=[1])],
+            other_channel_rule.id: [
+                PromotionRuleInfo(rule=other_channel_rule, channel_ids=[2])
+            ],
+        }
+    }
+
+    # when
+    discounted_prices, applied_discounts = calculate_discounted_prices(
+        [price, price],
+        [variant_id, variant_id + 1],
+        rules_info_per_variant_and_promotion_id,
+        channel_id,
+        currency,
+    )
+
+    # then
+    assert discounted_prices == [expected_price, price]
+    assert [rule_id for rule_id, _ in applied_discounts[0]] == [
+        percentage_rule.id,
+        fixed_rule.id,
+    ][: len(applied_discounts[0])]
+    assert sum(discount for _, discount in applied_discounts[0]) == (
+        price - expected_price
+    )
+    assert applied_discounts[1] == []
+
+
 @patch(
     "saleor.product.management.commands"
     ".update_all_products_discounted_prices"
@@ -609,3 +714,121 @@ def test_update_discounted_price_rule_deleted_in_meantime_promotion_listing_exis
     with pytest.raises(VariantChannelListingPromotionRule.DoesNotExist):
         listing_promotion_rule.refresh_from_db()
     assert not variant_channel_listing.variantlistingpromotionrule.exists()
+
+
+def test_mark_products_discounted_prices_dirty(product_list):
+    # given
+    product_ids = [product.id for product in product_list]
+    mark_products_discounted_prices_dirty(product_ids[:1])
+
+    # when
+    marked_count = mark_products_discounted_prices_dirty(product_ids)
+
+    # then
+    assert marked_count == len(product_ids) - 1
+    assert get_dirty_products_discounted_prices_count() == len(product_ids)
+
+
+def test_update_dirty_products_discounted_prices(product_list, channel_USD):
+    # given
+    ProductChannelListing = product_list[0].channel_listings.model
+    ProductChannelListing.objects.update(discounted_price_amount=0)
+    product_ids = sorted(product.id for product in product_list)
+    mark_products_discounted_prices_dirty(product_ids)
+
+    # when
+    updated_count = update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    assert updated_count == 2
+    assert set(
+        Product.objects.filter(discounted_price_dirty=True).values_list("id", flat=True)
+    ) == set(product_ids[2:])
+    assert set(
+        ProductChannelListing.objects.filter(discounted_price_amount=0).values_list(
+            "product_id", flat=True
+        )
+    ) == set(product_ids[2:])
+
+
+def test_update_dirty_products_discounted_prices_empty_queue(product):
+    # when
+    updated_count = update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    assert updated_count == 0
+
+
+@patch(
+    "saleor.product.utils.variant_prices.update_discounted_prices_for_promotion",
+    side_effect=Exception("Database error"),
+)
+def test_update_dirty_products_discounted_prices_error_keeps_products_queued(
+    _mocked_update_discounted_prices, product
+):
+    # given
+    mark_products_discounted_prices_dirty([product.id])
+
+    # when
+    with pytest.raises(Exception, match="Database error"):
+        update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    product.refresh_from_db()
+    assert product.discounted_price_dirty is True
+    assert product.discounted_price_claimed_at is None
+
+
+def test_update_dirty_products_discounted_prices_marked_during_update(product):
+    # given
+    mark_products_discounted_prices_dirty([product.id])
+
+    def mark_again(products):
+        mark_products_discounted_prices_dirty([product.id])
+
+    # when
+    with patch(
+        "saleor.product.utils.variant_prices.update_discounted_prices_for_promotion",
+        side_effect=mark_again,
+    ):
+        update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    product.refresh_from_db()
+    assert product.discounted_price_dirty is True
+    assert product.discounted_price_claimed_at is None
+
+
+def test_update_dirty_products_discounted_prices_skips_claimed_products(product):
+    # given
+    mark_products_discounted_prices_dirty([product.id])
+    Product.objects.filter(id=product.id).update(
+        discounted_price_claimed_at=timezone.now()
+    )
+
+    # when
+    updated_count = update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    assert updated_count == 0
+    product.refresh_from_db()
+    assert product.discounted_price_dirty is True
+
+
+def test_update_dirty_products_discounted_prices_takes_abandoned_claims(product):
+    # given
+    mark_products_discounted_prices_dirty([product.id])
+    Product.objects.filter(id=product.id).update(
+        discounted_price_claimed_at=timezone.now()
+        - DISCOUNTED_PRICE_CLAIM_TIMEOUT
+        - timedelta(minutes=1)
+    )
+
+    # when
+    updated_count = update_dirty_products_discounted_prices(batch_size=2)
+
+    # then
+    assert updated_count == 1
+    product.refresh_from_db()
+    assert product.discounted_price_dirty is False
+    assert product.discounted_price_claimed_at is None
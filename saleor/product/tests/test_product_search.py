@@ -1,5 +1,14 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from ..models import Product
-from ..search import update_products_search_vector
+from ..search import (
+    get_dirty_products_id_ranges,
+    update_dirty_products_search_vector,
+    update_products_search_vector,
+)
 
 
 def test_update_products_search_vector(product_list):
@@ -15,3 +24,109 @@ def test_update_products_search_vector(product_list):
     for product in product_list:
         product.refresh_from_db()
         assert product.search_vector
+
+
+@patch("saleor.product.search.PRODUCTS_BATCH_SIZE", 1)
+def test_update_products_search_vector_in_batches_ordered_by_pk(product_list):
+    # given
+    Product.objects.update(search_vector=None)
+    # the default products ordering by slug differs from the ordering by pk
+    for index, product in enumerate(reversed(product_list)):
+        product.slug = f"product-{index}"
+    Product.objects.bulk_update(product_list, ["slug"])
+
+    # when
+    updated_count = update_products_search_vector(Product.objects.all())
+
+    # then
+    assert updated_count == len(product_list)
+    assert not Product.objects.filter(search_vector=None).exists()
+
+
+def test_update_products_search_vector_queries_not_depend_on_products_count(
+    product_list,
+):
+    # given
+    product = product_list[0]
+
+    # when
+    with CaptureQueriesContext(connection) as single_product_queries:
+        update_products_search_vector(Product.objects.filter(pk=product.pk))
+    with CaptureQueriesContext(connection) as all_products_queries:
+        update_products_search_vector(Product.objects.all())
+
+    # then
+    assert len(single_product_queries) == len(all_products_queries)
+
+
+def test_update_dirty_products_search_vector(product_list):
+    # given
+    first_product, second_product, third_product = product_list
+    Product.objects.update(search_vector=None, search_index_dirty=True)
+    Product.objects.filter(pk=third_product.pk).update(search_index_dirty=False)
+
+    # when
+    stats = update_dirty_products_search_vector()
+
+    # then
+    assert stats.products == 2
+    assert stats.peak_memory > 0
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+    assert set(Product.objects.filter(search_vector=None)) == {third_product}
+
+
+def test_update_dirty_products_search_vector_in_range(product_list):
+    # given
+    first_product, second_product, third_product = product_list
+    Product.objects.update(search_index_dirty=True)
+
+    # when
+    stats = update_dirty_products_search_vector(
+        start_id=second_product.pk, end_id=second_product.pk
+    )
+
+    # then
+    assert stats.products == 1
+    assert set(Product.objects.filter(search_index_dirty=True)) == {
+        first_product,
+        third_product,
+    }
+
+
+def test_get_dirty_products_id_ranges(product_list):
+    # given
+    first_product, second_product, third_product = product_list
+    Product.objects.update(search_index_dirty=True)
+
+    # when
+    id_ranges = get_dirty_products_id_ranges(2)
+
+    # then
+    assert id_ranges == [
+        (first_product.pk, second_product.pk - 1),
+        (second_product.pk, None),
+    ]
+
+
+def test_get_dirty_products_id_ranges_more_parts_than_products(product_list):
+    # given
+    first_product, second_product, third_product = product_list
+    Product.objects.update(search_index_dirty=False)
+    Product.objects.filter(pk=second_product.pk).update(search_index_dirty=True)
+
+    # when
+    id_ranges = get_dirty_products_id_ranges(4)
+
+    # then
+    assert id_ranges == [(second_product.pk, None)]
+
+
+def test_get_dirty_products_id_ranges_no_dirty_products(product_list):
+    # given
+    Product.objects.update(search_index_dirty=False)
+
+    # when
+    id_ranges = get_dirty_products_id_ranges(4)
+
+    # then
+    assert id_ranges == []
@@ -10,9 +10,10 @@ from django.utils import timezone
 
 from ...discount import RewardValueType
 from ...discount.models import Promotion, PromotionRule
-from ..models import ProductChannelListing, ProductVariantChannelListing
+from ..models import Product, ProductChannelListing, ProductVariantChannelListing
 from ..tasks import (
     _get_preorder_variants_to_clean,
+    update_dirty_products_search_vector_in_parallel_task,
     update_discounted_prices_task,
     update_products_discounted_prices_for_promotion_task,
     update_products_discounted_prices_of_promotion_task,
@@ -21,9 +22,9 @@ from ..tasks import (
 )
 
 
-@patch("saleor.product.tasks.update_discounted_prices_task.delay")
+@patch("saleor.product.tasks.update_dirty_products_discounted_prices_task.delay")
 def test_update_products_discounted_prices_of_promotion_task(
-    update_discounted_prices_task_mock,
+    update_dirty_products_discounted_prices_task_mock,
     product,
 ):
     # given
@@ -46,11 +47,10 @@ def test_update_products_discounted_prices_of_promotion_task(
     update_products_discounted_prices_of_promotion_task(promotion.id)
 
     # then
-    update_discounted_prices_task_mock.assert_called_once()
-    args, kwargs = update_discounted_prices_task_mock.call_args
-
-    assert len(args[0]) == 1
-    assert {id for id in args[0]} == {product.id}
+    update_dirty_products_discounted_prices_task_mock.assert_called_once()
+    assert list(
+        Product.objects.filter(discounted_price_dirty=True).values_list("id", flat=True)
+    ) == [product.id]
 
 
 @patch(
@@ -91,10 +91,19 @@ def test_update_products_discounted_prices_for_promotion_task(
     update_products_discounted_prices_for_promotion_task(product_ids)
 
     # then
-    update_discounted_prices_task_mock.assert_called_once_with(product_ids)
     assert set(
         PromotionRuleVariant.objects.values_list("promotionrule_id", flat=True)
     ) == set(PromotionRule.objects.values_list("id", flat=True))
+    # products added to the rules are updated as well
+    rule_product_ids = set(
+        PromotionRuleVariant.objects.values_list(
+            "productvariant__product_id", flat=True
+        )
+    )
+    update_discounted_prices_task_mock.assert_called_once()
+    args, _kwargs = update_discounted_prices_task_mock.call_args
+    assert args[0][: len(product_ids)] == product_ids
+    assert set(args[0]) == set(product_ids) | rule_product_ids
 
 
 @patch("saleor.product.tasks.PROMOTION_RULE_BATCH_SIZE", 1)
@@ -123,10 +132,17 @@ def test_update_products_discounted_prices_for_promotion_task_with_rules_id(
     )
 
     # then
-    update_discounted_prices_task_mock.assert_called_once_with(product_ids)
     assert set(
         PromotionRuleVariant.objects.values_list("promotionrule_id", flat=True)
     ) == {rule_id}
+    rule_product_ids = set(
+        PromotionRuleVariant.objects.values_list(
+            "productvariant__product_id", flat=True
+        )
+    )
+    update_discounted_prices_task_mock.assert_called_once()
+    args, _kwargs = update_discounted_prices_task_mock.call_args
+    assert set(args[0]) == set(product_ids) | rule_product_ids
 
 
 @patch("saleor.product.tasks.DISCOUNTED_PRODUCT_BATCH", 1)
@@ -146,6 +162,25 @@ def test_update_discounted_prices_task(
     assert not ProductVariantChannelListing.objects.filter(
         discounted_price_amount=0
     ).exists()
+    assert not Product.objects.filter(discounted_price_dirty=True).exists()
+
+
+@patch("saleor.product.tasks.update_dirty_products_discounted_prices_task.delay")
+def test_update_discounted_prices_task_deduplicates_queued_products(
+    update_dirty_products_discounted_prices_task_mock, product_list
+):
+    # given
+    ids = [product.id for product in product_list]
+
+    # when
+    update_discounted_prices_task(ids[:2])
+    update_discounted_prices_task(ids)
+
+    # then
+    assert update_dirty_products_discounted_prices_task_mock.call_count == 2
+    assert set(
+        Product.objects.filter(discounted_price_dirty=True).values_list("id", flat=True)
+    ) == set(ids)
 
 
 @patch("saleor.product.tasks._update_variants_names")
@@ -209,6 +244,18 @@ def test_update_products_search_vector_task(product):
     assert product.search_index_dirty is False
 
 
+def test_update_dirty_products_search_vector_in_parallel_task(product_list):
+    # given
+    Product.objects.update(search_vector=None, search_index_dirty=True)
+
+    # when
+    update_dirty_products_search_vector_in_parallel_task(2)
+
+    # then
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+    assert not Product.objects.filter(search_vector=None).exists()
+
+
 @pytest.mark.slow
 @pytest.mark.limit_memory("50 MB")
 def test_mem_usage_update_products_discounted_prices(lots_of_products_with_variants):
@@ -1,27 +1,99 @@
 from collections import defaultdict
-from decimal import Decimal
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
 from uuid import UUID
 
+from babel.numbers import get_currency_precision
 from django.db import transaction
-from django.db.models import Exists, OuterRef
-from prices import Money
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
 
 from ...channel.models import Channel
-from ...core.taxes import zero_money
-from ...discount import PromotionRuleInfo
+from ...discount import PromotionRuleInfo, RewardValueType
 from ...discount.models import PromotionRule
-from ...discount.utils import (
-    calculate_discounted_price_for_promotions,
-    get_variants_to_promotions_map,
-)
+from ...discount.utils import get_variants_to_promotions_map
 from ..managers import ProductsQueryset, ProductVariantQueryset
 from ..models import (
+    Product,
     ProductChannelListing,
     ProductVariant,
     ProductVariantChannelListing,
     VariantChannelListingPromotionRule,
 )
 
+# Products claimed for a longer time are considered abandoned by a killed worker and
+# are taken by the next batch.
+DISCOUNTED_PRICE_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+def mark_products_discounted_prices_dirty(product_ids: Iterable[int]) -> int:
+    """Queue the products for the discounted prices recalculation.
+
+    Products already waiting in the queue are skipped, so marking them again is
+    cheap. Products claimed by a running update are released, so they are updated
+    once more in a later batch. Return the number of queued products.
+    """
+    return (
+        Product.objects.filter(id__in=product_ids)
+        .filter(
+            Q(discounted_price_dirty=False)
+            | Q(discounted_price_claimed_at__isnull=False)
+        )
+        .update(discounted_price_dirty=True, discounted_price_claimed_at=None)
+    )
+
+
+def get_dirty_products_discounted_prices_count() -> int:
+    """Return the number of products waiting for the discounted prices update."""
+    return Product.objects.filter(discounted_price_dirty=True).count()
+
+
+def update_dirty_products_discounted_prices(batch_size: int) -> int:
+    """Update the discounted prices of the next batch of queued products.
+
+    Products are claimed in the order of ids, with `SKIP LOCKED`, so several workers
+    can drain the queue at once without taking the same products. They leave the
+    queue only once their prices are updated; claims of a worker killed in the
+    middle of the update expire after `DISCOUNTED_PRICE_CLAIM_TIMEOUT`.
+    Products queued again during the update are updated once more in a later batch.
+    Return the number of updated products.
+    """
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        product_ids = list(
+            Product.objects.filter(discounted_price_dirty=True)
+            .filter(
+                Q(discounted_price_claimed_at__isnull=True)
+                | Q(
+                    discounted_price_claimed_at__lt=claimed_at
+                    - DISCOUNTED_PRICE_CLAIM_TIMEOUT
+                )
+            )
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+        Product.objects.filter(id__in=product_ids).update(
+            discounted_price_claimed_at=claimed_at
+        )
+    if not product_ids:
+        return 0
+    claimed_products = Product.objects.filter(
+        id__in=product_ids, discounted_price_claimed_at=claimed_at
+    )
+    try:
+        update_discounted_prices_for_promotion(
+            Product.objects.filter(id__in=product_ids)
+        )
+    except Exception:
+        claimed_products.update(discounted_price_claimed_at=None)
+        raise
+    claimed_products.update(
+        discounted_price_dirty=False, discounted_price_claimed_at=None
+    )
+    return len(product_ids)
+
 
 def update_discounted_prices_for_promotion(products: ProductsQueryset):
     """Update Products and ProductVariants discounted prices.
@@ -31,48 +103,54 @@ def update_discounted_prices_for_promotion(products: ProductsQueryset):
     If there is no applied promotion rule, the discounted price for the product
     is equal to the cheapest variant price, in the case of the variant it's equal
     to the variant price.
+
+    Channels, listings and rules of the whole batch are fetched upfront, the prices
+    are computed per channel and currency, and only the changed rows are saved.
     """
     variant_qs = ProductVariant.objects.filter(
         Exists(products.filter(id=OuterRef("product_id")))
     )
     rules_info_per_variant_and_promotion_id = get_variants_to_promotions_map(variant_qs)
-    product_to_variant_listings_per_channel_map = (
-        _get_product_to_variant_channel_listings_per_channel_map(variant_qs)
-    )
+    (
+        variant_listings_per_channel_and_currency_map,
+        variant_to_product_id,
+    ) = _get_variant_channel_listings_per_channel_and_currency_map(variant_qs)
     variant_listing_to_listing_rule_per_rule_map = (
         _get_variant_listings_to_listing_rule_per_rule_id_map(variant_qs)
     )
+    channel_currency_map = dict(
+        Channel.objects.filter(
+            id__in={
+                channel_id
+                for channel_id, _ in variant_listings_per_channel_and_currency_map
+            }
+        ).values_list("id", "currency_code")
+    )
 
-    changed_products_listings_to_update = []
     changed_variants_listings_to_update = []
-
     changed_variant_listing_promotion_rule_to_create = []
     changed_variant_listing_promotion_rule_to_update = []
+    variant_listing_promotion_rule_ids_to_delete = []
 
-    product_channel_listings = ProductChannelListing.objects.filter(
-        Exists(products.filter(id=OuterRef("product_id")))
-    )
-    for product_channel_listing in product_channel_listings:
-        product_id = product_channel_listing.product_id
-        channel_id = product_channel_listing.channel_id
-        variant_listings = product_to_variant_listings_per_channel_map[product_id][
-            channel_id
-        ]
-        if not variant_listings:
-            continue
+    product_discounted_prices: dict[tuple[int, int], Decimal] = {}
+    for (
+        channel_id,
+        currency,
+    ), variant_listings in variant_listings_per_channel_and_currency_map.items():
         (
             discounted_variants_price,
             variant_listings_to_update,
             variant_listing_promotion_rule_to_create,
             variant_listing_promotion_rule_to_update,
+            variant_listing_promotion_rule_to_delete,
         ) = _get_discounted_variants_prices_for_promotions(
             variant_listings,
             rules_info_per_variant_and_promotion_id,
-            product_channel_listing.channel,
+            channel_id,
+            currency,
+            channel_currency_map[channel_id],
             variant_listing_to_listing_rule_per_rule_map,
         )
-
-        product_discounted_price = min(discounted_variants_price)
         changed_variants_listings_to_update.extend(variant_listings_to_update)
         changed_variant_listing_promotion_rule_to_create.extend(
             variant_listing_promotion_rule_to_create
@@ -80,14 +158,40 @@ def update_discounted_prices_for_promotion(products: ProductsQueryset):
         changed_variant_listing_promotion_rule_to_update.extend(
             variant_listing_promotion_rule_to_update
         )
+        variant_listing_promotion_rule_ids_to_delete.extend(
+            variant_listing_promotion_rule_to_delete
+        )
+        for variant_listing, discounted_price in zip(
+            variant_listings, discounted_variants_price
+        ):
+            key = (variant_to_product_id[variant_listing.variant_id], channel_id)
+            if key not in product_discounted_prices:
+                product_discounted_prices[key] = discounted_price
+            else:
+                product_discounted_prices[key] = min(
+                    product_discounted_prices[key], discounted_price
+                )
 
+    changed_products_listings_to_update = []
+    product_channel_listings = ProductChannelListing.objects.filter(
+        Exists(products.filter(id=OuterRef("product_id")))
+    )
+    for product_channel_listing in product_channel_listings:
+        product_discounted_price = product_discounted_prices.get(
+            (product_channel_listing.product_id, product_channel_listing.channel_id)
+        )
+        if product_discounted_price is None:
+            continue
         # check if the product discounted_price has changed
-        if product_channel_listing.discounted_price != product_discounted_price:
-            product_channel_listing.discounted_price_amount = (
-                product_discounted_price.amount
-            )
+        if product_channel_listing.discounted_price_amount != product_discounted_price:
+            product_channel_listing.discounted_price_amount = product_discounted_price
             changed_products_listings_to_update.append(product_channel_listing)
 
+    # delete variant listing - promotion rules relations that are not valid anymore
+    if variant_listing_promotion_rule_ids_to_delete:
+        VariantChannelListingPromotionRule.objects.filter(
+            id__in=variant_listing_promotion_rule_ids_to_delete
+        ).delete()
     _update_or_create_listings(
         changed_products_listings_to_update,
         changed_variants_listings_to_update,
@@ -96,6 +200,84 @@ def update_discounted_prices_for_promotion(products: ProductsQueryset):
     )
 
 
+def calculate_discounted_prices(
+    prices: list[Decimal],
+    variant_ids: list[int],
+    rules_info_per_variant_and_promotion_id: dict[
+        int, dict[UUID, list[PromotionRuleInfo]]
+    ],
+    channel_id: int,
+    currency: str,
+) -> tuple[list[Decimal], list[list[tuple[UUID, Decimal]]]]:
+    """Return the discounted prices and the applied rule discounts of the variants.
+
+    Variants are given as columns of prices and ids of a single channel and currency.
+    The discount of each rule is prepared once per call and applied to plain
+    amounts. For every variant, the promotion that gives the best saving is applied,
+    with the rule discounts capped to the remaining price.
+    """
+    rule_discounts: dict[UUID, Callable[[Decimal], Decimal]] = {}
+    discounted_prices: list[Decimal] = []
+    applied_discounts: list[list[tuple[UUID, Decimal]]] = []
+    for price, variant_id in zip(prices, variant_ids):
+        rules_info_per_promotion_id = rules_info_per_variant_and_promotion_id.get(
+            variant_id
+        )
+        if not rules_info_per_promotion_id:
+            discounted_prices.append(price)
+            applied_discounts.append([])
+            continue
+
+        best_discounts: list[tuple[UUID, Decimal]] = []
+        best_total = None
+        for rules_info in rules_info_per_promotion_id.values():
+            discounts = []
+            for rule_info in rules_info:
+                if channel_id not in rule_info.channel_ids:
+                    continue
+                rule = rule_info.rule
+                if rule.id not in rule_discounts:
+                    rule_discounts[rule.id] = _get_rule_discount(rule, currency)
+                discounts.append((rule.id, rule_discounts[rule.id](price)))
+            total = sum(discount for _, discount in discounts)
+            if best_total is None or total > best_total:
+                best_discounts, best_total = discounts, total
+
+        discounted_price = price
+        variant_discounts = []
+        for rule_id, discount in best_discounts:
+            if discounted_price < discount:
+                discount = discounted_price
+                discounted_price = Decimal(0)
+            else:
+                discounted_price -= discount
+            variant_discounts.append((rule_id, discount))
+            if discounted_price == 0:
+                break
+        discounted_prices.append(discounted_price)
+        applied_discounts.append(variant_discounts)
+    return discounted_prices, applied_discounts
+
+
+def _get_rule_discount(
+    rule: PromotionRule, currency: str
+) -> Callable[[Decimal], Decimal]:
+    """Return the function calculating the rule discount amount for a price amount.
+
+    The result is equal to `price - rule.get_discount(currency)(price)`.
+    """
+    reward_value = rule.reward_value
+    if rule.reward_value_type == RewardValueType.FIXED:
+        return lambda price: min(price, reward_value)
+    if rule.reward_value_type == RewardValueType.PERCENTAGE:
+        fraction = Decimal(reward_value) / 100
+        exp = Decimal("0.1") ** get_currency_precision(currency)
+        return lambda price: min(
+            price, (price * fraction).quantize(exp, rounding=ROUND_HALF_UP)
+        )
+    raise NotImplementedError("Unknown discount type")
+
+
 def _update_or_create_listings(
     changed_products_listings_to_update: list[ProductChannelListing],
     changed_variants_listings_to_update: list[ProductVariantChannelListing],
@@ -161,9 +343,13 @@ def _create_variant_listing_promotion_rule(variant_listing_promotion_rule_to_cre
         )
 
 
-def _get_product_to_variant_channel_listings_per_channel_map(
+def _get_variant_channel_listings_per_channel_and_currency_map(
     variants: ProductVariantQueryset,
-):
+) -> tuple[dict[tuple[int, str], list[ProductVariantChannelListing]], dict[int, int]]:
+    """Return the priced variant listings per channel and currency.
+
+    The variant to product id map is returned alongside.
+    """
     variant_channel_listings = ProductVariantChannelListing.objects.filter(
         Exists(variants.filter(id=OuterRef("variant_id"))), price_amount__isnull=False
     )
@@ -174,15 +360,14 @@ def _get_product_to_variant_channel_listings_per_channel_map(
         ).iterator()
     }
 
-    price_data: dict[int, dict[int, list[Money]]] = defaultdict(
-        lambda: defaultdict(list)
-    )
+    listings_data: dict[
+        tuple[int, str], list[ProductVariantChannelListing]
+    ] = defaultdict(list)
     for variant_channel_listing in variant_channel_listings.iterator():
-        product_id = variant_to_product_id[variant_channel_listing.variant_id]
-        price_data[product_id][variant_channel_listing.channel_id].append(
-            variant_channel_listing
-        )
-    return price_data
+        listings_data[
+            (variant_channel_listing.channel_id, variant_channel_listing.currency)
+        ].append(variant_channel_listing)
+    return listings_data, variant_to_product_id
 
 
 def _get_variant_listings_to_listing_rule_per_rule_id_map(
@@ -221,87 +406,85 @@ def _get_discounted_variants_prices_for_promotions(
     rules_info_per_variant_and_promotion_id: dict[
         int, dict[UUID, list[PromotionRuleInfo]]
     ],
-    channel: Channel,
+    channel_id: int,
+    currency: str,
+    channel_currency: str,
     variant_listing_to_listing_rule_per_rule_map: dict,
 ) -> tuple[
-    Money,
+    list[Decimal],
     list[ProductVariantChannelListing],
     list[VariantChannelListingPromotionRule],
     list[VariantChannelListingPromotionRule],
+    list[int],
 ]:
     variants_listings_to_update: list[ProductVariantChannelListing] = []
-    discounted_variants_price: list[Money] = []
     variant_listing_promotion_rule_to_create: list[
         VariantChannelListingPromotionRule
     ] = []
     variant_listing_promotion_rule_to_update: list[
         VariantChannelListingPromotionRule
     ] = []
-    for variant_listing in variant_listings:
-        applied_discounts = calculate_discounted_price_for_promotions(
-            price=variant_listing.price,
-            rules_info_per_variant_and_promotion_id=(
-                rules_info_per_variant_and_promotion_id
-            ),
-            channel=channel,
-            variant_id=variant_listing.variant_id,
+    variant_listing_promotion_rule_to_delete: list[int] = []
+
+    discounted_variants_price, applied_discounts = calculate_discounted_prices(
+        [variant_listing.price_amount for variant_listing in variant_listings],
+        [variant_listing.variant_id for variant_listing in variant_listings],
+        rules_info_per_variant_and_promotion_id,
+        channel_id,
+        currency,
+    )
+    for variant_listing, discounted_variant_price, variant_discounts in zip(
+        variant_listings, discounted_variants_price, applied_discounts
+    ):
+        listing_promotion_rules = variant_listing_to_listing_rule_per_rule_map.get(
+            variant_listing.id, {}
         )
-        rule_ids = []
-        discounted_variant_price = variant_listing.price
-        for rule_id, discount in applied_discounts:
-            if discounted_variant_price.amount < discount.amount:
-                discount = discounted_variant_price
-                discounted_variant_price = zero_money(discounted_variant_price.currency)
-            else:
-                discounted_variant_price -= discount
+        for rule_id, discount_amount in variant_discounts:
             _handle_discount_rule_id(
                 variant_listing,
                 rule_id,
-                variant_listing_to_listing_rule_per_rule_map,
-                discount.amount,
-                channel.currency_code,
+                listing_promotion_rules,
+                discount_amount,
+                channel_currency,
                 variant_listing_promotion_rule_to_update,
                 variant_listing_promotion_rule_to_create,
             )
-            rule_ids.append(rule_id)
-            if discounted_variant_price.amount == 0:
-                break
 
-        if variant_listing.discounted_price != discounted_variant_price:
-            variant_listing.discounted_price_amount = discounted_variant_price.amount
-            variants_listings_to_update.append(variant_listing)
-
-            # delete variant listing - promotion rules relations that are not valid
-            # anymore
-            VariantChannelListingPromotionRule.objects.filter(
-                variant_channel_listing_id=variant_listing.id
-            ).exclude(promotion_rule_id__in=rule_ids).delete()
+        # variant listing - promotion rules relations that are not valid anymore
+        applied_rule_ids = {rule_id for rule_id, _ in variant_discounts}
+        variant_listing_promotion_rule_to_delete.extend(
+            listing_promotion_rule.id
+            for rule_id, listing_promotion_rule in listing_promotion_rules.items()
+            if rule_id not in applied_rule_ids
+        )
 
-        discounted_variants_price.append(discounted_variant_price)
+        if variant_listing.discounted_price_amount != discounted_variant_price:
+            variant_listing.discounted_price_amount = discounted_variant_price
+            variants_listings_to_update.append(variant_listing)
 
     return (
         discounted_variants_price,
         variants_listings_to_update,
         variant_listing_promotion_rule_to_create,
         variant_listing_promotion_rule_to_update,
+        variant_listing_promotion_rule_to_delete,
     )
 
 
 def _handle_discount_rule_id(
     variant_listing: ProductVariantChannelListing,
     rule_id: UUID,
-    variant_listing_to_listing_rule_per_rule_map: dict,
+    listing_promotion_rules: dict[UUID, VariantChannelListingPromotionRule],
     discount_amount: Decimal,
     currency: str,
     variant_listing_promotion_rule_to_update: list[VariantChannelListingPromotionRule],
     variant_listing_promotion_rule_to_create: list[VariantChannelListingPromotionRule],
 ):
-    listing_promotion_rule = variant_listing_to_listing_rule_per_rule_map[
-        variant_listing.id
-    ].get(rule_id)
+    listing_promotion_rule = listing_promotion_rules.get(rule_id)
     if listing_promotion_rule:
-        listing_promotion_rule.discount_amount = discount_amount
-        variant_listing_promotion_rule_to_update.append(listing_promotion_rule)
+        if listing_promotion_rule.discount_amount != discount_amount:
+            listing_promotion_rule.discount_amount = discount_amount
+            variant_listing_promotion_rule_to_update.append(listing_promotion_rule)
     else:
         variant_listing_promotion_rule_to_create.append(
             VariantChannelListingPromotionRule(
@@ -1,7 +1,8 @@
 from collections.abc import Iterable
 from typing import TYPE_CHECKING, Optional
 
-from django.db import transaction
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
 from django.db.models import Exists, OuterRef, QuerySet
 
 from ...attribute import AttributeType
@@ -54,27 +55,56 @@ def get_variant_selection_attributes(
 
 def fetch_variants_for_promotion_rules(
     rules: QuerySet[PromotionRule],
-):
+) -> set[int]:
+    """Assign the variants matching the catalogue predicate to the promotion rules.
+
+    The assigned variants are compared with the predicate in the database and only
+    the missing ones are added and the stale ones are removed, without loading the
+    variant ids. Return the ids of the products which variants were added or
+    removed, as only their discounted prices are affected.
+    """
     from ...graphql.discount.utils import get_variants_for_predicate
 
     PromotionRuleVariant = PromotionRule.variants.through
-    promotion_rule_variants = []
-    for rule in list(rules.iterator()):
-        variants = get_variants_for_predicate(rule.catalogue_predicate)
-        promotion_rule_variants.extend(
-            [
-                PromotionRuleVariant(
-                    promotionrule_id=rule.pk, productvariant_id=variant_id
-                )
-                for variant_id in set(variants.values_list("pk", flat=True))
-            ]
-        )
-
+    changed_product_ids: set[int] = set()
     with transaction.atomic():
-        # Clear existing variants assigned to promotion rules
-        PromotionRuleVariant.objects.filter(
-            Exists(rules.filter(pk=OuterRef("promotionrule_id")))
-        ).delete()
-        PromotionRuleVariant.objects.bulk_create(
-            promotion_rule_variants, ignore_conflicts=True
+        for rule in list(rules.iterator()):
+            variants = get_variants_for_predicate(rule.catalogue_predicate)
+            rule_variants = PromotionRuleVariant.objects.filter(
+                promotionrule_id=rule.pk
+            )
+            stale_rule_variants = rule_variants.exclude(
+                Exists(variants.filter(pk=OuterRef("productvariant_id")))
+            )
+            missing_variants = variants.exclude(
+                Exists(rule_variants.filter(productvariant_id=OuterRef("pk")))
+            ).order_by()
+            changed_product_ids.update(
+                stale_rule_variants.order_by()
+                .values_list("productvariant__product_id", flat=True)
+                .distinct()
+            )
+            changed_product_ids.update(
+                missing_variants.values_list("product_id", flat=True).distinct()
+            )
+            stale_rule_variants.delete()
+            _add_promotion_rule_variants(rule.pk, missing_variants)
+    return changed_product_ids
+
+
+def _add_promotion_rule_variants(rule_pk, variants: QuerySet[ProductVariant]):
+    """Assign the variants to the promotion rule with a single `INSERT ... SELECT`."""
+    try:
+        variants_query, params = variants.values("pk").query.sql_with_params()
+    except EmptyResultSet:
+        return
+    table = PromotionRule.variants.through._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (promotionrule_id, productvariant_id)
+            SELECT %s, variants.id FROM ({variants_query}) AS variants
+            ON CONFLICT DO NOTHING
+            """,
+            [rule_pk, *params],
         )
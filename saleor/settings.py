@@ -505,6 +505,14 @@ PLACEHOLDER_IMAGES = {
     4096: "images/placeholder4096.png",
 }
 
+# When enabled, thumbnails of uploaded product media and category background images
+# are created in all sizes and formats by a Celery task, before they are requested.
+THUMBNAIL_PREWARM_ENABLED = get_bool_from_env("THUMBNAIL_PREWARM_ENABLED", False)
+# Concurrent requests for the same missing thumbnail are redirected to the original
+# image while the first one creates it. The lock is kept in the cache (`CACHE_URL`)
+# and expires after this time, in case its holder dies.
+THUMBNAIL_LOCK_TIMEOUT = parse(os.environ.get("THUMBNAIL_LOCK_TIMEOUT", "30 seconds"))
+
 
 AUTHENTICATION_BACKENDS = [
     "saleor.core.auth_backend.JSONWebTokenBackend",
@@ -526,6 +534,10 @@ EMPTY_CHECKOUTS_TIMEDELTA = timedelta(
 EXPORT_FILES_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("EXPORT_FILES_TIMEDELTA", "30 days"))
 )
+# When `True`, exported CSV files are compressed with gzip (saved as `.csv.gz`).
+EXPORT_FILES_CSV_GZIP_ENABLED: bool = get_bool_from_env(
+    "EXPORT_FILES_CSV_GZIP_ENABLED", False
+)
 
 # CELERY SETTINGS
 CELERY_TIMEZONE = TIME_ZONE
@@ -558,6 +570,14 @@ BEAT_UPDATE_SEARCH_SEC = parse(
 )
 BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC = BEAT_UPDATE_SEARCH_SEC
 
+# Defines how often the products queued for the discounted prices update are
+# updated by the Celery beat entry 'update-products-discounted-prices', in case
+# the update started with the queueing didn't finish, e.g. on a worker restart.
+BEAT_UPDATE_DISCOUNTED_PRICES_SEC = parse(
+    os.environ.get("BEAT_UPDATE_DISCOUNTED_PRICES_FREQUENCY", "1 minute")
+)
+BEAT_UPDATE_DISCOUNTED_PRICES_EXPIRE_AFTER_SEC = BEAT_UPDATE_DISCOUNTED_PRICES_SEC
+
 # Defines the Celery beat scheduler entries.
 #
 # Note: if a Celery task triggered by a Celery beat entry has an expiration
@@ -597,6 +617,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
         "schedule": crontab(hour=0, minute=0),
     },
+    "delete-expired-persisted-queries": {
+        "task": "saleor.core.tasks.delete_expired_persisted_queries_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
     "delete-old-export-files": {
         "task": "saleor.csv.tasks.delete_old_export_files",
         "schedule": crontab(hour=1, minute=0),
@@ -610,6 +634,11 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": timedelta(seconds=BEAT_UPDATE_SEARCH_SEC),
         "options": {"expires": BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC},
     },
+    "update-products-discounted-prices": {
+        "task": "saleor.product.tasks.update_dirty_products_discounted_prices_task",
+        "schedule": timedelta(seconds=BEAT_UPDATE_DISCOUNTED_PRICES_SEC),
+        "options": {"expires": BEAT_UPDATE_DISCOUNTED_PRICES_EXPIRE_AFTER_SEC},
+    },
     "update-gift-cards-search-vectors": {
         "task": "saleor.giftcard.tasks.update_gift_cards_search_vector_task",
         "schedule": timedelta(seconds=BEAT_UPDATE_SEARCH_SEC),
@@ -659,6 +688,16 @@ OBSERVABILITY_BUFFER_SIZE_LIMIT = int(
 OBSERVABILITY_BUFFER_BATCH_SIZE = int(
     os.environ.get("OBSERVABILITY_BUFFER_BATCH_SIZE", 100)
 )
+# Events are staged in the process memory and put into the buffer in batches of
+# this size, or `OBSERVABILITY_BUFFER_FLUSH_INTERVAL` after the first event was
+# staged, instead of with a request to the broker for each event.
+# Set OBSERVABILITY_BUFFER_FLUSH_SIZE=0 in env to put events one by one (default).
+OBSERVABILITY_BUFFER_FLUSH_SIZE = int(
+    os.environ.get("OBSERVABILITY_BUFFER_FLUSH_SIZE", 0)
+)
+OBSERVABILITY_BUFFER_FLUSH_INTERVAL = parse(
+    os.environ.get("OBSERVABILITY_BUFFER_FLUSH_INTERVAL", "1 second")
+)
 OBSERVABILITY_REPORT_PERIOD = timedelta(
     seconds=parse(os.environ.get("OBSERVABILITY_REPORT_PERIOD", "20 seconds"))
 )
@@ -718,6 +757,92 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# Time for which the responses to the introspection queries are kept in the cache
+# (`CACHE_URL`). Responses are cached by the schema version, so they are not served
+# after the schema changes. Use the `cache_introspection` command to cache them
+# before the deployment receives traffic.
+GRAPHQL_INTROSPECTION_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_INTROSPECTION_CACHE_TIMEOUT", "7 days")
+)
+
+# The `totalCount` of connections is the query planner estimate, instead of the exact
+# count, when the estimate is at least this number of objects. Estimates are cheap,
+# but can be off by a large margin for selective filters.
+# Set GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD=0 in env to always count (default).
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 0)
+)
+# Time for which the exact `totalCount` of connections is kept in the cache
+# (`CACHE_URL`), by the filtered query. Counts aren't invalidated by changes, so
+# they can be outdated for this time.
+# Set GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT=0 in env to disable the cache (default).
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", "0 seconds")
+)
+
+# Max number of parsed and validated GraphQL documents, and of their computed query
+# costs, kept in memory by each worker process.
+# Set GRAPHQL_DOCUMENT_CACHE_SIZE=0 in env to disable the cache.
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+
+# Data loaders of rarely changing models, like channels, warehouses or categories,
+# keep the loaded values between the requests, in the process memory or in the
+# shared cache (`CACHE_URL`). Values are dropped when the models are saved or
+# deleted, through versions kept in the shared cache, which must be shared by all
+# processes when the cache is enabled. Values missing in the cache are loaded from
+# the writer database, not from the replica. Values are kept at most for
+# `DATALOADER_CACHE_TIMEOUT`.
+DATALOADER_CACHE_ENABLED: bool = get_bool_from_env("DATALOADER_CACHE_ENABLED", False)
+DATALOADER_CACHE_TIMEOUT = parse(
+    os.environ.get("DATALOADER_CACHE_TIMEOUT", "5 minutes")
+)
+
+# Data loaders record the number of batches, the keys per batch, the time and the
+# database queries of each batch. Statistics of each request are added to the
+# `graphql_query` tracing span. A loader that dispatches at least
+# `DATALOADER_UNBATCHED_THRESHOLD` single-key batches in one request is logged as
+# a warning, as its resolvers load the values one by one.
+# Set DATALOADER_UNBATCHED_THRESHOLD=0 in env to disable the warnings.
+DATALOADER_STATS_ENABLED: bool = get_bool_from_env("DATALOADER_STATS_ENABLED", False)
+DATALOADER_UNBATCHED_THRESHOLD = int(
+    os.environ.get("DATALOADER_UNBATCHED_THRESHOLD", 10)
+)
+
+# Max number of verified app tokens kept in memory by each process, so the slow
+# password hash of an app token is not checked on every request. Verified tokens
+# are kept for `APP_TOKEN_CACHE_TIMEOUT`. When `APP_TOKEN_SHARED_CACHE_ENABLED` is
+# `True`, verified tokens are also stored in the shared cache (`CACHE_URL`).
+# Set APP_TOKEN_CACHE_SIZE=0 in env to disable the in-memory cache.
+APP_TOKEN_CACHE_SIZE = int(os.environ.get("APP_TOKEN_CACHE_SIZE", 1000))
+APP_TOKEN_CACHE_TIMEOUT = parse(os.environ.get("APP_TOKEN_CACHE_TIMEOUT", "5 minutes"))
+APP_TOKEN_SHARED_CACHE_ENABLED: bool = get_bool_from_env(
+    "APP_TOKEN_SHARED_CACHE_ENABLED", False
+)
+
+# Max number of decoded access tokens kept in memory by each process, together with
+# the permissions of their users, so the token signature is not verified and the
+# permissions are not resolved on every request. Tokens are kept until they expire.
+# Permission changes are propagated through the shared cache (`CACHE_URL`), which
+# must be shared by all processes when the cache is enabled.
+# Set JWT_CACHE_SIZE=0 in env to disable the cache (default).
+JWT_CACHE_SIZE = int(os.environ.get("JWT_CACHE_SIZE", 0))
+
+# Automatic persisted queries - clients can send the SHA-256 hash of a query
+# instead of the full query string. Queries are kept in the store defined by
+# `PERSISTED_QUERY_STORE_PATH`, which can be
+# `saleor.graphql.core.persisted_queries.CachePersistedQueryStore` (default) or
+# `saleor.graphql.core.persisted_queries.DatabasePersistedQueryStore`.
+# Queries are registered only after they are validated and expire after
+# `PERSISTED_QUERY_CACHE_TIMEOUT` in both stores.
+PERSISTED_QUERIES_ENABLED = get_bool_from_env("PERSISTED_QUERIES_ENABLED", True)
+PERSISTED_QUERY_STORE_PATH = os.environ.get(
+    "PERSISTED_QUERY_STORE_PATH",
+    "saleor.graphql.core.persisted_queries.CachePersistedQueryStore",
+)
+PERSISTED_QUERY_CACHE_TIMEOUT = parse(
+    os.environ.get("PERSISTED_QUERY_CACHE_TIMEOUT", "1 day")
+)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -755,6 +880,15 @@ for entry_point in installed_plugins:
 
 PLUGINS = BUILTIN_PLUGINS + EXTERNAL_PLUGINS
 
+# When `True`, channels and plugin configurations used by the plugins manager are
+# cached in the process memory. The cache is invalidated when a channel or a plugin
+# configuration is changed, through a version kept in the shared cache (`CACHE_URL`),
+# which must be shared by all processes, including Celery workers, when the cache
+# is enabled.
+PLUGINS_CONFIGURATION_CACHE_ENABLED = get_bool_from_env(
+    "PLUGINS_CONFIGURATION_CACHE_ENABLED", False
+)
+
 # Default timeout (sec) for establishing a connection when performing external requests.
 REQUESTS_CONN_EST_TIMEOUT = 2
 
@@ -766,6 +900,41 @@ COMMON_REQUESTS_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 WEBHOOK_TIMEOUT = 10
 WEBHOOK_SYNC_TIMEOUT = COMMON_REQUESTS_TIMEOUT
 
+# When `True`, sync webhooks of events where the first valid response is used
+# (e.g., taxes calculation) are sent concurrently instead of one after another.
+# `WEBHOOK_SYNC_MAX_WORKERS` limits the number of concurrent requests of one event.
+# Responses are awaited at most for the sum of the `WEBHOOK_SYNC_TIMEOUT` timeouts.
+WEBHOOK_SYNC_CONCURRENT_ENABLED: bool = get_bool_from_env(
+    "WEBHOOK_SYNC_CONCURRENT_ENABLED", False
+)
+WEBHOOK_SYNC_MAX_WORKERS = int(os.environ.get("WEBHOOK_SYNC_MAX_WORKERS", 16))
+
+# When `True`, async webhook deliveries triggered during a GraphQL request are sent
+# in batches of `WEBHOOK_BATCH_DELIVERY_SIZE` deliveries by a single Celery task,
+# instead of one task per delivery.
+WEBHOOK_BATCH_DELIVERY_ENABLED: bool = get_bool_from_env(
+    "WEBHOOK_BATCH_DELIVERY_ENABLED", False
+)
+WEBHOOK_BATCH_DELIVERY_SIZE = int(os.environ.get("WEBHOOK_BATCH_DELIVERY_SIZE", 100))
+# Number of requests sent concurrently by a single batch delivery task, in total
+# and to the same target host.
+WEBHOOK_BATCH_DELIVERY_MAX_WORKERS = int(
+    os.environ.get("WEBHOOK_BATCH_DELIVERY_MAX_WORKERS", 16)
+)
+WEBHOOK_BATCH_DELIVERY_TARGET_CONCURRENCY = int(
+    os.environ.get("WEBHOOK_BATCH_DELIVERY_TARGET_CONCURRENCY", 4)
+)
+
+# When `True`, HTTP webhook requests reuse keep-alive connections of sessions pooled
+# per target origin, instead of opening a new connection for every request.
+# `WEBHOOK_HTTP_POOL_SIZE` limits the connections kept to a single origin, and
+# sessions unused for `WEBHOOK_HTTP_POOL_IDLE_TIMEOUT` are closed.
+WEBHOOK_HTTP_KEEP_ALIVE: bool = get_bool_from_env("WEBHOOK_HTTP_KEEP_ALIVE", False)
+WEBHOOK_HTTP_POOL_SIZE = int(os.environ.get("WEBHOOK_HTTP_POOL_SIZE", 10))
+WEBHOOK_HTTP_POOL_IDLE_TIMEOUT = parse(
+    os.environ.get("WEBHOOK_HTTP_POOL_IDLE_TIMEOUT", "60 seconds")
+)
+
 # When `True`, HTTP requests made from arbitrary URLs will be rejected (e.g., webhooks).
 # if they try to access private IP address ranges, and loopback ranges (unless
 # `HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS=False`).
@@ -828,6 +997,14 @@ JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
 CHECKOUT_PRICES_TTL = timedelta(
     seconds=parse(os.environ.get("CHECKOUT_PRICES_TTL", "1 hour"))
 )
+# When enabled, expired checkout prices are recalculated only if the hash of the data
+# they are calculated from (lines, variant prices, promotions, voucher, addresses,
+# delivery method and tax configuration) has changed since the last calculation.
+# Otherwise, the prices are kept for another `CHECKOUT_PRICES_TTL` without calling the
+# plugins and tax apps.
+CHECKOUT_PRICES_INPUTS_HASH_ENABLED = get_bool_from_env(
+    "CHECKOUT_PRICES_INPUTS_HASH_ENABLED", False
+)
 
 CHECKOUT_TTL_BEFORE_RELEASING_FUNDS = timedelta(
     seconds=parse(os.environ.get("CHECKOUT_TTL_BEFORE_RELEASING_FUNDS", "6 hours"))
@@ -868,6 +1045,10 @@ executor.SubscriberExecutionContext = PatchedSubscriberExecutionContext  # type:
 UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME = os.environ.get(
     "UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME", None
 )
+# Queue name for the update of the products discounted prices
+UPDATE_DISCOUNTED_PRICES_QUEUE_NAME = os.environ.get(
+    "UPDATE_DISCOUNTED_PRICES_QUEUE_NAME", None
+)
 # Queue name for "async webhook" events
 WEBHOOK_CELERY_QUEUE_NAME = os.environ.get("WEBHOOK_CELERY_QUEUE_NAME", None)
 
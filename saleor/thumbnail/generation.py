@@ -0,0 +1,301 @@
+import logging
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from contextlib import ExitStack, contextmanager
+from typing import Optional, Union
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+
+from ..account.models import User
+from ..app.models import App, AppInstallation
+from ..core.utils.events import call_event
+from ..plugins.manager import get_plugins_manager
+from ..product.models import Category, Collection, ProductMedia
+from . import ALLOWED_ICON_THUMBNAIL_FORMATS, ALLOWED_THUMBNAIL_FORMATS, THUMBNAIL_SIZES
+from .models import Thumbnail
+from .utils import (
+    ProcessedIconImage,
+    ProcessedImage,
+    create_thumbnails,
+    prepare_thumbnail_file_name,
+)
+
+logger = logging.getLogger(__name__)
+
+ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
+
+ICON_TYPE_TO_MODEL_DATA_MAPPING = {
+    "App": ModelData(App, "brand_logo_default", "app"),
+    "AppInstallation": ModelData(
+        AppInstallation, "brand_logo_default", "app_installation"
+    ),
+}
+TYPE_TO_MODEL_DATA_MAPPING = {
+    "User": ModelData(User, "avatar", "user"),
+    "Category": ModelData(Category, "background_image", "category"),
+    "Collection": ModelData(Collection, "background_image", "collection"),
+    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
+    **ICON_TYPE_TO_MODEL_DATA_MAPPING,
+}
+UUID_IDENTIFIABLE_TYPES = ["User", "App", "AppInstallation"]
+
+THUMBNAIL_LOCK_KEY_PREFIX = "thumbnail_lock"
+
+InstancePk = Union[int, str, UUID]
+SizeAndFormat = tuple[int, Optional[str]]
+# size, format and file name of the rendered thumbnail
+RenderedThumbnail = tuple[int, Optional[str], str]
+
+
+def get_thumbnail(
+    object_type: str, pk: InstancePk, size: int, format: Optional[str]
+) -> Optional[Thumbnail]:
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    if object_type in UUID_IDENTIFIABLE_TYPES:
+        instance_id_lookup = model_data.thumbnail_field + "__uuid"
+    else:
+        instance_id_lookup = model_data.thumbnail_field + "_id"
+    return Thumbnail.objects.filter(
+        format=format, size=size, **{instance_id_lookup: pk}
+    ).first()
+
+
+def get_instance(object_type: str, pk: InstancePk):
+    """Return the instance of given type; raise `ObjectDoesNotExist` if not found."""
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    if object_type in UUID_IDENTIFIABLE_TYPES:
+        return model_data.model.objects.get(uuid=pk)
+    return model_data.model.objects.get(id=pk)
+
+
+def get_thumbnail_formats(object_type: str) -> list[Optional[str]]:
+    """Return all formats of the thumbnails, `None` stands for the original format."""
+    if object_type in ICON_TYPE_TO_MODEL_DATA_MAPPING:
+        return [None, *sorted(ALLOWED_ICON_THUMBNAIL_FORMATS)]
+    return [None, *sorted(ALLOWED_THUMBNAIL_FORMATS)]
+
+
+def get_processed_image_class(object_type: str) -> type[ProcessedImage]:
+    if object_type in ICON_TYPE_TO_MODEL_DATA_MAPPING:
+        return ProcessedIconImage
+    return ProcessedImage
+
+
+def create_thumbnail(
+    object_type: str, instance, size: int, format: Optional[str]
+) -> Thumbnail:
+    """Create the thumbnail of the instance image and send the `thumbnail_created` event.
+
+    Raise `ValueError` if the instance image can't be processed.
+    """
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    image = getattr(instance, model_data.image_field)
+
+    processed_image = get_processed_image_class(object_type)(image.name, size, format)
+    thumbnail_file, _ = processed_image.create_thumbnail()
+
+    thumbnail_file_name = prepare_thumbnail_file_name(image.name, size, format)
+
+    # save image thumbnail
+    thumbnail = Thumbnail(
+        size=size, format=format, **{model_data.thumbnail_field: instance}
+    )
+    thumbnail.image.save(thumbnail_file_name, thumbnail_file)
+    thumbnail.save()
+
+    # set additional `instance` attribute, to easily get instance data
+    # for ThumbnailCreated subscription type
+    setattr(thumbnail, "instance", instance)
+    manager = get_plugins_manager(allow_replica=False)
+    call_event(manager.thumbnail_created, thumbnail)
+    return thumbnail
+
+
+def _get_lock_key(
+    object_type: str, pk: InstancePk, size: int, format: Optional[str]
+) -> str:
+    return f"{THUMBNAIL_LOCK_KEY_PREFIX}:{object_type}:{pk}:{size}:{format}"
+
+
+@contextmanager
+def thumbnail_creation_lock(
+    object_type: str, pk: InstancePk, size: int, format: Optional[str]
+) -> Iterator[bool]:
+    """Acquire the lock for creating the thumbnail, if no one else holds it.
+
+    Yield whether the lock was acquired. The lock is kept in the cache, so it's
+    shared between the processes when the cache is shared. It expires after
+    `THUMBNAIL_LOCK_TIMEOUT`, in case its holder dies.
+    """
+    lock_key = _get_lock_key(object_type, pk, size, format)
+    acquired = cache.add(lock_key, True, timeout=settings.THUMBNAIL_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(lock_key)
+
+
+def render_thumbnails(
+    object_type: str, image_name: str, sizes_and_formats: Iterable[SizeAndFormat]
+) -> list[RenderedThumbnail]:
+    """Create the thumbnail files of the image in given sizes and formats.
+
+    The image is decoded once for all thumbnails. The files are saved in the storage
+    and their sizes, formats and names are returned; the database is not used, so
+    the thumbnails can be rendered in a separate process.
+    """
+    rendered_thumbnails = []
+    for size, format, thumbnail_file in create_thumbnails(
+        image_name, sizes_and_formats, get_processed_image_class(object_type)
+    ):
+        thumbnail = Thumbnail(size=size, format=format)
+        thumbnail_file_name = prepare_thumbnail_file_name(image_name, size, format)
+        thumbnail.image.save(thumbnail_file_name, thumbnail_file, save=False)
+        rendered_thumbnails.append((size, format, thumbnail.image.name))
+    return rendered_thumbnails
+
+
+def _render_instance_thumbnails(
+    job: tuple[str, int, str, list[SizeAndFormat]],
+) -> tuple[int, list[RenderedThumbnail]]:
+    object_type, instance_pk, image_name, sizes_and_formats = job
+    try:
+        return instance_pk, render_thumbnails(
+            object_type, image_name, sizes_and_formats
+        )
+    except Exception:
+        logger.exception("Cannot create thumbnails of %s %s.", object_type, instance_pk)
+        return instance_pk, []
+
+
+def _get_existing_thumbnails(
+    object_type: str, instance_pks: Iterable[int]
+) -> set[tuple[int, int, Optional[str]]]:
+    instance_field = TYPE_TO_MODEL_DATA_MAPPING[object_type].thumbnail_field + "_id"
+    return set(
+        Thumbnail.objects.filter(**{f"{instance_field}__in": instance_pks}).values_list(
+            instance_field, "size", "format"
+        )
+    )
+
+
+def create_thumbnails_for_instances(
+    object_type: str,
+    pks: Iterable[int],
+    sizes_and_formats: Optional[Iterable[SizeAndFormat]] = None,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Create the missing thumbnails of the instances with given ids.
+
+    By default, the thumbnails are created in all sizes and formats. Each image is
+    decoded once, in the executor processes if the executor is given, and all
+    thumbnails are saved with a single query. Return the number of created
+    thumbnails.
+    """
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    if sizes_and_formats is None:
+        sizes_and_formats = [
+            (size, format)
+            for format in get_thumbnail_formats(object_type)
+            for size in THUMBNAIL_SIZES
+        ]
+    sizes_and_formats = list(sizes_and_formats)
+    instances = {
+        instance.pk: instance
+        for instance in model_data.model.objects.filter(pk__in=pks).exclude(
+            Q(**{f"{model_data.image_field}__isnull": True})
+            | Q(**{model_data.image_field: ""})
+        )
+    }
+    existing_thumbnails = _get_existing_thumbnails(object_type, instances.keys())
+    jobs = []
+    for instance_pk, instance in instances.items():
+        missing_sizes_and_formats = [
+            (size, format)
+            for size, format in sizes_and_formats
+            if (instance_pk, size, format) not in existing_thumbnails
+        ]
+        if missing_sizes_and_formats:
+            image = getattr(instance, model_data.image_field)
+            jobs.append(
+                (object_type, instance_pk, image.name, missing_sizes_and_formats)
+            )
+    if not jobs:
+        return 0
+
+    if executor:
+        rendered = list(executor.map(_render_instance_thumbnails, jobs))
+    else:
+        rendered = [_render_instance_thumbnails(job) for job in jobs]
+
+    # skip the thumbnails created by the requests in the meantime
+    existing_thumbnails = _get_existing_thumbnails(object_type, instances.keys())
+    thumbnails = []
+    for instance_pk, rendered_thumbnails in rendered:
+        for size, format, file_name in rendered_thumbnails:
+            if (instance_pk, size, format) in existing_thumbnails:
+                default_storage.delete(file_name)
+                continue
+            thumbnails.append(
+                Thumbnail(
+                    image=file_name,
+                    size=size,
+                    format=format,
+                    **{model_data.thumbnail_field: instances[instance_pk]},
+                )
+            )
+    Thumbnail.objects.bulk_create(thumbnails)
+
+    manager = get_plugins_manager(allow_replica=False)
+    for thumbnail in thumbnails:
+        # set additional `instance` attribute, to easily get instance data
+        # for ThumbnailCreated subscription type
+        setattr(thumbnail, "instance", getattr(thumbnail, model_data.thumbnail_field))
+        call_event(manager.thumbnail_created, thumbnail)
+    return len(thumbnails)
+
+
+def create_missing_thumbnails(object_type: str, pk: InstancePk) -> int:
+    """Create the instance thumbnails in all sizes and formats that don't exist yet.
+
+    Thumbnails being created by the requests are skipped. Return the number of
+    created thumbnails.
+    """
+    try:
+        instance = get_instance(object_type, pk)
+    except TYPE_TO_MODEL_DATA_MAPPING[object_type].model.DoesNotExist:
+        return 0
+
+    with ExitStack() as stack:
+        sizes_and_formats = [
+            (size, format)
+            for format in get_thumbnail_formats(object_type)
+            for size in THUMBNAIL_SIZES
+            if stack.enter_context(
+                thumbnail_creation_lock(object_type, pk, size, format)
+            )
+        ]
+        created = create_thumbnails_for_instances(
+            object_type, [instance.pk], sizes_and_formats
+        )
+    return created
+
+
+def prewarm_thumbnails(object_type: str, pk: InstancePk):
+    """Schedule creating all thumbnails of a new instance image.
+
+    Thumbnails are created in a Celery task after the transaction is committed,
+    if `THUMBNAIL_PREWARM_ENABLED` is set.
+    """
+    if not settings.THUMBNAIL_PREWARM_ENABLED:
+        return
+    from .tasks import create_thumbnails_task
+
+    transaction.on_commit(lambda: create_thumbnails_task.delay(object_type, str(pk)))
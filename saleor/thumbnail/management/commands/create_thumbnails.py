@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from ...generation import TYPE_TO_MODEL_DATA_MAPPING, create_thumbnails_for_instances
+from ...tasks import create_thumbnails_for_instances_task
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing thumbnails of the images in all sizes and formats. Thumbnails "
+        "are rendered in a pool of processes, or in Celery workers with `--celery`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "object_types",
+            nargs="*",
+            choices=sorted(TYPE_TO_MODEL_DATA_MAPPING),
+            help="Types of the instances which thumbnails are created; all by default.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes rendering the thumbnails.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of instances which thumbnails are saved at once.",
+        )
+        parser.add_argument(
+            "--celery",
+            action="store_true",
+            default=False,
+            help="Schedule a Celery task for each batch instead of rendering locally.",
+        )
+
+    def handle(self, *args, **options):
+        object_types = options["object_types"] or list(TYPE_TO_MODEL_DATA_MAPPING)
+        batch_size = options["batch_size"]
+        use_celery = options["celery"]
+        processes = options["processes"]
+
+        if not use_celery and processes > 1:
+            # Forked processes must not share the database connections.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=processes)
+        else:
+            executor = None
+
+        with executor or nullcontext():
+            for object_type in object_types:
+                self.stdout.write(f"Creating thumbnails for {object_type} instances.")
+                created = 0
+                for pks in get_instance_pks_in_batches(object_type, batch_size):
+                    if use_celery:
+                        create_thumbnails_for_instances_task.delay(object_type, pks)
+                        continue
+                    created += create_thumbnails_for_instances(
+                        object_type, pks, executor=executor
+                    )
+                if not use_celery:
+                    self.stdout.write(f"Created {created} {object_type} thumbnails.")
+
+
+def get_instance_pks_in_batches(object_type: str, batch_size: int):
+    """Yield ids of the instances with an image, in batches ordered by id."""
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    queryset = model_data.model.objects.exclude(
+        Q(**{f"{model_data.image_field}__isnull": True})
+        | Q(**{model_data.image_field: ""})
+    ).order_by("pk")
+    start_pk = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=start_pk).values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+        yield pks
+        start_pk = pks[-1]
@@ -0,0 +1,22 @@
+import logging
+
+from celery.utils.log import get_task_logger
+
+from ..celeryconf import app
+from .generation import create_missing_thumbnails, create_thumbnails_for_instances
+
+task_logger: logging.Logger = get_task_logger(__name__)
+
+
+@app.task
+def create_thumbnails_task(object_type: str, pk: str):
+    created = create_missing_thumbnails(object_type, pk)
+    task_logger.info("Created %s thumbnails for %s %s.", created, object_type, pk)
+
+
+@app.task
+def create_thumbnails_for_instances_task(object_type: str, pks: list[int]):
+    created = create_thumbnails_for_instances(object_type, pks)
+    task_logger.info(
+        "Created %s thumbnails for %s %s instances.", created, len(pks), object_type
+    )
@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from .. import THUMBNAIL_SIZES
+from ..generation import (
+    create_missing_thumbnails,
+    create_thumbnails_for_instances,
+    prewarm_thumbnails,
+    thumbnail_creation_lock,
+)
+from ..models import Thumbnail
+
+
+def test_create_missing_thumbnails(category_with_image):
+    # when
+    created = create_missing_thumbnails("Category", category_with_image.pk)
+
+    # then
+    # thumbnails in the original format, AVIF and WEBP
+    assert created == len(THUMBNAIL_SIZES) * 3
+    assert Thumbnail.objects.filter(category=category_with_image).count() == created
+
+
+def test_create_missing_thumbnails_skips_existing_thumbnails(category_with_image):
+    # given
+    Thumbnail.objects.create(
+        category=category_with_image,
+        size=THUMBNAIL_SIZES[0],
+        image="thumbnails/image_thumbnail.png",
+    )
+
+    # when
+    created = create_missing_thumbnails("Category", category_with_image.pk)
+
+    # then
+    assert created == len(THUMBNAIL_SIZES) * 3 - 1
+
+
+def test_create_missing_thumbnails_skips_thumbnails_being_created(
+    category_with_image,
+):
+    # given
+    lock = thumbnail_creation_lock(
+        "Category", category_with_image.pk, THUMBNAIL_SIZES[0], None
+    )
+
+    # when
+    with lock as acquired:
+        assert acquired is True
+        created = create_missing_thumbnails("Category", category_with_image.pk)
+
+    # then
+    assert created == len(THUMBNAIL_SIZES) * 3 - 1
+    assert not Thumbnail.objects.filter(
+        category=category_with_image, size=THUMBNAIL_SIZES[0], format=None
+    ).exists()
+
+
+def test_create_missing_thumbnails_no_image(category):
+    # when
+    created = create_missing_thumbnails("Category", category.pk)
+
+    # then
+    assert created == 0
+
+
+@patch("saleor.thumbnail.tasks.create_thumbnails_task.delay")
+def test_prewarm_thumbnails(
+    mocked_delay, category_with_image, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.THUMBNAIL_PREWARM_ENABLED = True
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        prewarm_thumbnails("Category", category_with_image.pk)
+
+    # then
+    mocked_delay.assert_called_once_with("Category", str(category_with_image.pk))
+
+
+@patch("saleor.thumbnail.tasks.create_thumbnails_task.delay")
+def test_prewarm_thumbnails_disabled(
+    mocked_delay, category_with_image, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.THUMBNAIL_PREWARM_ENABLED = False
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        prewarm_thumbnails("Category", category_with_image.pk)
+
+    # then
+    mocked_delay.assert_not_called()
+
+
+def test_create_thumbnails_for_instances(
+    product_with_image_list, django_assert_num_queries
+):
+    # given
+    media = list(product_with_image_list.media.all())
+    sizes_and_formats = [(32, None), (64, None), (64, "webp")]
+
+    # when
+    # instances, existing thumbnails (twice), insert and the plugins configuration
+    with django_assert_num_queries(6):
+        created = create_thumbnails_for_instances(
+            "ProductMedia", [item.pk for item in media], sizes_and_formats
+        )
+
+    # then
+    assert created == len(media) * len(sizes_and_formats)
+    for item in media:
+        assert set(item.thumbnails.values_list("size", "format")) == set(
+            sizes_and_formats
+        )
+
+
+@patch("saleor.thumbnail.utils.Image.open", wraps=Image.open)
+def test_create_thumbnails_for_instances_decodes_image_once(
+    mocked_image_open, category_with_image
+):
+    # when
+    created = create_thumbnails_for_instances("Category", [category_with_image.pk])
+
+    # then
+    assert created == len(THUMBNAIL_SIZES) * 3
+    mocked_image_open.assert_called_once()
+
+
+def test_create_thumbnails_for_instances_with_executor(product_with_image_list):
+    # given
+    media_pks = list(product_with_image_list.media.values_list("pk", flat=True))
+
+    # when
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        created = create_thumbnails_for_instances(
+            "ProductMedia", media_pks, [(32, None)], executor=executor
+        )
+
+    # then
+    assert created == len(media_pks)
+    assert Thumbnail.objects.filter(product_media__in=media_pks).count() == created
+
+
+@patch("saleor.plugins.manager.PluginsManager.thumbnail_created")
+def test_create_thumbnails_for_instances_sends_events(
+    mocked_thumbnail_created, category_with_image, django_capture_on_commit_callbacks
+):
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        create_thumbnails_for_instances(
+            "Category", [category_with_image.pk], [(32, None)]
+        )
+
+    # then
+    thumbnail = Thumbnail.objects.get(category=category_with_image)
+    mocked_thumbnail_created.assert_called_once_with(thumbnail)
+    assert mocked_thumbnail_created.call_args[0][0].instance == category_with_image
+
+
+def test_create_thumbnails_for_instances_skips_invalid_images(
+    category_with_image,
+):
+    # given
+    category_with_image.background_image.save("invalid.png", ContentFile(b"invalid"))
+
+    # when
+    created = create_thumbnails_for_instances(
+        "Category", [category_with_image.pk], [(32, None)]
+    )
+
+    # then
+    assert created == 0
+    assert not Thumbnail.objects.exists()
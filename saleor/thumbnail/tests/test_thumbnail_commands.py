@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from .. import THUMBNAIL_SIZES
+from ..models import Thumbnail
+
+
+def test_create_thumbnails_command(category_with_image, collection_with_image):
+    # when
+    call_command("create_thumbnails", "Category", processes=1)
+
+    # then
+    assert Thumbnail.objects.filter(category=category_with_image).count() == (
+        len(THUMBNAIL_SIZES) * 3
+    )
+    assert not Thumbnail.objects.filter(collection=collection_with_image).exists()
+
+
+def test_create_thumbnails_command_skips_existing_thumbnails(category_with_image):
+    # given
+    call_command("create_thumbnails", "Category", processes=1)
+    thumbnail_ids = set(Thumbnail.objects.values_list("id", flat=True))
+
+    # when
+    call_command("create_thumbnails", "Category", processes=1)
+
+    # then
+    assert set(Thumbnail.objects.values_list("id", flat=True)) == thumbnail_ids
+
+
+@patch("saleor.thumbnail.tasks.create_thumbnails_for_instances_task.delay")
+def test_create_thumbnails_command_with_celery(
+    mocked_task, category_with_image, category
+):
+    # when
+    call_command("create_thumbnails", "Category", celery=True, batch_size=1)
+
+    # then
+    mocked_task.assert_called_once_with("Category", [category_with_image.pk])
+    assert not Thumbnail.objects.exists()
@@ -1,8 +1,10 @@
+from io import BytesIO
 from unittest.mock import MagicMock
 
 import graphene
 import pytest
 from django.core.files import File
+from PIL import Image
 
 from .. import FILE_NAME_MAX_LENGTH, ThumbnailFormat
 from ..models import Thumbnail
@@ -115,6 +117,36 @@ def test_processed_image_preprocess_method_called(category_with_image, thumb_for
     preprocess_mock.assert_called_once()
 
 
+def test_processed_image_decodes_jpeg_in_reduced_scale():
+    # given
+    image_file = BytesIO()
+    Image.new("RGB", (2048, 1024), "blue").save(image_file, format="JPEG")
+    image_file.seek(0)
+    processed_image = ProcessedImage(File(image_file, name="image.jpg"), 128)
+
+    # when
+    image, image_format = processed_image.retrieve_image()
+
+    # then
+    assert image_format == "JPEG"
+    # decoded in 1/4 scale, still larger than the double thumbnail size
+    assert image.size == (512, 256)
+
+
+def test_processed_image_jpeg_thumbnail_size():
+    # given
+    image_file = BytesIO()
+    Image.new("RGB", (2048, 1024), "blue").save(image_file, format="JPEG")
+    image_file.seek(0)
+    processed_image = ProcessedImage(File(image_file, name="image.jpg"), 128)
+
+    # when
+    thumbnail_file, _ = processed_image.create_thumbnail()
+
+    # then
+    assert Image.open(thumbnail_file).size == (128, 64)
+
+
 def test_get_filename_from_url_unique():
     # given
     file_format = "jpg"
@@ -4,6 +4,7 @@ import graphene
 from PIL import Image
 
 from .. import IconThumbnailFormat, ThumbnailFormat
+from ..generation import thumbnail_creation_lock
 from ..models import Thumbnail
 
 
@@ -392,3 +393,36 @@ def test_handle_thumbnail_view_for_app_installation_logo_default_thumbnail_exist
     assert response.status_code == 302
     assert response.url == thumbnail.image.url
     assert Thumbnail.objects.count() == thumbnail_count
+
+
+@patch("saleor.thumbnail.views.create_thumbnail")
+def test_handle_thumbnail_view_returns_image_while_other_request_creates_thumbnail(
+    mocked_create_thumbnail, client, category_with_image
+):
+    # given
+    size = 60
+    category_id = graphene.Node.to_global_id("Category", category_with_image.id)
+
+    # when
+    # the lock is held by another request creating the thumbnail
+    with thumbnail_creation_lock("Category", str(category_with_image.pk), 64, None):
+        response = client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # then
+    assert response.status_code == 302
+    assert response.url == category_with_image.background_image.url
+    mocked_create_thumbnail.assert_not_called()
+
+
+def test_handle_thumbnail_view_releases_lock(client, category_with_image):
+    # given
+    size = 60
+    category_id = graphene.Node.to_global_id("Category", category_with_image.id)
+
+    # when
+    client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # then
+    lock = thumbnail_creation_lock("Category", str(category_with_image.pk), 64, None)
+    with lock as acquired:
+        assert acquired is True
@@ -1,5 +1,6 @@
 import os
 import secrets
+from collections.abc import Iterable, Iterator
 from io import BytesIO
 from typing import TYPE_CHECKING, Optional, Union
 
@@ -103,6 +104,10 @@ class ProcessedImage:
     # https://pillow.readthedocs.io/en/latest/handbook/image-file-formats.html#webp
     WEBP_QUAL = 70
     AVIF_QUAL = 70
+    # JPEG images are decoded at the smallest scale (1/2, 1/4 or 1/8) still larger
+    # than the thumbnail size multiplied by this factor; the rest of the downscaling
+    # is done with resampling, which keeps the thumbnail quality.
+    JPEG_DRAFT_REDUCING_GAP = 2
 
     def __init__(
         self,
@@ -131,7 +136,13 @@ class ProcessedImage:
         if isinstance(self.image_source, str):
             image = self.storage.open(self.image_source, "rb")
         image_format = self.get_image_metadata_from_file(image)
-        return (Image.open(image), image_format)
+        image = Image.open(image)
+        if image_format == "JPEG":
+            # Decode only as many pixels as needed for the thumbnail, before the
+            # image is rotated or converted, which loads the whole image.
+            draft_size = self.size * self.JPEG_DRAFT_REDUCING_GAP
+            image.draft(None, (draft_size, draft_size))
+        return (image, image_format)
 
     @classmethod
     def get_image_metadata_from_file(cls, file_like):
@@ -171,7 +182,19 @@ class ProcessedImage:
         format = self.format or image_format
         save_kwargs = {"format": format}
 
-        # Ensuring image is properly rotated
+        image = self.rotate(image)
+
+        # Ensure any embedded ICC profile is preserved
+        save_kwargs["icc_profile"] = image.info.get("icc_profile")
+
+        if hasattr(self, f"preprocess_{format}"):
+            image, addl_save_kwargs = getattr(self, f"preprocess_{format}")(image=image)
+            save_kwargs.update(addl_save_kwargs)
+
+        return image, save_kwargs
+
+    def rotate(self, image):
+        """Return the image rotated according to its EXIF orientation."""
         if hasattr(image, "_getexif"):
             exif_datadict = image._getexif()  # returns None if no EXIF data
             if exif_datadict is not None:
@@ -183,15 +206,7 @@ class ProcessedImage:
                     image = image.transpose(Image.ROTATE_270)
                 elif orientation == 8:
                     image = image.transpose(Image.ROTATE_90)
-
-        # Ensure any embedded ICC profile is preserved
-        save_kwargs["icc_profile"] = image.info.get("icc_profile")
-
-        if hasattr(self, f"preprocess_{format}"):
-            image, addl_save_kwargs = getattr(self, f"preprocess_{format}")(image=image)
-            save_kwargs.update(addl_save_kwargs)
-
-        return image, save_kwargs
+        return image
 
     def preprocess_AVIF(self, image):
         """Receive a PIL Image instance of an AVIF and return 2-tuple."""
@@ -245,6 +260,44 @@ class ProcessedIconImage(ProcessedImage):
     LOSSLESS_WEBP = True
 
 
+def create_thumbnails(
+    image_source: Union[str, File],
+    sizes_and_formats: Iterable[tuple[int, Optional[str]]],
+    processed_image_class: type[ProcessedImage] = ProcessedImage,
+    storage=default_storage,
+) -> Iterator[tuple[int, Optional[str], BytesIO]]:
+    """Create thumbnails of the image in given sizes and formats.
+
+    The image is read and decoded once, in the scale needed for the largest size,
+    and every thumbnail is derived from the decoded image. Yield 3-tuples of
+    the thumbnail size, format and file.
+    """
+    sizes_and_formats = list(sizes_and_formats)
+    if not sizes_and_formats:
+        return
+    max_size = max(size for size, _ in sizes_and_formats)
+    source_image = processed_image_class(image_source, max_size, storage=storage)
+    image, image_format = source_image.retrieve_image()
+    # Rotate the image before it's copied, as copies don't keep the EXIF data.
+    image = source_image.rotate(image)
+    image.load()
+
+    resized_images: dict[int, Image.Image] = {}
+    for size, format in sizes_and_formats:
+        if size not in resized_images:
+            resized_image = image.copy()
+            resized_image.thumbnail((size, size))
+            resized_images[size] = resized_image
+        processed_image = processed_image_class(
+            image_source, size, format, storage=storage
+        )
+        thumbnail, save_kwargs = processed_image.preprocess(
+            resized_images[size], image_format
+        )
+        thumbnail_file, _ = processed_image.process_image(thumbnail, save_kwargs)
+        yield size, format, thumbnail_file
+
+
 def get_filename_from_url(url: str) -> str:
     """Prepare a unique filename for file from the URL to avoid overwriting."""
     file_name = os.path.basename(url)
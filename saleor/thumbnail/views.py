@@ -1,5 +1,4 @@
 import logging
-from collections import namedtuple
 from typing import Optional
 
 from django.core.exceptions import ObjectDoesNotExist
@@ -10,40 +9,20 @@ from django.http import (
 )
 from graphql.error import GraphQLError
 
-from ..account.models import User
-from ..app.models import App, AppInstallation
-from ..core.utils.events import call_event
 from ..graphql.core.utils import from_global_id_or_error
-from ..plugins.manager import get_plugins_manager
-from ..product.models import Category, Collection, ProductMedia
-from ..thumbnail.models import Thumbnail
 from . import ALLOWED_ICON_THUMBNAIL_FORMATS, ALLOWED_THUMBNAIL_FORMATS
-from .utils import (
-    ProcessedIconImage,
-    ProcessedImage,
-    get_thumbnail_size,
-    prepare_thumbnail_file_name,
+from .generation import (
+    ICON_TYPE_TO_MODEL_DATA_MAPPING,
+    TYPE_TO_MODEL_DATA_MAPPING,
+    create_thumbnail,
+    get_instance,
+    get_thumbnail,
+    thumbnail_creation_lock,
 )
+from .utils import get_thumbnail_size
 
 logger = logging.getLogger(__name__)
 
-ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
-
-ICON_TYPE_TO_MODEL_DATA_MAPPING = {
-    "App": ModelData(App, "brand_logo_default", "app"),
-    "AppInstallation": ModelData(
-        AppInstallation, "brand_logo_default", "app_installation"
-    ),
-}
-TYPE_TO_MODEL_DATA_MAPPING = {
-    "User": ModelData(User, "avatar", "user"),
-    "Category": ModelData(Category, "background_image", "category"),
-    "Collection": ModelData(Collection, "background_image", "collection"),
-    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
-    **ICON_TYPE_TO_MODEL_DATA_MAPPING,
-}
-UUID_IDENTIFIABLE_TYPES = ["User", "App", "AppInstallation"]
-
 
 def handle_thumbnail(
     request, instance_id: str, size: str, format: Optional[str] = None
@@ -52,6 +31,8 @@ def handle_thumbnail(
 
     If the provided size is not in the available resolution list, the thumbnail with
     the closest available size is created and returned, if it does not exist.
+    Concurrent requests for the same missing thumbnail are redirected to the original
+    image while the first one creates it, instead of creating it again.
     """
     # try to find corresponding instance based on given instance_id
     try:
@@ -76,55 +57,32 @@ def handle_thumbnail(
         return HttpResponseNotFound("Invalid size.")
 
     # return the thumbnail if it's already exist
-    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
-    if object_type in UUID_IDENTIFIABLE_TYPES:
-        instance_id_lookup = model_data.thumbnail_field + "__uuid"
-    else:
-        instance_id_lookup = model_data.thumbnail_field + "_id"
-
-    if thumbnail := Thumbnail.objects.filter(
-        format=format, size=size_px, **{instance_id_lookup: pk}
-    ).first():
+    if thumbnail := get_thumbnail(object_type, pk, size_px, format):
         return HttpResponseRedirect(thumbnail.image.url)
 
-    try:
-        if object_type in UUID_IDENTIFIABLE_TYPES:
-            instance = model_data.model.objects.get(uuid=pk)
-        else:
-            instance = model_data.model.objects.get(id=pk)
-    except ObjectDoesNotExist:
-        return HttpResponseNotFound("Instance with the given id cannot be found.")
-
-    image = getattr(instance, model_data.image_field)
-    if not bool(image):
-        return HttpResponseNotFound("There is no image for provided instance.")
-
-    # prepare thumbnail
-    if object_type in ICON_TYPE_TO_MODEL_DATA_MAPPING:
-        processed_image: ProcessedImage = ProcessedIconImage(
-            image.name, size_px, format
-        )
-    else:
-        processed_image = ProcessedImage(image.name, size_px, format)
-    try:
-        thumbnail_file, _ = processed_image.create_thumbnail()
-    except ValueError as error:
-        logger.info(str(error))
-        return HttpResponseBadRequest("Invalid image.")
-
-    thumbnail_file_name = prepare_thumbnail_file_name(image.name, size_px, format)
-
-    # save image thumbnail
-    thumbnail = Thumbnail(
-        size=size_px, format=format, **{model_data.thumbnail_field: instance}
-    )
-    thumbnail.image.save(thumbnail_file_name, thumbnail_file)
-    thumbnail.save()
-
-    # set additional `instance` attribute, to easily get instance data
-    # for ThumbnailCreated subscription type
-    setattr(thumbnail, "instance", instance)
-    manager = get_plugins_manager(allow_replica=False)
-    call_event(manager.thumbnail_created, thumbnail)
+    with thumbnail_creation_lock(object_type, pk, size_px, format) as acquired:
+        # the thumbnail might have been created by the previous lock holder
+        if acquired and (thumbnail := get_thumbnail(object_type, pk, size_px, format)):
+            return HttpResponseRedirect(thumbnail.image.url)
+
+        try:
+            instance = get_instance(object_type, pk)
+        except ObjectDoesNotExist:
+            return HttpResponseNotFound("Instance with the given id cannot be found.")
+
+        image = getattr(instance, TYPE_TO_MODEL_DATA_MAPPING[object_type].image_field)
+        if not bool(image):
+            return HttpResponseNotFound("There is no image for provided instance.")
+
+        if not acquired:
+            # the thumbnail is being created by another request, so the original
+            # image is returned instead of blocking the worker until it's ready
+            return HttpResponseRedirect(image.url)
+
+        try:
+            thumbnail = create_thumbnail(object_type, instance, size_px, format)
+        except ValueError as error:
+            logger.info(str(error))
+            return HttpResponseBadRequest("Invalid image.")
 
     return HttpResponseRedirect(thumbnail.image.url)
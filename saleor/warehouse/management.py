@@ -1,12 +1,13 @@
 import math
 from collections import defaultdict, namedtuple
 from collections.abc import Iterable
+from functools import partial
 from typing import TYPE_CHECKING, Any, Optional, cast
 from uuid import UUID
 
 from django.db import transaction
 from django.db.models import F, Sum
-from django.db.models.expressions import Exists, OuterRef
+from django.db.models.expressions import Exists, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 
 from ..channel import AllocationStrategy
@@ -82,31 +83,32 @@ def allocate_stocks(
         else Stock.objects.for_channel_and_country(channel_slug, country_code)
     )
 
+    # lock the stocks and fetch the quantity already allocated from them in one query
     stocks = list(
         stocks.select_for_update(of=("self",))
         .filter(**filter_lookup)
+        .annotate(quantity_allocated_sum=_get_allocated_quantity_subquery())
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+        .values(
+            "id",
+            "product_variant",
+            "pk",
+            "quantity",
+            "warehouse_id",
+            "quantity_allocated_sum",
+        )
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
+    stocks_id = [stock.pop("id") for stock in stocks]
 
     quantity_reservation_for_stocks: dict = _prepare_stock_to_reserved_quantity_map(
         checkout_lines, check_reservations, stocks_id
     )
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
     quantity_allocation_for_stocks: dict = defaultdict(int)
-    for allocation_data in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
+    for stock_data in stocks:
+        quantity_allocation_for_stocks[stock_data["pk"]] += stock_data.pop(
             "quantity_allocated_sum"
-        ]
+        )
 
     stocks = sort_stocks(
         channel.allocation_strategy,
@@ -133,32 +135,54 @@ def allocate_stocks(
             quantity_reservation_for_stocks,
             insufficient_stock,
         )
+        # lines of the same variant can't allocate the same quantity twice
+        for allocation in allocation_items:
+            quantity_allocation_for_stocks[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
         allocations.extend(allocation_items)
 
     if insufficient_stock:
         raise InsufficientStock(insufficient_stock)
 
     if allocations:
-        stocks_to_update = []
-        for alloc in Allocation.objects.bulk_create(allocations):
-            stock = alloc.stock
-            stock.quantity_allocated = (
-                F("quantity_allocated") + alloc.quantity_allocated
-            )
-            stocks_to_update.append(stock)
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        Allocation.objects.bulk_create(allocations)
 
+        quantity_allocated_per_stock: dict[int, int] = defaultdict(int)
         for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
-            )
-            if not max(allocation.stock.quantity - allocated_stock, 0):
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(allocation.stock)
+            quantity_allocated_per_stock[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+        Stock.objects.bulk_update(
+            [
+                Stock(
+                    pk=stock_pk,
+                    quantity_allocated=F("quantity_allocated") + quantity_allocated,
                 )
+                for stock_pk, quantity_allocated in quantity_allocated_per_stock.items()
+            ],
+            ["quantity_allocated"],
+        )
+
+        out_of_stocks = Stock.objects.filter(
+            pk__in=quantity_allocated_per_stock.keys()
+        ).filter(quantity__lte=_get_allocated_quantity_subquery())
+        for stock in out_of_stocks:
+            transaction.on_commit(partial(manager.product_variant_out_of_stock, stock))
+
+
+def _get_allocated_quantity_subquery():
+    """Return the quantity allocated from the stock referenced by the outer query."""
+    return Coalesce(
+        Subquery(
+            Allocation.objects.filter(stock_id=OuterRef("pk"), quantity_allocated__gt=0)
+            .order_by()
+            .values("stock_id")
+            .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+            .values("quantity_allocated_sum")
+        ),
+        0,
+    )
 
 
 def _prepare_stock_to_reserved_quantity_map(
@@ -0,0 +1,81 @@
+import pytest
+
+from ....order.fetch import OrderLineInfo
+from ....order.models import OrderLine
+from ....plugins.manager import get_plugins_manager
+from ....product.models import ProductVariant
+from ...management import allocate_stocks
+from ...models import Allocation, Stock, Warehouse
+
+COUNTRY_CODE = "US"
+WAREHOUSES_NUMBER = 20
+
+
+@pytest.fixture
+def many_warehouses(address, shipping_zone, channel_USD):
+    warehouses = Warehouse.objects.bulk_create(
+        [
+            Warehouse(
+                address=address.get_copy(),
+                name=f"Warehouse {i}",
+                slug=f"warehouse-{i}",
+                email=f"warehouse-{i}@example.com",
+            )
+            for i in range(WAREHOUSES_NUMBER)
+        ]
+    )
+    for warehouse in warehouses:
+        warehouse.shipping_zones.add(shipping_zone)
+        warehouse.channels.add(channel_USD)
+    return warehouses
+
+
+def _create_order_lines_info(order_line, warehouses, lines_number):
+    product = order_line.variant.product
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"BENCHMARK-{i}")
+            for i in range(lines_number)
+        ]
+    )
+    # each warehouse can fulfill only a part of a line, so the lines are allocated
+    # from several stocks
+    Stock.objects.bulk_create(
+        [
+            Stock(warehouse=warehouse, product_variant=variant, quantity=2)
+            for variant in variants
+            for warehouse in warehouses
+        ]
+    )
+    lines = []
+    for variant in variants:
+        line = OrderLine.objects.get(pk=order_line.pk)
+        line.pk = None
+        line.variant = variant
+        line.product_sku = variant.sku
+        lines.append(line)
+    lines = OrderLine.objects.bulk_create(lines)
+    return [
+        OrderLineInfo(line=line, variant=line.variant, quantity=5) for line in lines
+    ]
+
+
+@pytest.mark.parametrize("lines_number", [1, 50, 500])
+def test_allocate_stocks_queries_number_does_not_depend_on_lines_number(
+    lines_number, order_line, many_warehouses, channel_USD, django_assert_num_queries
+):
+    # given
+    manager = get_plugins_manager(allow_replica=False)
+    lines_info = _create_order_lines_info(order_line, many_warehouses, lines_number)
+
+    # when
+    # lock and read the stocks, insert the allocations, update the stocks and find
+    # the stocks that went out of stock, plus the savepoint queries
+    with django_assert_num_queries(6):
+        allocate_stocks(lines_info, COUNTRY_CODE, channel_USD, manager=manager)
+
+    # then
+    allocations = Allocation.objects.filter(
+        order_line__in=[line_info.line for line_info in lines_info]
+    )
+    assert allocations.count() == lines_number * 3
@@ -475,6 +475,84 @@ def test_allocate_stock_insufficient_stocks_for_multiple_lines(
     ).exists()
 
 
+def test_allocate_stocks_multiple_lines_of_the_same_variant(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    order_line_2 = OrderLine.objects.get(pk=order_line.pk)
+    order_line_2.pk = None
+    order_line_2.save()
+
+    line_data_1 = OrderLineInfo(line=order_line, variant=variant, quantity=3)
+    line_data_2 = OrderLineInfo(line=order_line_2, variant=variant, quantity=4)
+
+    # when
+    allocate_stocks(
+        [line_data_1, line_data_2],
+        COUNTRY_CODE,
+        channel_USD,
+        manager=get_plugins_manager(allow_replica=False),
+    )
+
+    # then
+    stocks = variant.stocks.all()
+    assert [stock.quantity_allocated for stock in stocks] == [4, 3]
+    assert Allocation.objects.filter(stock__in=stocks).aggregate(
+        total=Sum("quantity_allocated")
+    ) == {"total": 7}
+
+
+def test_allocate_stocks_multiple_lines_of_the_same_variant_insufficient_stock(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    variant = variant_with_many_stocks
+    order_line_2 = OrderLine.objects.get(pk=order_line.pk)
+    order_line_2.pk = None
+    order_line_2.save()
+
+    line_data_1 = OrderLineInfo(line=order_line, variant=variant, quantity=4)
+    line_data_2 = OrderLineInfo(line=order_line_2, variant=variant, quantity=4)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [line_data_1, line_data_2],
+            COUNTRY_CODE,
+            channel_USD,
+            manager=get_plugins_manager(allow_replica=False),
+        )
+
+    # then
+    assert not Allocation.objects.filter(stock__product_variant=variant).exists()
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+def test_allocate_stocks_with_out_of_stock_webhook_triggered(
+    product_variant_out_of_stock_webhook_mock,
+    order_line,
+    variant_with_many_stocks,
+    channel_USD,
+):
+    # given
+    variant = variant_with_many_stocks
+    line_data = OrderLineInfo(line=order_line, variant=variant, quantity=5)
+
+    # when
+    allocate_stocks(
+        [line_data],
+        COUNTRY_CODE,
+        channel_USD,
+        manager=get_plugins_manager(allow_replica=False),
+    )
+    flush_post_commit_hooks()
+
+    # then
+    out_of_stock = variant.stocks.get(quantity=4)
+    product_variant_out_of_stock_webhook_mock.assert_called_once_with(out_of_stock)
+
+
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
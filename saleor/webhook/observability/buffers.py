@@ -1,5 +1,10 @@
+import atexit
+import logging
 import math
+import os
+import threading
 import zlib
+from collections import defaultdict, deque
 from typing import Optional
 
 from asgiref.local import Local
@@ -7,6 +12,9 @@ from django.conf import settings
 from redis import ConnectionPool, Redis
 
 from .exceptions import ConnectionNotConfigured
+from .tracing import opentracing_trace
+
+logger = logging.getLogger(__name__)
 
 KEY_TYPE = str
 DEFAULT_CONNECTION_TIMEOUT = 0.5
@@ -206,3 +214,124 @@ def get_buffer(
         connection_timeout=connection_timeout,
         timeout=timeout,
     )
+
+
+class StagingQueue:
+    """In-process queue of the events waiting to be put into the buffers.
+
+    Staged events are put into the buffers with a single pipelined request, when
+    `flush_size` events are staged or `flush_interval` seconds after the first
+    event was staged. Appending to and popping from `deque` is thread-safe, so only
+    starting the flush timer is guarded by a lock. At most `max_size` events are
+    staged; the oldest events are dropped first, the same as in the buffers.
+    The numbers of buffered, dropped and flushed events are set as tags of the
+    tracing span of each flush.
+    """
+
+    def __init__(self, max_size: int, flush_size: int, flush_interval: float):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._events: deque[tuple[KEY_TYPE, bytes]] = deque(maxlen=max_size)
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self.dropped = 0
+        self.flushed = 0
+
+    def put_event(self, key: KEY_TYPE, event: bytes) -> int:
+        """Stage the event and return the number of dropped events."""
+        dropped = int(len(self._events) == self._events.maxlen)
+        self._events.append((key, event))
+        self.dropped += dropped
+        if len(self._events) >= self.flush_size:
+            self.flush()
+        elif self._timer is None:
+            self._start_timer()
+        return dropped
+
+    def _start_timer(self):
+        with self._timer_lock:
+            # another thread could start the timer after the unlocked check
+            if self._timer is not None:
+                return
+            timer = threading.Timer(self.flush_interval, self._flush_on_time)
+            timer.daemon = True
+            self._timer = timer
+        timer.start()
+
+    def _flush_on_time(self):
+        with self._timer_lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Put the staged events into the buffers and return their number."""
+        events_dict: dict[KEY_TYPE, list[bytes]] = defaultdict(list)
+        while True:
+            try:
+                key, event = self._events.popleft()
+            except IndexError:
+                break
+            events_dict[key].append(event)
+        if not events_dict:
+            return 0
+
+        events_count = sum(len(events) for events in events_dict.values())
+        with opentracing_trace("flush_events", "buffer") as span:
+            try:
+                buffer = get_buffer(next(iter(events_dict)))
+                dropped = sum(buffer.put_multi_key_events(events_dict).values())
+            except Exception:
+                logger.error("Observability events dropped.", exc_info=True)
+                dropped = events_count
+            if dropped:
+                logger.warning("Observability buffer full, %s events dropped.", dropped)
+            self.dropped += dropped
+            self.flushed += events_count - dropped
+            for name, value in self.get_stats().items():
+                span.set_tag(f"staging_queue.{name}", value)
+        return events_count
+
+    def clear(self):
+        self._events.clear()
+        with self._timer_lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        self.dropped = 0
+        self.flushed = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "buffered": len(self._events),
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+        }
+
+
+_staging_queue: Optional[StagingQueue] = None
+
+
+def get_staging_queue() -> StagingQueue:
+    global _staging_queue
+    if _staging_queue is None:
+        _staging_queue = StagingQueue(
+            max_size=settings.OBSERVABILITY_BUFFER_SIZE_LIMIT,
+            flush_size=settings.OBSERVABILITY_BUFFER_FLUSH_SIZE,
+            flush_interval=settings.OBSERVABILITY_BUFFER_FLUSH_INTERVAL,
+        )
+    return _staging_queue
+
+
+def _reset_staging_queue():
+    # The events staged by the parent process are not flushed by its children.
+    global _staging_queue
+    _staging_queue = None
+
+
+def _flush_staging_queue():
+    if _staging_queue:
+        _staging_queue.flush()
+
+
+os.register_at_fork(after_in_child=_reset_staging_queue)
+atexit.register(_flush_staging_queue)
@@ -1,10 +1,12 @@
+import threading
 from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 from django.utils import timezone
 from freezegun import freeze_time
 
-from ..buffers import RedisBuffer, get_buffer
+from ..buffers import RedisBuffer, StagingQueue, get_buffer
 from ..exceptions import ConnectionNotConfigured
 from ..tests.conftest import BATCH_SIZE, BROKER_URL_HOST, KEY, MAX_SIZE
 
@@ -156,3 +158,144 @@ def test_pop_expired_events(buffer):
     with freeze_time(push_time + timedelta(seconds=buffer.timeout + 1)):
         popped_events = buffer.pop_events()
     assert popped_events == []
+
+
+def test_staging_queue_flushes_events_by_size(buffer, event_data):
+    # given
+    queue = StagingQueue(max_size=MAX_SIZE, flush_size=3, flush_interval=60)
+    queue.put_event(KEY, event_data)
+    queue.put_event(KEY, event_data)
+    assert buffer.size() == 0
+
+    # when
+    queue.put_event(KEY, event_data)
+
+    # then
+    assert buffer.size() == 3
+    assert queue.get_stats() == {"buffered": 0, "dropped": 0, "flushed": 3}
+    queue.clear()
+
+
+def test_staging_queue_flushes_events_by_time(buffer, event_data):
+    # given
+    queue = StagingQueue(max_size=MAX_SIZE, flush_size=10, flush_interval=0.01)
+
+    # when
+    queue.put_event(KEY, event_data)
+    queue._timer.join()
+
+    # then
+    assert buffer.size() == 1
+    assert queue.get_stats() == {"buffered": 0, "dropped": 0, "flushed": 1}
+
+
+def test_staging_queue_drops_oldest_events(buffer):
+    # given
+    queue = StagingQueue(max_size=2, flush_size=10, flush_interval=60)
+    queue.put_event(KEY, b"event-1")
+    queue.put_event(KEY, b"event-2")
+
+    # when
+    dropped = queue.put_event(KEY, b"event-3")
+    queue.flush()
+
+    # then
+    assert dropped == 1
+    assert buffer.pop_events() == [b"event-2", b"event-3"]
+    assert queue.get_stats() == {"buffered": 0, "dropped": 1, "flushed": 2}
+    queue.clear()
+
+
+def test_staging_queue_counts_events_dropped_by_buffer(buffer, event_data):
+    # given
+    queue = StagingQueue(
+        max_size=MAX_SIZE * 2, flush_size=MAX_SIZE * 2, flush_interval=60
+    )
+
+    # when
+    for _ in range(MAX_SIZE + 1):
+        queue.put_event(KEY, event_data)
+    queue.flush()
+
+    # then
+    assert buffer.size() == MAX_SIZE
+    assert queue.get_stats() == {"buffered": 0, "dropped": 1, "flushed": MAX_SIZE}
+    queue.clear()
+
+
+@patch("saleor.webhook.observability.buffers.opentracing_trace")
+def test_staging_queue_flush_sets_stats_span_tags(mocked_trace, buffer, event_data):
+    # given
+    span = MagicMock()
+    mocked_trace.return_value.__enter__.return_value = span
+    queue = StagingQueue(max_size=1, flush_size=10, flush_interval=60)
+    queue.put_event(KEY, event_data)
+    queue.put_event(KEY, event_data)
+
+    # when
+    queue.flush()
+
+    # then
+    mocked_trace.assert_called_once_with("flush_events", "buffer")
+    span.set_tag.assert_any_call("staging_queue.buffered", 0)
+    span.set_tag.assert_any_call("staging_queue.dropped", 1)
+    span.set_tag.assert_any_call("staging_queue.flushed", 1)
+    queue.clear()
+
+
+@patch("saleor.webhook.observability.buffers.threading.Timer")
+def test_staging_queue_starts_single_timer_for_concurrent_events(
+    mocked_timer, event_data
+):
+    # given
+    queue = StagingQueue(max_size=MAX_SIZE, flush_size=MAX_SIZE, flush_interval=60)
+    threads_number = 8
+    barrier = threading.Barrier(threads_number)
+
+    def put_event():
+        barrier.wait()
+        queue.put_event(KEY, event_data)
+
+    threads = [threading.Thread(target=put_event) for _ in range(threads_number)]
+
+    # when
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # then
+    mocked_timer.assert_called_once()
+    mocked_timer.return_value.start.assert_called_once()
+    queue.clear()
+
+
+def test_staging_queue_flush_multiple_keys(patch_connection_pool, event_data):
+    # given
+    queue = StagingQueue(max_size=MAX_SIZE, flush_size=MAX_SIZE, flush_interval=60)
+    queue.put_event("buffer_a", event_data)
+    queue.put_event("buffer_b", event_data)
+
+    # when
+    flushed = queue.flush()
+
+    # then
+    assert flushed == 2
+    assert get_buffer("buffer_a").size() == 1
+    assert get_buffer("buffer_b").size() == 1
+    queue.clear()
+
+
+@patch("saleor.webhook.observability.buffers.get_buffer")
+def test_staging_queue_flush_error(mocked_get_buffer, event_data):
+    # given
+    mocked_get_buffer.side_effect = Exception("Connection error")
+    queue = StagingQueue(max_size=MAX_SIZE, flush_size=MAX_SIZE, flush_interval=60)
+    queue.put_event(KEY, event_data)
+
+    # when
+    queue.flush()
+
+    # then
+    assert queue.get_stats() == {"buffered": 0, "dropped": 1, "flushed": 0}
+    queue.clear()
@@ -7,6 +7,7 @@ from celery.exceptions import Retry
 from django.http import HttpResponse
 from freezegun import freeze_time
 
+from ..buffers import StagingQueue
 from ..exceptions import ApiCallTruncationError, EventDeliveryAttemptTruncationError
 from ..payload_schema import JsonTruncText
 from ..payloads import CustomJsonEncoder
@@ -249,6 +250,25 @@ def test_put_event(patch_get_buffer, buffer, event_data):
     assert buffer.size() == 1
 
 
+def test_put_event_staged(patch_get_buffer, buffer, event_data, settings):
+    # given
+    settings.OBSERVABILITY_BUFFER_FLUSH_SIZE = 2
+    queue = StagingQueue(max_size=10, flush_size=2, flush_interval=60)
+
+    # when
+    with patch(
+        "saleor.webhook.observability.utils.get_staging_queue", return_value=queue
+    ), patch("saleor.webhook.observability.buffers.get_buffer", return_value=buffer):
+        put_event(lambda: event_data)
+        size_after_first_event = buffer.size()
+        put_event(lambda: event_data)
+
+    # then
+    assert size_after_first_event == 0
+    assert buffer.size() == 2
+    queue.clear()
+
+
 @pytest.mark.parametrize(
     "error",
     [
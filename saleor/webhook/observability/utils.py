@@ -18,7 +18,7 @@ from pytimeparse import parse
 from ...core.utils import get_domain
 from ..event_types import WebhookEventAsyncType
 from ..utils import get_webhooks_for_event
-from .buffers import get_buffer
+from .buffers import get_buffer, get_staging_queue
 from .exceptions import TruncationError
 from .payloads import generate_api_call_payload, generate_event_delivery_attempt_payload
 from .tracing import opentracing_trace
@@ -94,7 +94,11 @@ def put_event(generate_payload: Callable[[], bytes]):
     try:
         payload = generate_payload()
         with opentracing_trace("put_event", "buffer"):
-            if get_buffer(get_buffer_name()).put_event(payload):
+            if settings.OBSERVABILITY_BUFFER_FLUSH_SIZE:
+                dropped = get_staging_queue().put_event(get_buffer_name(), payload)
+            else:
+                dropped = get_buffer(get_buffer_name()).put_event(payload)
+            if dropped:
                 logger.warning("Observability buffer full, event dropped.")
     except TruncationError as err:
         logger.warning("Observability event dropped. %s", err, extra=err.extra)
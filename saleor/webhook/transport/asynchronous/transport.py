@@ -1,7 +1,10 @@
 import json
 import logging
+import threading
 from collections.abc import Sequence
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
 from celery import group
@@ -10,11 +13,13 @@ from django.conf import settings
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
+from ....core.http_client import HTTPClient
 from ....core.models import EventDelivery, EventPayload
 from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
 from ....graphql.webhook.subscription_payload import (
     generate_payload_from_subscription,
+    get_subscription_payload_cache_key,
     initialize_request,
 )
 from ....graphql.webhook.subscription_types import WEBHOOK_TYPES_MAP
@@ -25,9 +30,13 @@ from ..utils import (
     WebhookResponse,
     WebhookSchemes,
     attempt_update,
+    clear_successful_deliveries,
     clear_successful_delivery,
     create_attempt,
+    create_attempts_from_responses,
+    deliveries_update,
     delivery_update,
+    get_deliveries_for_webhooks,
     get_delivery_for_webhook,
     handle_webhook_retry,
     send_webhook_using_scheme_method,
@@ -55,6 +64,10 @@ def create_deliveries_for_subscriptions(
     :param requestor: used in subscription webhooks to generate meta data for payload.
     :return: List of event deliveries to send via webhook tasks.
     :param allow_replica: use replica database.
+
+    Payloads are generated once for webhooks of apps with the same permissions that
+    share the subscription query, and identical payloads are saved as a single
+    `EventPayload`.
     """
     if event_type not in WEBHOOK_TYPES_MAP:
         logger.info(
@@ -62,28 +75,39 @@ def create_deliveries_for_subscriptions(
         )
         return []
 
-    event_payloads = []
+    generated_payloads: dict[tuple, Optional[str]] = {}
+    event_payloads: dict[str, EventPayload] = {}
     event_deliveries = []
     for webhook in webhooks:
-        data = generate_payload_from_subscription(
-            event_type=event_type,
-            subscribable_object=subscribable_object,
-            subscription_query=webhook.subscription_query,
-            request=initialize_request(
-                requestor,
-                event_type in WebhookEventSyncType.ALL,
-                event_type=event_type,
-                allow_replica=allow_replica,
-            ),
-            app=webhook.app,
+        cache_key = get_subscription_payload_cache_key(
+            event_type, subscribable_object, webhook.subscription_query, webhook.app
         )
-        if not data:
+        if cache_key is not None and cache_key in generated_payloads:
+            payload = generated_payloads[cache_key]
+        else:
+            data = generate_payload_from_subscription(
+                event_type=event_type,
+                subscribable_object=subscribable_object,
+                subscription_query=webhook.subscription_query,
+                request=initialize_request(
+                    requestor,
+                    event_type in WebhookEventSyncType.ALL,
+                    event_type=event_type,
+                    allow_replica=allow_replica,
+                ),
+                app=webhook.app,
+            )
+            payload = json.dumps({**data}) if data else None
+            if cache_key is not None:
+                generated_payloads[cache_key] = payload
+        if not payload:
             logger.info(
                 "No payload was generated with subscription for event: %s" % event_type
             )
             continue
-        event_payload = EventPayload(payload=json.dumps({**data}))
-        event_payloads.append(event_payload)
+        if payload not in event_payloads:
+            event_payloads[payload] = EventPayload(payload=payload)
+        event_payload = event_payloads[payload]
         event_deliveries.append(
             EventDelivery(
                 status=EventDeliveryStatus.PENDING,
@@ -93,7 +117,7 @@ def create_deliveries_for_subscriptions(
             )
         )
 
-    EventPayload.objects.bulk_create(event_payloads)
+    EventPayload.objects.bulk_create(event_payloads.values())
     return EventDelivery.objects.bulk_create(event_deliveries)
 
 
@@ -171,10 +195,59 @@ def trigger_webhooks_async(
             )
         )
 
+    if settings.WEBHOOK_BATCH_DELIVERY_ENABLED:
+        schedule_webhook_deliveries([delivery.id for delivery in deliveries])
+        return
     for delivery in deliveries:
         send_webhook_request_async.delay(delivery.id)
 
 
+_delivery_batch = threading.local()
+
+
+@contextmanager
+def webhook_delivery_batch():
+    """Collect async webhook deliveries scheduled in the block and send them in batches.
+
+    Used only when `WEBHOOK_BATCH_DELIVERY_ENABLED` is set. Deliveries scheduled
+    outside of the block are sent in batches per `trigger_webhooks_async` call.
+    """
+    if getattr(_delivery_batch, "delivery_ids", None) is not None:
+        # Deliveries are already collected by the outer block.
+        yield
+        return
+    _delivery_batch.delivery_ids = []
+    try:
+        yield
+    finally:
+        delivery_ids = _delivery_batch.delivery_ids
+        _delivery_batch.delivery_ids = None
+        send_webhook_deliveries_in_batches(delivery_ids)
+
+
+def schedule_webhook_deliveries(delivery_ids: list[int]):
+    pending_delivery_ids: Optional[list[int]] = getattr(
+        _delivery_batch, "delivery_ids", None
+    )
+    if pending_delivery_ids is None:
+        send_webhook_deliveries_in_batches(delivery_ids)
+        return
+    pending_delivery_ids.extend(delivery_ids)
+    batch_size = settings.WEBHOOK_BATCH_DELIVERY_SIZE
+    if len(pending_delivery_ids) >= batch_size:
+        full_batches_size = len(pending_delivery_ids) - (
+            len(pending_delivery_ids) % batch_size
+        )
+        send_webhook_deliveries_in_batches(pending_delivery_ids[:full_batches_size])
+        del pending_delivery_ids[:full_batches_size]
+
+
+def send_webhook_deliveries_in_batches(delivery_ids: list[int]):
+    batch_size = settings.WEBHOOK_BATCH_DELIVERY_SIZE
+    for index in range(0, len(delivery_ids), batch_size):
+        send_webhook_requests_async.delay(delivery_ids[index : index + batch_size])
+
+
 @app.task(
     queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
     bind=True,
@@ -227,6 +300,111 @@ def send_webhook_request_async(self, event_delivery_id):
     clear_successful_delivery(delivery)
 
 
+def _send_webhook_request(delivery, domain, session) -> tuple[WebhookResponse, bool]:
+    """Send the delivery payload and return the response and if it can be retried."""
+    webhook = delivery.webhook
+    try:
+        if not delivery.payload:
+            raise ValueError("Event delivery id: %r has no payload." % delivery.id)
+        with webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app):
+            response = send_webhook_using_scheme_method(
+                webhook.target_url,
+                domain,
+                webhook.secret_key,
+                delivery.event_type,
+                delivery.payload.payload,
+                webhook.custom_headers,
+                session=session,
+            )
+    except ValueError as e:
+        return WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED), False
+    # do not retry for 30x and 40x status codes
+    status_code = response.response_status_code
+    return response, not (status_code and 300 <= status_code < 500)
+
+
+def send_webhook_requests_concurrently(
+    deliveries: list[EventDelivery], domain: str
+) -> list[tuple[WebhookResponse, bool]]:
+    """Send the deliveries with a limited number of concurrent requests per host."""
+    target_semaphores = {
+        urlparse(delivery.webhook.target_url).netloc: threading.BoundedSemaphore(
+            settings.WEBHOOK_BATCH_DELIVERY_TARGET_CONCURRENCY
+        )
+        for delivery in deliveries
+    }
+
+    # Pooled keep-alive sessions are picked per target when enabled.
+    session_context = (
+        nullcontext() if settings.WEBHOOK_HTTP_KEEP_ALIVE else HTTPClient.get_session()
+    )
+    with session_context as session:
+
+        def send(delivery):
+            target = urlparse(delivery.webhook.target_url).netloc
+            with target_semaphores[target]:
+                return _send_webhook_request(delivery, domain, session)
+
+        with ThreadPoolExecutor(
+            max_workers=settings.WEBHOOK_BATCH_DELIVERY_MAX_WORKERS
+        ) as executor:
+            return list(executor.map(send, deliveries))
+
+
+@app.task(queue=settings.WEBHOOK_CELERY_QUEUE_NAME, bind=True)
+def send_webhook_requests_async(self, event_delivery_ids):
+    """Send a batch of event deliveries.
+
+    The attempts and the delivery statuses are saved in bulk. Failed deliveries that
+    can be retried are passed to `send_webhook_request_async`, which handles
+    the retries.
+    """
+    deliveries = get_deliveries_for_webhooks(event_delivery_ids)
+    if not deliveries:
+        return
+    results = send_webhook_requests_concurrently(deliveries, get_domain())
+    responses = [response for response, _ in results]
+    attempts = create_attempts_from_responses(deliveries, responses, self.request.id)
+
+    successful_deliveries, failed_deliveries = [], []
+    for delivery, (response, retry) in zip(deliveries, results):
+        webhook = delivery.webhook
+        if response.status == EventDeliveryStatus.SUCCESS:
+            task_logger.info(
+                "[Webhook ID:%r] Payload sent to %r for event %r. Delivery id: %r",
+                webhook.id,
+                webhook.target_url,
+                delivery.event_type,
+                delivery.id,
+            )
+            delivery.status = EventDeliveryStatus.SUCCESS
+            successful_deliveries.append(delivery)
+        elif retry:
+            task_logger.info(
+                "[Webhook ID: %r] Failed request to %r: %r for event: %r."
+                " Delivery id: %r",
+                webhook.id,
+                webhook.target_url,
+                response.content,
+                delivery.event_type,
+                delivery.id,
+            )
+            # The batch request counts as the first attempt, so the delivery is
+            # retried as many times as the deliveries sent one by one.
+            send_webhook_request_async.apply_async(
+                args=[delivery.id],
+                countdown=send_webhook_request_async.retry_backoff,
+                retries=1,
+            )
+        else:
+            failed_deliveries.append(delivery)
+    deliveries_update(failed_deliveries, EventDeliveryStatus.FAILED)
+
+    for attempt in attempts:
+        observability.report_event_delivery_attempt(attempt)
+    clear_successful_deliveries(successful_deliveries)
+
+
 def send_observability_events(webhooks: list[WebhookData], events: list[bytes]):
     event_type = WebhookEventAsyncType.OBSERVABILITY
     for webhook in webhooks:
@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests_hardened.host_header_adapter import HostHeaderSSLAdapter
+
+from ...core.http_client import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionPoolStats:
+    requests: int = 0
+    new_connections: int = 0
+    wait_time: float = 0.0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+
+class PooledSession:
+    """HTTP session keeping alive the connections to a single target origin."""
+
+    def __init__(self, pool_size: int):
+        self.session = HTTPClient.get_session()
+        # The IP filter rewrites the URL to the resolved IP address, so a session
+        # can hold connection pools for a few IPs of the same origin.
+        self.session.mount(
+            "https://",
+            HostHeaderSSLAdapter(pool_maxsize=pool_size, pool_block=True),
+        )
+        self.session.mount(
+            "http://", HTTPAdapter(pool_maxsize=pool_size, pool_block=True)
+        )
+        self.semaphore = threading.BoundedSemaphore(pool_size)
+        self.active_requests = 0
+        self.last_used = time.monotonic()
+        self.stats = SessionPoolStats()
+
+    def count_connections(self) -> int:
+        connections = 0
+        for adapter in self.session.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                connections += getattr(pool, "num_connections", 0)
+        return connections
+
+    def close(self):
+        self.session.close()
+
+
+class WebhookSessionPool:
+    """Keep-alive HTTP sessions shared by webhook requests sent to the same origin.
+
+    The sessions are created by `HTTPClient`, so the requests keep the IP filtering
+    and no-redirect guarantees. The number of concurrent requests to an origin is
+    limited by the pool size; the time spent waiting for a free connection is
+    reported in the pool stats. Sessions unused for longer than the idle timeout
+    are closed.
+    """
+
+    def __init__(self, pool_size: int, idle_timeout: float):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[str, PooledSession] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def get_origin(url: str) -> str:
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+    def _get_pooled_session(self, origin: str) -> PooledSession:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections can't be shared with the parent of a forked process.
+                self._sessions = {}
+                self._pid = os.getpid()
+            self._close_idle_sessions()
+            pooled_session = self._sessions.get(origin)
+            if pooled_session is None:
+                pooled_session = PooledSession(self.pool_size)
+                self._sessions[origin] = pooled_session
+            pooled_session.active_requests += 1
+            return pooled_session
+
+    def _close_idle_sessions(self):
+        idle_since = time.monotonic() - self.idle_timeout
+        for origin, pooled_session in list(self._sessions.items()):
+            if (
+                not pooled_session.active_requests
+                and pooled_session.last_used < idle_since
+            ):
+                del self._sessions[origin]
+                pooled_session.close()
+                logger.debug("Closed idle HTTP session for %s.", origin)
+
+    @contextmanager
+    def session(self, url: str) -> Iterator[Session]:
+        """Return the session used to send requests to the origin of the URL."""
+        pooled_session = self._get_pooled_session(self.get_origin(url))
+        start = time.monotonic()
+        pooled_session.semaphore.acquire()
+        wait_time = time.monotonic() - start
+        try:
+            yield pooled_session.session
+        finally:
+            pooled_session.semaphore.release()
+            with self._lock:
+                pooled_session.active_requests -= 1
+                pooled_session.last_used = time.monotonic()
+                pooled_session.stats.requests += 1
+                pooled_session.stats.wait_time += wait_time
+
+    def get_stats(self) -> dict[str, SessionPoolStats]:
+        """Return the reuse and wait time stats of the sessions per origin."""
+        with self._lock:
+            stats = {}
+            for origin, pooled_session in self._sessions.items():
+                stats[origin] = SessionPoolStats(
+                    requests=pooled_session.stats.requests,
+                    new_connections=pooled_session.count_connections(),
+                    wait_time=pooled_session.stats.wait_time,
+                )
+            return stats
+
+    def close(self):
+        with self._lock:
+            for pooled_session in self._sessions.values():
+                pooled_session.close()
+            self._sessions = {}
+
+
+_session_pool: Optional[WebhookSessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_webhook_session_pool() -> WebhookSessionPool:
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = WebhookSessionPool(
+                    pool_size=settings.WEBHOOK_HTTP_POOL_SIZE,
+                    idle_timeout=settings.WEBHOOK_HTTP_POOL_IDLE_TIMEOUT,
+                )
+    return _session_pool
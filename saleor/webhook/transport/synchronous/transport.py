@@ -1,5 +1,8 @@
 import json
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from json import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 from urllib.parse import urlparse
@@ -10,7 +13,7 @@ from django.core.cache import cache
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
-from ....core.models import EventDelivery, EventPayload
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
 from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
 from ....graphql.webhook.subscription_payload import (
@@ -87,14 +90,17 @@ def handle_transaction_request_task(self, delivery_id, request_event_id):
 def _send_webhook_request_sync(
     delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
 ) -> tuple[WebhookResponse, Optional[dict[Any, Any]]]:
-    event_payload = delivery.payload
-    data = event_payload.payload
+    attempt = _create_attempt_for_sync_delivery(delivery, attempt)
+    response, response_data = _send_sync_delivery_payload(
+        delivery, attempt, get_domain(), timeout
+    )
+    _save_sync_delivery_response(delivery, attempt, response)
+    return response, response_data
+
+
+def _create_attempt_for_sync_delivery(delivery, attempt=None) -> EventDeliveryAttempt:
     webhook = delivery.webhook
     parts = urlparse(webhook.target_url)
-    domain = get_domain()
-    message = data.encode("utf-8")
-    signature = signature_for_payload(message, webhook.secret_key)
-
     if parts.scheme.lower() not in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
         delivery_update(delivery, EventDeliveryStatus.FAILED)
         raise ValueError(f"Unknown webhook scheme: {parts.scheme!r}")
@@ -106,6 +112,19 @@ def _send_webhook_request_sync(
     )
     if attempt is None:
         attempt = create_attempt(delivery=delivery, task_id=None)
+    return attempt
+
+
+def _send_sync_delivery_payload(
+    delivery, attempt, domain, timeout=settings.WEBHOOK_SYNC_TIMEOUT
+) -> tuple[WebhookResponse, Optional[dict[Any, Any]]]:
+    """Send the delivery payload and parse the response.
+
+    It doesn't access the database, so it can be called from other threads.
+    """
+    webhook = delivery.webhook
+    message = delivery.payload.payload.encode("utf-8")
+    signature = signature_for_payload(message, webhook.secret_key)
     response = WebhookResponse(content="")
     response_data = None
 
@@ -149,12 +168,14 @@ def _send_webhook_request_sync(
                 webhook.target_url,
                 attempt.id,
             )
+    return response, response_data
+
 
+def _save_sync_delivery_response(delivery, attempt, response: WebhookResponse):
     attempt_update(attempt, response)
     delivery_update(delivery, response.status)
     observability.report_event_delivery_attempt(attempt)
     clear_successful_delivery(delivery)
-    return response, response_data
 
 
 def send_webhook_request_sync(
@@ -313,8 +334,22 @@ def trigger_all_webhooks_sync(
     the next one is send.
     If no webhook responds with expected response,
     this function returns None.
+
+    When `WEBHOOK_SYNC_CONCURRENT_ENABLED` is set, the requests are sent
+    concurrently and the first expected response in the webhooks order is returned.
     """
     webhooks = get_webhooks_for_event(event_type)
+    if settings.WEBHOOK_SYNC_CONCURRENT_ENABLED and len(webhooks) > 1:
+        deliveries = _create_deliveries_for_sync_webhooks(
+            event_type,
+            webhooks,
+            generate_payload,
+            subscribable_object,
+            requestor,
+            allow_replica,
+        )
+        return _send_webhook_requests_sync_concurrently(deliveries, parse_response)
+
     request_context = None
     event_payload = None
     for webhook in webhooks:
@@ -350,3 +385,151 @@ def trigger_all_webhooks_sync(
         if parsed_response := parse_response(response_data):
             return parsed_response
     return None
+
+
+def _create_deliveries_for_sync_webhooks(
+    event_type: str,
+    webhooks,
+    generate_payload: Callable,
+    subscribable_object=None,
+    requestor=None,
+    allow_replica=False,
+) -> list[EventDelivery]:
+    """Create deliveries for the webhooks, in the webhooks order.
+
+    Stop at the first webhook for which the subscription payload can't be generated,
+    as the sequential delivery would stop on it.
+    """
+    request_context = None
+    event_payload = None
+    deliveries = []
+    for webhook in webhooks:
+        if webhook.subscription_query:
+            if request_context is None:
+                request_context = initialize_request(
+                    requestor,
+                    event_type in WebhookEventSyncType.ALL,
+                    allow_replica,
+                    event_type=event_type,
+                )
+            delivery = create_delivery_for_subscription_sync_event(
+                event_type=event_type,
+                subscribable_object=subscribable_object,
+                webhook=webhook,
+                request=request_context,
+                requestor=requestor,
+            )
+            if not delivery:
+                break
+        else:
+            if event_payload is None:
+                event_payload = EventPayload.objects.create(payload=generate_payload())
+            delivery = EventDelivery.objects.create(
+                status=EventDeliveryStatus.PENDING,
+                event_type=event_type,
+                payload=event_payload,
+                webhook=webhook,
+            )
+        deliveries.append(delivery)
+    return deliveries
+
+
+def get_sync_requests_wait_timeout() -> float:
+    """Return the time for which the racing requests of one event are awaited."""
+    timeout = settings.WEBHOOK_SYNC_TIMEOUT
+    if isinstance(timeout, tuple):
+        # the connection and the read timeouts
+        return float(sum(timeout))
+    return float(timeout)
+
+
+def _send_webhook_requests_sync_concurrently(
+    deliveries: list[EventDelivery], parse_response: Callable[[Any], Optional[R]]
+) -> Optional[R]:
+    """Send the deliveries concurrently and return the first expected response.
+
+    Responses are checked in the deliveries order, so a response of a webhook is
+    used only when all webhooks before it did not return the expected response.
+    A webhook that fails, including an invalid target URL, or doesn't respond within
+    `get_sync_requests_wait_timeout` is treated as one without the expected response.
+    Requests that are not needed anymore are cancelled, or marked as failed when they
+    are already running. All database operations are done in the calling thread.
+
+    Each call uses its own threads, so the requests of one event are not queued
+    behind slow requests of other events.
+    """
+    if not deliveries:
+        return None
+    domain = get_domain()
+    deadline = time.monotonic() + get_sync_requests_wait_timeout()
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(deliveries), settings.WEBHOOK_SYNC_MAX_WORKERS),
+        thread_name_prefix="sync-webhooks",
+    )
+    try:
+        requests = []
+        for delivery in deliveries:
+            try:
+                attempt = _create_attempt_for_sync_delivery(delivery)
+            except ValueError:
+                logger.warning(
+                    "[Webhook] Skipping webhook %r.",
+                    delivery.webhook.target_url,
+                    exc_info=True,
+                )
+                continue
+            future = executor.submit(
+                _send_sync_delivery_payload, delivery, attempt, domain
+            )
+            requests.append((delivery, attempt, future))
+
+        parsed_response = None
+        for index, (delivery, attempt, future) in enumerate(requests):
+            timeout = max(0.0, deadline - time.monotonic())
+            response, response_data = _get_sync_request_response(future, timeout)
+            _save_sync_delivery_response(delivery, attempt, response)
+            if response.status != EventDeliveryStatus.SUCCESS:
+                continue
+            if parsed_response := parse_response(response_data):
+                _finish_skipped_sync_requests(requests[index + 1 :])
+                break
+        return parsed_response
+    finally:
+        # requests that are still running are not awaited
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_sync_request_response(
+    future: Future, timeout: float
+) -> tuple[WebhookResponse, Optional[dict[Any, Any]]]:
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        return (
+            WebhookResponse(
+                content="Response not awaited, the webhooks did not respond in time.",
+                status=EventDeliveryStatus.FAILED,
+            ),
+            None,
+        )
+    except Exception as e:
+        logger.warning("[Webhook] Failed request.", exc_info=True)
+        return WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED), None
+
+
+def _finish_skipped_sync_requests(requests):
+    for delivery, attempt, future in requests:
+        if future.cancel():
+            response = WebhookResponse(
+                content="Request cancelled, a webhook with higher priority responded.",
+                status=EventDeliveryStatus.FAILED,
+            )
+        elif future.done():
+            response, _ = _get_sync_request_response(future, timeout=0)
+        else:
+            response = WebhookResponse(
+                content="Response not awaited, a webhook with higher priority "
+                "responded.",
+                status=EventDeliveryStatus.FAILED,
+            )
+        _save_sync_delivery_response(delivery, attempt, response)
@@ -0,0 +1,171 @@
+from unittest import mock
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ...event_types import WebhookEventAsyncType
+from ..asynchronous.transport import (
+    send_webhook_requests_async,
+    trigger_webhooks_async,
+    webhook_delivery_batch,
+)
+from ..utils import WebhookResponse
+
+
+def _create_deliveries(webhook, count):
+    payloads = EventPayload.objects.bulk_create(
+        [EventPayload(payload=f'{{"key": {index}}}') for index in range(count)]
+    )
+    return EventDelivery.objects.bulk_create(
+        [
+            EventDelivery(
+                event_type=WebhookEventAsyncType.ORDER_CREATED,
+                payload=payload,
+                webhook=webhook,
+            )
+            for payload in payloads
+        ]
+    )
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport"
+    ".send_webhook_requests_async.delay"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async.delay"
+)
+def test_trigger_webhooks_async_batch_delivery(
+    mocked_send_webhook_request,
+    mocked_send_webhook_requests,
+    settings,
+    webhook,
+):
+    # given
+    settings.WEBHOOK_BATCH_DELIVERY_ENABLED = True
+    settings.WEBHOOK_BATCH_DELIVERY_SIZE = 2
+    webhooks = [webhook] * 3
+
+    # when
+    trigger_webhooks_async("{}", WebhookEventAsyncType.ORDER_CREATED, webhooks)
+
+    # then
+    mocked_send_webhook_request.assert_not_called()
+    delivery_ids = list(
+        EventDelivery.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    assert mocked_send_webhook_requests.call_args_list == [
+        mock.call(delivery_ids[:2]),
+        mock.call(delivery_ids[2:]),
+    ]
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport"
+    ".send_webhook_requests_async.delay"
+)
+def test_trigger_webhooks_async_in_delivery_batch(
+    mocked_send_webhook_requests, settings, webhook
+):
+    # given
+    settings.WEBHOOK_BATCH_DELIVERY_ENABLED = True
+    settings.WEBHOOK_BATCH_DELIVERY_SIZE = 3
+
+    # when
+    with webhook_delivery_batch():
+        for _ in range(4):
+            trigger_webhooks_async("{}", WebhookEventAsyncType.ORDER_CREATED, [webhook])
+        # then
+        assert mocked_send_webhook_requests.call_count == 1
+
+    delivery_ids = list(
+        EventDelivery.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    assert mocked_send_webhook_requests.call_args_list == [
+        mock.call(delivery_ids[:3]),
+        mock.call(delivery_ids[3:]),
+    ]
+
+
+@mock.patch("saleor.webhook.observability.report_event_delivery_attempt")
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_requests_async(
+    mocked_send_response, mocked_observability, webhook, webhook_response
+):
+    # given
+    mocked_send_response.return_value = webhook_response
+    deliveries = _create_deliveries(webhook, 3)
+
+    # when
+    send_webhook_requests_async([delivery.pk for delivery in deliveries])
+
+    # then
+    assert mocked_send_response.call_count == 3
+    assert mocked_observability.call_count == 3
+    assert not EventDelivery.objects.exists()
+    assert not EventPayload.objects.exists()
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport"
+    ".send_webhook_request_async.apply_async"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_requests_async_failed_deliveries(
+    mocked_send_response,
+    mocked_send_webhook_request,
+    webhook,
+    webhook_response,
+    webhook_response_failed,
+):
+    # given
+    bad_request_response = WebhookResponse(
+        content="bad request",
+        response_status_code=400,
+        status=EventDeliveryStatus.FAILED,
+    )
+    success_delivery, retried_delivery, failed_delivery = _create_deliveries(webhook, 3)
+    responses = {
+        success_delivery.payload.payload: webhook_response,
+        retried_delivery.payload.payload: webhook_response_failed,
+        failed_delivery.payload.payload: bad_request_response,
+    }
+    mocked_send_response.side_effect = lambda *args, **kwargs: responses[args[4]]
+
+    # when
+    send_webhook_requests_async(
+        [success_delivery.pk, retried_delivery.pk, failed_delivery.pk]
+    )
+
+    # then
+    assert not EventDelivery.objects.filter(pk=success_delivery.pk).exists()
+    retried_delivery.refresh_from_db()
+    assert retried_delivery.status == EventDeliveryStatus.PENDING
+    failed_delivery.refresh_from_db()
+    assert failed_delivery.status == EventDeliveryStatus.FAILED
+    mocked_send_webhook_request.assert_called_once_with(
+        args=[retried_delivery.pk], countdown=10, retries=1
+    )
+    attempts = EventDeliveryAttempt.objects.filter(
+        delivery__in=[retried_delivery, failed_delivery]
+    )
+    assert {attempt.status for attempt in attempts} == {EventDeliveryStatus.FAILED}
+    assert {attempt.response_status_code for attempt in attempts} == {500, 400}
+
+
+def test_send_webhook_requests_async_when_webhook_is_disabled(webhook):
+    # given
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+    (delivery,) = _create_deliveries(webhook, 1)
+
+    # when
+    send_webhook_requests_async([delivery.pk])
+
+    # then
+    delivery.refresh_from_db()
+    assert delivery.status == EventDeliveryStatus.FAILED
+    assert not delivery.attempts.exists()
@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ....core import EventDeliveryStatus
+from ....core.http_client import HTTPClient
+from .. import session_pool
+from ..session_pool import WebhookSessionPool
+from ..utils import send_webhook_using_http
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_session_pool(settings, monkeypatch):
+    settings.WEBHOOK_HTTP_KEEP_ALIVE = True
+    pool = WebhookSessionPool(pool_size=2, idle_timeout=60)
+    monkeypatch.setattr(session_pool, "_session_pool", pool)
+    yield pool
+    pool.close()
+
+
+def _send_webhook(target_url):
+    return send_webhook_using_http(
+        target_url, "{}", "mirumee.com", "signature", "order_created"
+    )
+
+
+@pytest.mark.enable_socket
+def test_send_webhook_using_http_reuses_pooled_connection(
+    webhook_server, webhook_session_pool
+):
+    # given
+    target_url = f"{webhook_server}/webhook"
+
+    # when
+    responses = [_send_webhook(target_url) for _ in range(3)]
+
+    # then
+    assert {response.status for response in responses} == {EventDeliveryStatus.SUCCESS}
+    stats = webhook_session_pool.get_stats()[webhook_server]
+    assert stats.requests == 3
+    assert stats.new_connections == 1
+    assert stats.reused_connections == 2
+
+
+def test_session_pool_uses_session_per_origin(webhook_session_pool):
+    # when
+    with webhook_session_pool.session("https://app.com/webhook") as session:
+        pass
+    with webhook_session_pool.session("https://APP.com/other-webhook") as same_session:
+        pass
+    with webhook_session_pool.session("https://other-app.com/webhook") as other:
+        pass
+
+    # then
+    assert session is same_session
+    assert session is not other
+    assert set(webhook_session_pool.get_stats()) == {
+        "https://app.com",
+        "https://other-app.com",
+    }
+
+
+def test_session_pool_closes_idle_sessions():
+    # given
+    pool = WebhookSessionPool(pool_size=2, idle_timeout=0)
+    with pool.session("https://app.com/webhook") as session:
+        pass
+
+    # when
+    with pool.session("https://app.com/webhook") as new_session:
+        pass
+
+    # then
+    assert session is not new_session
+    assert pool.get_stats()["https://app.com"].requests == 1
+
+
+def test_session_pool_keeps_ip_filter(webhook_session_pool, monkeypatch):
+    # given
+    monkeypatch.setattr(HTTPClient.config, "ip_filter_enable", True)
+
+    # when
+    response = _send_webhook("https://10.0.0.0/webhook")
+
+    # then
+    assert response.status == EventDeliveryStatus.FAILED
+    assert response.content == "Invalid IP address"
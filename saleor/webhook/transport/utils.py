@@ -17,7 +17,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.urls import reverse
 from google.cloud import pubsub_v1
-from requests import RequestException
+from requests import RequestException, Session
 from requests_hardened.ip_filter import InvalidIPAddress
 
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
@@ -50,6 +50,7 @@ from ..const import APP_ID_PREFIX
 from ..event_types import WebhookEventSyncType
 from ..models import Webhook
 from . import signature_for_payload
+from .session_pool import get_webhook_session_pool
 
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
@@ -100,6 +101,19 @@ def generate_cache_key_for_webhook(
     )
 
 
+@contextmanager
+def get_webhook_session(target_url: str, session: Optional[Session] = None):
+    """Return the HTTP session used to send a webhook request to the target URL."""
+    if session is not None:
+        yield session
+    elif settings.WEBHOOK_HTTP_KEEP_ALIVE:
+        with get_webhook_session_pool().session(target_url) as pooled_session:
+            yield pooled_session
+    else:
+        with HTTPClient.get_session() as new_session:
+            yield new_session
+
+
 def send_webhook_using_http(
     target_url,
     message,
@@ -108,6 +122,7 @@ def send_webhook_using_http(
     event_type,
     timeout=settings.WEBHOOK_TIMEOUT,
     custom_headers: Optional[dict[str, str]] = None,
+    session: Optional[Session] = None,
 ) -> WebhookResponse:
     """Send a webhook request using http / https protocol.
 
@@ -118,6 +133,9 @@ def send_webhook_using_http(
     :param event_type: Webhook event type.
     :param timeout: Request timeout.
     :param custom_headers: Custom headers which will be added to request headers.
+    :param session: HTTP session used to send the request. When not provided,
+    a pooled keep-alive session is used if `WEBHOOK_HTTP_KEEP_ALIVE` is enabled,
+    otherwise a new session.
 
     :return: WebhookResponse object.
     """
@@ -137,14 +155,15 @@ def send_webhook_using_http(
         headers.update(custom_headers)
 
     try:
-        response = HTTPClient.send_request(
-            "POST",
-            target_url,
-            data=message,
-            headers=headers,
-            timeout=timeout,
-            allow_redirects=False,
-        )
+        with get_webhook_session(target_url, session) as webhook_session:
+            response = webhook_session.request(
+                "POST",
+                target_url,
+                data=message,
+                headers=headers,
+                timeout=timeout,
+                allow_redirects=False,
+            )
     except RequestException as e:
         if e.response:
             return WebhookResponse(
@@ -269,6 +288,7 @@ def send_webhook_using_scheme_method(
     event_type,
     data,
     custom_headers=None,
+    session=None,
 ) -> WebhookResponse:
     parts = urlparse(target_url)
     message = data if isinstance(data, bytes) else data.encode("utf-8")
@@ -289,6 +309,7 @@ def send_webhook_using_scheme_method(
             signature,
             event_type,
             custom_headers=custom_headers,
+            session=session,
         )
     raise ValueError(f"Unknown webhook scheme: {parts.scheme!r}")
 
@@ -343,6 +364,25 @@ def handle_webhook_retry(
     return is_success
 
 
+def get_deliveries_for_webhooks(event_delivery_ids) -> list["EventDelivery"]:
+    deliveries = list(
+        EventDelivery.objects.select_related("payload", "webhook__app").filter(
+            id__in=event_delivery_ids
+        )
+    )
+    if missing_ids := set(event_delivery_ids) - {d.id for d in deliveries}:
+        logger.error("Event deliveries ids: %r not found", sorted(missing_ids))
+
+    inactive_deliveries = [d for d in deliveries if not d.webhook.is_active]
+    if inactive_deliveries:
+        deliveries_update(inactive_deliveries, EventDeliveryStatus.FAILED)
+        logger.info(
+            "Event deliveries ids: %r webhooks are disabled.",
+            [d.id for d in inactive_deliveries],
+        )
+    return [d for d in deliveries if d.webhook.is_active]
+
+
 def get_delivery_for_webhook(event_delivery_id) -> Optional["EventDelivery"]:
     try:
         delivery = EventDelivery.objects.select_related("payload", "webhook__app").get(
@@ -403,6 +443,45 @@ def attempt_update(
     )
 
 
+def create_attempts_from_responses(
+    deliveries: list["EventDelivery"],
+    webhook_responses: list["WebhookResponse"],
+    task_id: Optional[str] = None,
+) -> list["EventDeliveryAttempt"]:
+    return EventDeliveryAttempt.objects.bulk_create(
+        [
+            EventDeliveryAttempt(
+                delivery=delivery,
+                task_id=task_id,
+                duration=webhook_response.duration,
+                response=webhook_response.content,
+                response_headers=json.dumps(webhook_response.response_headers),
+                response_status_code=webhook_response.response_status_code,
+                request_headers=json.dumps(webhook_response.request_headers),
+                status=webhook_response.status,
+            )
+            for delivery, webhook_response in zip(deliveries, webhook_responses)
+        ]
+    )
+
+
+def clear_successful_deliveries(deliveries: list["EventDelivery"]):
+    successful_deliveries = [
+        delivery
+        for delivery in deliveries
+        if delivery.status == EventDeliveryStatus.SUCCESS
+    ]
+    if not successful_deliveries:
+        return
+    payload_ids = {delivery.payload_id for delivery in successful_deliveries}
+    EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in successful_deliveries]
+    ).delete()
+    EventPayload.objects.filter(
+        pk__in=[pk for pk in payload_ids if pk], deliveries__isnull=True
+    ).delete()
+
+
 def clear_successful_delivery(delivery: "EventDelivery"):
     if delivery.status == EventDeliveryStatus.SUCCESS:
         payload_id = delivery.payload_id
@@ -416,6 +495,14 @@ def delivery_update(delivery: "EventDelivery", status: str):
     delivery.save(update_fields=["status"])
 
 
+def deliveries_update(deliveries: list["EventDelivery"], status: str):
+    for delivery in deliveries:
+        delivery.status = status
+    EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in deliveries]
+    ).update(status=status)
+
+
 def trigger_transaction_request(
     transaction_data: "TransactionActionData", event_type: str, requestor
 ):